@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Setting up many encoder sessions: one Encoder per session against one
+EncoderArena for all of them, and the cost of encoding a frame on every
+session.
+
+Run with: python benchmarks/arena.py
+"""
+
+import time
+
+import pylibopus
+import pylibopus.arena
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+SESSIONS = 10000
+FRAME_SIZE = 960
+CHANNELS = 1
+
+
+def encode_all(encoders, pcm) -> float:
+    started = time.perf_counter()
+    for encoder in encoders:
+        encoder.encode(pcm, FRAME_SIZE)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    pcm = (bytes(range(256)) * FRAME_SIZE)[:2 * CHANNELS * FRAME_SIZE]
+
+    started = time.perf_counter()
+    encoders = [
+        pylibopus.Encoder(48000, CHANNELS, pylibopus.APPLICATION_VOIP)
+        for _ in range(SESSIONS)
+    ]
+    separate = time.perf_counter() - started
+    separate_encode = encode_all(encoders, pcm)
+    del encoders
+
+    started = time.perf_counter()
+    arena = pylibopus.arena.EncoderArena(
+        SESSIONS, 48000, CHANNELS, pylibopus.APPLICATION_VOIP)
+    views = list(arena)
+    pooled = time.perf_counter() - started
+    pooled_encode = encode_all(views, pcm)
+
+    print('{} sessions, {:.1f} MB of state in one block'.format(
+        SESSIONS, arena.nbytes / 1e6))
+    print('setup   separate {:8.1f} ms   arena {:8.1f} ms'.format(
+        separate * 1e3, pooled * 1e3))
+    print('encode  separate {:8.1f} ms   arena {:8.1f} ms'.format(
+        separate_encode * 1e3, pooled_encode * 1e3))
+
+
+if __name__ == '__main__':
+    main()
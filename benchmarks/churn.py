@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Resident memory under codec churn: decoders created and dropped at a high
+rate, each caught in a reference cycle as happens with callbacks that
+refer back to their session. With the cyclic GC held off (as under load,
+or with an interpreter without reference counting), dropped decoders keep
+their libopus state until the next collection, and RSS grows with every
+batch. Closing each decoder with a `with` block frees the state right
+away; RSS then only grows by the small Python objects of the cycles.
+
+Linux only: RSS is read from /proc/self/statm.
+
+Run with: python benchmarks/churn.py
+"""
+
+import gc
+import os
+import resource
+import time
+
+import pylibopus
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+BATCHES = 5
+PER_BATCH = 5000
+
+
+def rss_mib() -> float:
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def peak_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def session(close: bool) -> None:
+    decoder = pylibopus.Decoder(48000, 2)
+    decoder.on_packet = lambda packet: decoder.decode(packet, 960)
+    if close:
+        with decoder:
+            pass
+
+
+def churn(close: bool) -> None:
+    print('close() {}'.format('on' if close else 'off'))
+    started = time.perf_counter()
+    for batch in range(BATCHES):
+        for _ in range(PER_BATCH):
+            session(close)
+        print('  after {:6d} sessions: rss {:7.1f} MiB'.format(
+            (batch + 1) * PER_BATCH, rss_mib()))
+    elapsed = time.perf_counter() - started
+    print('  {:.0f} sessions/s, peak rss {:.1f} MiB'.format(
+        BATCHES * PER_BATCH / elapsed, peak_mib()))
+    gc.collect()
+
+
+def main() -> None:
+    gc.disable()
+    try:
+        churn(close=True)
+        churn(close=False)
+    finally:
+        gc.enable()
+
+
+if __name__ == '__main__':
+    main()
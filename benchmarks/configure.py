@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cost of one rate-adaptation step (set three CTLs, read them back) on
+Encoder, without and with the CTL cache.
+
+Run with: python benchmarks/configure.py
+"""
+
+import timeit
+
+import pylibopus
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+NUMBER = 20000
+
+
+def adapt_properties(encoder) -> tuple:
+    encoder.bitrate = 24000
+    encoder.packet_loss_perc = 5
+    encoder.complexity = 5
+    return (encoder.bitrate, encoder.packet_loss_perc, encoder.complexity)
+
+
+def adapt_configure(encoder) -> tuple:
+    encoder.configure(bitrate=24000, packet_loss_perc=5, complexity=5)
+    return (encoder.bitrate, encoder.packet_loss_perc, encoder.complexity)
+
+
+def main() -> None:
+    plain = pylibopus.Encoder(48000, 1, pylibopus.APPLICATION_VOIP)
+    cached = pylibopus.Encoder(48000, 1, pylibopus.APPLICATION_VOIP)
+    cached.ctl_cache = True
+
+    timings = [
+        ('properties', lambda: adapt_properties(plain)),
+        ('configure', lambda: adapt_configure(plain)),
+        ('properties+cache', lambda: adapt_properties(cached)),
+        ('configure+cache', lambda: adapt_configure(cached)),
+        ('read x3', lambda: (plain.bitrate, plain.packet_loss_perc,
+                             plain.complexity)),
+        ('read x3+cache', lambda: (cached.bitrate, cached.packet_loss_perc,
+                                   cached.complexity)),
+    ]
+    for name, step in timings:
+        seconds = timeit.timeit(step, number=NUMBER)
+        print('{:<18} {:8.2f} us/step'.format(name, seconds / NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cost per CTL call: the previous closures calling the variadic
+opus_encoder_ctl through its `argtypes`, against the prototypes of
+pylibopus.api.ctl.
+
+Run with: python benchmarks/ctl.py
+"""
+
+import ctypes
+import timeit
+
+import pylibopus
+import pylibopus.api.ctl
+import pylibopus.api.encoder
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+NUMBER = 200000
+
+
+def variadic_get(func, obj, request):
+    result = ctypes.c_int()
+    result_code = func(obj, request, ctypes.byref(result))
+    if result_code != pylibopus.OK:
+        raise pylibopus.OpusError(result_code)
+    return result.value
+
+
+def variadic_set(func, obj, request, value):
+    result_code = func(obj, request, value)
+    if result_code != pylibopus.OK:
+        raise pylibopus.OpusError(result_code)
+
+
+def main() -> None:
+    state = pylibopus.api.encoder.create_state(
+        48000, 2, pylibopus.APPLICATION_AUDIO)
+    func = pylibopus.api.encoder.libopus_ctl
+    get_complexity = pylibopus.api.ctl.get_complexity
+    set_complexity = pylibopus.api.ctl.set_complexity
+
+    timings = [
+        ('get variadic', lambda: variadic_get(
+            func, state, pylibopus.GET_COMPLEXITY_REQUEST)),
+        ('get direct', lambda: get_complexity(func, state)),
+        ('set variadic', lambda: variadic_set(
+            func, state, pylibopus.SET_COMPLEXITY_REQUEST, 5)),
+        ('set direct', lambda: set_complexity(func, state, 5)),
+    ]
+    print('direct calls: {}'.format(pylibopus.api.ctl.DIRECT_CALLS))
+    for name, call in timings:
+        seconds = timeit.timeit(call, number=NUMBER)
+        print('{:<14} {:8.3f} us/call'.format(name, seconds / NUMBER * 1e6))
+
+    pylibopus.api.encoder.destroy(state)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Per-frame cost of a Python loop over Encoder.encode() against one
+Encoder.encode_frames() call.
+
+Run with: python benchmarks/encode_frames.py
+"""
+
+import timeit
+
+import pylibopus
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+FRAME_SIZE = 960
+CHANNELS = 2
+FRAMES = 3000  # one minute of 20 ms frames
+NUMBER = 5
+
+
+def main() -> None:
+    encoder = pylibopus.Encoder(48000, CHANNELS, pylibopus.APPLICATION_AUDIO)
+    encoder.complexity = 0
+    frame_bytes = 2 * CHANNELS * FRAME_SIZE
+    pcm = bytes(frame_bytes * FRAMES)
+
+    def encode_loop():
+        view = memoryview(pcm)
+        return [
+            encoder.encode(view[offset:offset + frame_bytes].tobytes(),
+                           FRAME_SIZE)
+            for offset in range(0, len(pcm), frame_bytes)
+        ]
+
+    timings = {
+        'encode': timeit.timeit(encode_loop, number=NUMBER),
+        'encode_frames': timeit.timeit(
+            lambda: encoder.encode_frames(pcm, FRAME_SIZE), number=NUMBER),
+    }
+
+    for name, seconds in timings.items():
+        print('{:<14} {:8.2f} us/frame'.format(
+            name, seconds / (NUMBER * FRAMES) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
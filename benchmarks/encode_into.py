@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Per-frame cost of Encoder.encode() against Encoder.encode_into().
+
+Run with: python benchmarks/encode_into.py
+"""
+
+import timeit
+
+import pylibopus
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+FRAME_SIZE = 960
+CHANNELS = 2
+NUMBER = 20000
+
+
+def main() -> None:
+    encoder = pylibopus.Encoder(48000, CHANNELS, pylibopus.APPLICATION_AUDIO)
+    encoder.complexity = 0
+    pcm = bytes(2 * CHANNELS * FRAME_SIZE)
+    out = bytearray(4000)
+
+    timings = {
+        'encode': timeit.timeit(
+            lambda: encoder.encode(pcm, FRAME_SIZE), number=NUMBER),
+        'encode_into': timeit.timeit(
+            lambda: encoder.encode_into(pcm, FRAME_SIZE, out), number=NUMBER),
+    }
+
+    for name, seconds in timings.items():
+        print('{:<12} {:8.2f} us/frame'.format(
+            name, seconds / NUMBER * 1e6))
+    print('saved        {:8.2f} us/frame'.format(
+        (timings['encode'] - timings['encode_into']) / NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Throughput of EncoderPool with 1..N worker threads.
+
+Run with: python benchmarks/encoder_pool.py [sessions]
+"""
+
+import os
+import sys
+import time
+
+import pylibopus
+import pylibopus.parallel
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+FRAME_SIZE = 960
+CHANNELS = 1
+TICKS = 50
+
+
+def main() -> None:
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    pcm = (bytes(range(256)) * FRAME_SIZE)[:2 * CHANNELS * FRAME_SIZE]
+    encoders = [
+        pylibopus.Encoder(48000, CHANNELS, pylibopus.APPLICATION_VOIP)
+        for _ in range(sessions)
+    ]
+    jobs = [(encoder, pcm) for encoder in encoders]
+
+    baseline = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        with pylibopus.parallel.EncoderPool(max_workers=workers) as pool:
+            start = time.perf_counter()
+            for _ in range(TICKS):
+                pool.encode(jobs)
+            elapsed = time.perf_counter() - start
+
+        frames_per_second = sessions * TICKS / elapsed
+        baseline = baseline or frames_per_second
+        print('{:>3} workers {:10.0f} frames/s {:6.2f}x'.format(
+            workers, frames_per_second, frames_per_second / baseline))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Per-call overhead of Encoder/Decoder against FastEncoder/FastDecoder:
+2.5 ms mono frames at complexity 0, so that the time spent in libopus is
+small next to the Python side of each call.
+
+Run with: python benchmarks/fast_codec.py
+"""
+
+import timeit
+
+import pylibopus
+import pylibopus.fast
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+NUMBER = 50000
+FRAME_SIZE = 120
+
+
+def main() -> None:
+    pcm = bytes(range(256))[:2 * FRAME_SIZE]
+
+    encoder = pylibopus.Encoder(48000, 1, pylibopus.APPLICATION_AUDIO)
+    encoder.configure(complexity=0)
+    fast_encoder = pylibopus.fast.FastEncoder(
+        48000, 1, pylibopus.APPLICATION_AUDIO, FRAME_SIZE, complexity=0)
+    packet = encoder.encode(pcm, FRAME_SIZE)
+
+    decoder = pylibopus.Decoder(48000, 1)
+    fast_decoder = pylibopus.fast.FastDecoder(48000, 1, FRAME_SIZE)
+
+    timings = [
+        ('Encoder.encode', lambda: encoder.encode(pcm, FRAME_SIZE)),
+        ('FastEncoder.encode', lambda: fast_encoder.encode(pcm)),
+        ('Decoder.decode', lambda: decoder.decode(packet, FRAME_SIZE)),
+        ('FastDecoder.decode', lambda: fast_decoder.decode(packet)),
+    ]
+    for name, call in timings:
+        seconds = min(timeit.repeat(call, number=NUMBER, repeat=3))
+        print('{:<20} {:8.2f} us/call'.format(name, seconds / NUMBER * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cold-start cost of pylibopus: `import pylibopus` alone, creating a first
+Encoder with the library found by ctypes.util.find_library() or given in
+PYLIBOPUS_LIBRARY, and creating a MultiStreamEncoder, each measured in
+fresh interpreters against an empty `python -c pass`.
+
+Run with: python benchmarks/import_time.py
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import pylibopus.api
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+RUNS = 15
+
+CASES = (
+    ('python -c pass', 'pass', False),
+    ('import pylibopus', 'import pylibopus', False),
+    ('Encoder, find_library',
+     'import pylibopus; pylibopus.Encoder(48000, 2, "audio")', False),
+    ('Encoder, ' + pylibopus.api.LIBRARY_ENV,
+     'import pylibopus; pylibopus.Encoder(48000, 2, "audio")', True),
+    ('MultiStreamEncoder',
+     'import pylibopus; pylibopus.MultiStreamEncoder('
+     '48000, 2, 1, 1, [0, 1], "audio")', True),
+)
+
+
+def measure(code: str, env: dict) -> float:
+    """Median wall time of running `code` in a new interpreter."""
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], env=env, check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    env.pop(pylibopus.api.LIBRARY_ENV, None)
+    override = dict(env, **{
+        pylibopus.api.LIBRARY_ENV: pylibopus.api.find_library()})
+
+    for name, code, use_override in CASES:
+        seconds = measure(code, override if use_override else env)
+        print('{:<32} {:7.1f} ms'.format(name, seconds * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Per-packet TOC inspection through libopus against packet.inspect_many().
+
+Run with: python benchmarks/inspect_many.py
+"""
+
+import time
+
+import pylibopus
+import pylibopus.api.decoder
+import pylibopus.packet
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+PACKETS = 1000000
+
+
+def main() -> None:
+    encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+    data, offsets = encoder.encode_frames(bytes(3840 * 100), 960)
+    repeats = PACKETS // (len(offsets) - 1)
+    data, offsets = data * repeats, [
+        offset + len(data) * repeat
+        for repeat in range(repeats) for offset in offsets[:-1]
+    ] + [len(data) * repeats]
+    packets = [data[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    started = time.perf_counter()
+    for packet in packets[:PACKETS // 10]:
+        pylibopus.api.decoder.packet_get_bandwidth(packet)
+        pylibopus.api.decoder.packet_get_nb_channels(packet)
+        pylibopus.api.decoder.packet_get_nb_frames(packet)
+        pylibopus.api.decoder.packet_get_samples_per_frame(packet, 48000)
+    per_packet = (time.perf_counter() - started) * 10
+
+    started = time.perf_counter()
+    pylibopus.packet.inspect_many(data, offsets)
+    packed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pylibopus.packet.inspect_many(packets)
+    sequence = time.perf_counter() - started
+
+    print('{} packets'.format(PACKETS))
+    print('ctypes calls    {:8.3f} s (extrapolated)'.format(per_packet))
+    print('inspect packed  {:8.3f} s'.format(packed))
+    print('inspect list    {:8.3f} s'.format(sequence))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Random-access seek latency of OggOpusReader with a sidecar seek index.
+
+Run with: python benchmarks/ogg_seek.py
+"""
+
+import os
+import random
+import tempfile
+import time
+
+import pylibopus
+import pylibopus.ogg
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+CHANNELS = 2
+MINUTES = 10
+SEEKS = 1000
+
+
+def main() -> None:
+    handle, path = tempfile.mkstemp(suffix='.opus')
+    try:
+        encoder = pylibopus.Encoder(
+            48000, CHANNELS, pylibopus.APPLICATION_AUDIO)
+        encoder.complexity = 0
+        pcm = bytes(range(256)) * (2 * CHANNELS * 48000 * 60 // 256)
+        with os.fdopen(handle, 'wb') as sink:
+            with pylibopus.ogg.OggOpusWriter(sink, encoder) as writer:
+                writer.encode_stream([pcm] * MINUTES, 960)
+
+        started = time.perf_counter()
+        with pylibopus.ogg.OggOpusReader(path, index=True) as reader:
+            print('index build  {:8.2f} ms ({} pages)'.format(
+                (time.perf_counter() - started) * 1e3, len(reader.index)))
+
+        started = time.perf_counter()
+        with pylibopus.ogg.OggOpusReader(path, index=True) as reader:
+            print('index load   {:8.2f} ms'.format(
+                (time.perf_counter() - started) * 1e3))
+
+            decoder = reader.create_decoder()
+            duration = MINUTES * 60 * 48000
+            started = time.perf_counter()
+            for _ in range(SEEKS):
+                # Seek and decode up to the first chunk at the target
+                next(reader.seek(random.randrange(duration), decoder))
+            print('seek         {:8.2f} ms/seek'.format(
+                (time.perf_counter() - started) / SEEKS * 1e3))
+    finally:
+        for name in (path, path + '.idx'):
+            if os.path.exists(name):
+                os.remove(name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Packets per second and header bytes saved by merging 20 ms packets with
+Repacketizer, against the cost of merging and splitting them.
+
+Run with: python benchmarks/repacketizer.py
+"""
+
+import time
+
+import pylibopus
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+FRAME_SIZE = 960
+CHANNELS = 2
+PACKETS = 6000
+# IPv4 + UDP + RTP
+HEADER_BYTES = 20 + 8 + 12
+
+
+def main() -> None:
+    encoder = pylibopus.Encoder(48000, CHANNELS, pylibopus.APPLICATION_VOIP)
+    encoder.bitrate = 32000
+    pcm = (bytes(range(256)) * FRAME_SIZE)[:2 * CHANNELS * FRAME_SIZE]
+    packets = [encoder.encode(pcm, FRAME_SIZE) for _ in range(PACKETS)]
+    payload = sum(len(packet) for packet in packets)
+    repacketizer = pylibopus.Repacketizer()
+
+    print('merge  packets/s  saved/s  overhead  merge us  split us')
+    for count in range(1, 7):
+        started = time.perf_counter()
+        merged = repacketizer.merge_many(packets, count)
+        merge_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        repacketizer.split_many(merged)
+        split_time = time.perf_counter() - started
+
+        # Groups end early where the codec mode changes between packets.
+        rate = len(merged) / (PACKETS * FRAME_SIZE / 48000)
+        merged_bytes = sum(len(packet) for packet in merged)
+        overhead = (merged_bytes - payload + HEADER_BYTES * len(merged)) / \
+            payload
+        print('{:5d} {:10.1f} {:8.1f} {:8.1%} {:9.2f} {:9.2f}'.format(
+            count, rate, 50 - rate, overhead,
+            merge_time / PACKETS * 1e6, split_time / PACKETS * 1e6))
+
+
+if __name__ == '__main__':
+    main()
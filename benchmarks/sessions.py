@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+DecoderRegistry under churn: 50k mono streams, of which a tenth is
+replaced by new stream IDs every round, under a cap of 55k states, so
+streams that vanished are evicted when new ones need room. Reports the
+time per session start, lookups per second and the registry counters.
+
+Run with: python benchmarks/sessions.py
+"""
+
+import random
+import time
+
+import pylibopus.api.decoder
+import pylibopus.sessions
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+STREAMS = 50000
+ROUNDS = 5
+CHURN = 0.1
+MAX_STATES = 55000
+
+
+def main() -> None:
+    state_size = pylibopus.api.decoder.libopus_get_size(1)
+    registry = pylibopus.sessions.DecoderRegistry(
+        idle_timeout=None, max_bytes=MAX_STATES * state_size,
+        max_spare=STREAMS)
+    streams = list(range(STREAMS))
+    next_id = STREAMS
+    rng = random.Random(0)
+
+    started = time.perf_counter()
+    for stream_id in streams:
+        registry.get(stream_id, 48000, 1)
+    print('first {} sessions: {:.2f} us/session'.format(
+        STREAMS, (time.perf_counter() - started) / STREAMS * 1e6))
+
+    lookups = 0
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for index in rng.sample(range(STREAMS), int(STREAMS * CHURN)):
+            streams[index] = next_id
+            next_id += 1
+        rng.shuffle(streams)
+        for stream_id in streams:
+            registry.get(stream_id, 48000, 1)
+        lookups += STREAMS
+    elapsed = time.perf_counter() - started
+    print('{} rounds: {:.0f} lookups/s'.format(ROUNDS, lookups / elapsed))
+
+    stats = registry.stats()
+    print('live {} spare {} bytes {:.1f} MiB'.format(
+        stats.live, stats.spare, stats.bytes / 2 ** 20))
+    print('created {} recycled {} evicted {}'.format(
+        stats.created, stats.recycled, stats.evicted))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cost of branching a codec: copying its state with `clone()`, `snapshot()`
+and `restore()` against rebuilding the same state by creating a codec and
+replaying the frames it has seen, as needed without state copies to decode
+a packet two ways or to encode a frame at two bitrates.
+
+Run with: python benchmarks/state_copy.py
+"""
+
+import time
+
+import pylibopus
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+ROUNDS = 2000
+HISTORY = 10
+
+
+def per_call_us(func, rounds: int = ROUNDS) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main() -> None:
+    pcm = bytes(3840)
+    encoder = pylibopus.Encoder(48000, 2, 'audio')
+    packets = [encoder.encode(pcm, 960) for _ in range(HISTORY)]
+    decoder = pylibopus.Decoder(48000, 2)
+    for packet in packets:
+        decoder.decode(packet, 960)
+    snapshot = decoder.snapshot()
+
+    def replay_encoder():
+        replay = pylibopus.Encoder(48000, 2, 'audio')
+        for _ in range(HISTORY):
+            replay.encode(pcm, 960)
+
+    def replay_decoder():
+        replay = pylibopus.Decoder(48000, 2)
+        for packet in packets:
+            replay.decode(packet, 960)
+
+    rows = (
+        ('Encoder.clone()', per_call_us(encoder.clone)),
+        ('encoder replay of {} frames'.format(HISTORY),
+         per_call_us(replay_encoder, ROUNDS // 10)),
+        ('Decoder.clone()', per_call_us(decoder.clone)),
+        ('Decoder.snapshot()', per_call_us(decoder.snapshot)),
+        ('Decoder.restore()', per_call_us(lambda: decoder.restore(snapshot))),
+        ('decoder replay of {} frames'.format(HISTORY),
+         per_call_us(replay_decoder, ROUNDS // 10)),
+    )
+    for name, elapsed in rows:
+        print('{:<32} {:9.1f} us'.format(name, elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -22,11 +22,32 @@ from .constants import *  # NOQA
 
 from .constants import OK, APPLICATION_TYPES_MAP  # NOQA
 
-from .classes import Encoder, Decoder  # NOQA
-from .classes import MultiStreamEncoder, MultiStreamDecoder  # NOQA
-from .classes import ProjectionEncoder, ProjectionDecoder  # NOQA
+import typing
+
+# The classes, and with them libopus, are loaded on first access.
+CLASSES = (
+    'Encoder',
+    'Decoder',
+    'MultiStreamEncoder',
+    'MultiStreamDecoder',
+    'ProjectionEncoder',
+    'ProjectionDecoder',
+    'Repacketizer',
+)
 
 
 __author__ = 'Никита Кузнецов <self@svartalf.info>'
 __copyright__ = 'Copyright (c) 2012, SvartalF'
 __license__ = 'BSD 3-Clause License'
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in CLASSES:
+        from . import classes  # pylint: disable=import-outside-toplevel
+        return getattr(classes, name)
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(CLASSES))
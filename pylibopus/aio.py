@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+asyncio wrappers around the high-level codec objects.
+
+Frames queued on one wrapper while a batch is running in the executor are
+collected and sent to the executor together in the next hop, so a busy
+session costs one future per batch rather than one per frame. Batches run
+one after another, which keeps per-session ordering, and at most
+`max_pending` frames may be queued or running at once, which applies
+backpressure to fast producers.
+
+Usage example:
+
+>>> import asyncio
+>>> import pylibopus
+>>> import pylibopus.aio
+>>> async def main():
+...     enc = pylibopus.aio.AsyncEncoder(pylibopus.Encoder(48000, 2, 'voip'))
+...     return await enc.encode(bytes(3840), 960)
+>>> packet = asyncio.new_event_loop().run_until_complete(main())
+
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import typing
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+async def _aiter(items: typing.Any) -> typing.AsyncIterator[typing.Any]:
+    """Iterates over a sync or async iterable."""
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class _AsyncCodec(object):
+
+    """Per-session queue that batches calls into executor hops."""
+
+    def __init__(
+            self,
+            codec: typing.Any,
+            executor: typing.Optional[concurrent.futures.Executor] = None,
+            max_pending: int = 64
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError('`max_pending` must be positive')
+        self.codec = codec
+        self._executor = executor
+        self._max_pending = max_pending
+        self._pending = collections.deque()  # type: typing.Deque[typing.Any]
+        self._slots = None  # type: typing.Optional[asyncio.Semaphore]
+        self._draining = False
+        # Strong reference to the running drain task; the event loop only
+        # keeps weak ones.
+        self._drainer = None  # type: typing.Optional[asyncio.Task]
+
+    @staticmethod
+    def _run_batch(batch: typing.List[typing.Any]) -> typing.List[typing.Any]:
+        results = []
+        for method, args, _ in batch:
+            try:
+                results.append((True, method(*args)))
+            except Exception as exc:  # pylint: disable=broad-except
+                results.append((False, exc))
+        return results
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._pending:
+                batch = list(self._pending)
+                self._pending.clear()
+                try:
+                    results = await loop.run_in_executor(
+                        self._executor, self._run_batch, batch)
+                except Exception as exc:  # pylint: disable=broad-except
+                    # The executor failed (e.g. it was shut down): fail every
+                    # waiting caller rather than leave it hanging.
+                    batch.extend(self._pending)
+                    self._pending.clear()
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(exc)
+                    return
+                for (_, _, future), (ok, value) in zip(batch, results):
+                    if future.cancelled():
+                        continue
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+        finally:
+            self._draining = False
+            self._drainer = None
+
+    async def _submit(self, method: typing.Any, *args) -> typing.Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_pending)
+
+        await self._slots.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending.append((method, args, future))
+            if not self._draining:
+                self._draining = True
+                self._drainer = loop.create_task(self._drain())
+            return await future
+        finally:
+            self._slots.release()
+
+    async def _stream(
+            self,
+            method: typing.Any,
+            items: typing.Any,
+            *args
+    ) -> typing.AsyncIterator[typing.Any]:
+        tasks = collections.deque()  # type: typing.Deque[typing.Any]
+        try:
+            async for item in _aiter(items):
+                tasks.append(asyncio.ensure_future(
+                    self._submit(method, item, *args)))
+                if len(tasks) >= self._max_pending:
+                    yield await tasks.popleft()
+                while tasks and tasks[0].done():
+                    yield tasks.popleft().result()
+            while tasks:
+                yield await tasks.popleft()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class AsyncEncoder(_AsyncCodec):
+
+    """
+    asyncio front end for an `Encoder`, `MultiStreamEncoder` or
+    `ProjectionEncoder`.
+    """
+
+    async def encode(self, pcm_data: bytes, frame_size: int) -> bytes:
+        """Encodes given PCM data as Opus."""
+        return await self._submit(self.codec.encode, pcm_data, frame_size)
+
+    async def encode_float(self, pcm_data: bytes, frame_size: int) -> bytes:
+        """Encodes given float PCM data as Opus."""
+        return await self._submit(
+            self.codec.encode_float, pcm_data, frame_size)
+
+    def encode_stream(
+            self,
+            frames: typing.Any,
+            frame_size: int
+    ) -> typing.AsyncIterator[bytes]:
+        """
+        Encodes every PCM frame of a sync or async iterable, yielding the
+        packets in order.
+        """
+        return self._stream(self.codec.encode, frames, frame_size)
+
+    def encode_float_stream(
+            self,
+            frames: typing.Any,
+            frame_size: int
+    ) -> typing.AsyncIterator[bytes]:
+        """
+        Encodes every float PCM frame of a sync or async iterable, yielding
+        the packets in order.
+        """
+        return self._stream(self.codec.encode_float, frames, frame_size)
+
+
+class AsyncDecoder(_AsyncCodec):
+
+    """
+    asyncio front end for a `Decoder`, `MultiStreamDecoder` or
+    `ProjectionDecoder`.
+    """
+
+    async def decode(
+            self,
+            opus_data: bytes,
+            frame_size: int,
+            decode_fec: bool = False
+    ) -> bytes:
+        """Decodes given Opus data to PCM."""
+        return await self._submit(
+            self.codec.decode, opus_data, frame_size, decode_fec)
+
+    async def decode_float(
+            self,
+            opus_data: bytes,
+            frame_size: int,
+            decode_fec: bool = False
+    ) -> bytes:
+        """Decodes given Opus data to float PCM."""
+        return await self._submit(
+            self.codec.decode_float, opus_data, frame_size, decode_fec)
+
+    def decode_stream(
+            self,
+            packets: typing.Any,
+            frame_size: int,
+            decode_fec: bool = False
+    ) -> typing.AsyncIterator[bytes]:
+        """
+        Decodes every packet of a sync or async iterable, yielding the PCM
+        in order.
+        """
+        return self._stream(
+            self.codec.decode, packets, frame_size, decode_fec)
+
+    def decode_float_stream(
+            self,
+            packets: typing.Any,
+            frame_size: int,
+            decode_fec: bool = False
+    ) -> typing.AsyncIterator[bytes]:
+        """
+        Decodes every packet of a sync or async iterable, yielding the float
+        PCM in order.
+        """
+        return self._stream(
+            self.codec.decode_float, packets, frame_size, decode_fec)
@@ -3,23 +3,108 @@
 # pylint: disable=invalid-name
 #
 
-"""OpusLib Package."""
+"""OpusLib Package.
 
-import ctypes  # type: ignore
+The shared library is loaded on first access of `libopus`, which happens
+when the first binding module is imported. Its path is taken from the
+`PYLIBOPUS_LIBRARY` environment variable or an earlier `load_library()`
+call, and only otherwise looked up with ctypes.util.find_library(), which
+may spawn ldconfig or a compiler.
+
+Binding submodules are imported on first attribute access as well, so
+`pylibopus.api.multistream_encoder` works without importing it first.
+"""
 
-from ctypes.util import find_library  # type: ignore
+import ctypes  # type: ignore
+import importlib
+import os
+import threading
+import typing
 
 
-lib_location = find_library('opus')
+LIBRARY_ENV = 'PYLIBOPUS_LIBRARY'
 
-if lib_location is None:
-    raise Exception(
-        'Could not find Opus library. Make sure it is installed.')
+SUBMODULES = (
+    'buffer',
+    'ctl',
+    'decoder',
+    'encoder',
+    'info',
+    'multistream_decoder',
+    'multistream_encoder',
+    'projection_decoder',
+    'projection_encoder',
+    'repacketizer',
+)
 
-libopus = ctypes.cdll.LoadLibrary(lib_location)
+_load_lock = threading.Lock()
 
 
 c_int_pointer = ctypes.POINTER(ctypes.c_int)
 c_int16_pointer = ctypes.POINTER(ctypes.c_int16)
 c_float_pointer = ctypes.POINTER(ctypes.c_float)
 c_ubyte_pointer = ctypes.POINTER(ctypes.c_ubyte)
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def direct_call(func: typing.Any) -> typing.Any:
+    """
+    Returns a function pointer to the same C function as `func` with its
+    `restype` but without `argtypes`.
+
+    ctypes skips the per-argument `from_param` conversion on such calls, so
+    every argument must already be a ctypes object, bytes, None or an int
+    fitting in a C int. Calls through it pass all arguments as fixed ones,
+    which is wrong for variadic functions on Apple arm64.
+    """
+    return ctypes.CFUNCTYPE(func.restype)(
+        ctypes.cast(func, ctypes.c_void_p).value)
+
+
+def find_library() -> str:
+    """
+    Returns the path of the Opus library: `PYLIBOPUS_LIBRARY` if set,
+    otherwise the result of ctypes.util.find_library('opus').
+    """
+    location = os.environ.get(LIBRARY_ENV)
+    if location:
+        return location
+
+    import ctypes.util  # type: ignore  # pylint: disable=import-outside-toplevel
+    location = ctypes.util.find_library('opus')
+    if location is None:
+        raise Exception(
+            'Could not find Opus library. Make sure it is installed.')
+    return location
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def load_library(location: typing.Optional[str] = None) -> typing.Any:
+    """
+    Loads the Opus library from `location`, or from `find_library()`, and
+    returns it. Once loaded, later calls return the same library; to use a
+    specific file, call this before importing any binding module.
+    """
+    with _load_lock:
+        library = globals().get('libopus')
+        if library is None:
+            if location is None:
+                location = find_library()
+            library = ctypes.cdll.LoadLibrary(location)
+            globals().update(lib_location=location, libopus=library)
+        return library
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in ('libopus', 'lib_location'):
+        load_library()
+        return globals()[name]
+    if name in SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | {'libopus', 'lib_location'} |
+                  set(SUBMODULES))
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=invalid-name
+#
+
+"""
+Helpers mapping Python buffer-protocol objects onto ctypes arrays.
+
+Every helper here shares memory with the object it is given, so the
+object must be kept alive for as long as the returned ctypes array is
+used.
+
+NumPy is optional: when it is installed, C-contiguous int16/float32
+arrays are accepted wherever PCM buffers are, and decoders can return
+arrays shaped (frames, channels). It is not imported up front: an ndarray
+can only exist once NumPy has been imported, so it is looked up in
+sys.modules, and only imported when an ndarray is to be created.
+"""
+
+import array
+import ctypes  # type: ignore
+import importlib
+import sys
+import typing
+
+import pylibopus.exceptions
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+NUMPY_DTYPES = {
+    ctypes.c_int16: 'int16',
+    ctypes.c_float: 'float32',
+}
+
+
+def _ndarray_type() -> typing.Any:
+    """Returns numpy.ndarray if NumPy has been imported, else None."""
+    numpy = sys.modules.get('numpy')
+    return None if numpy is None else numpy.ndarray
+
+
+def is_ndarray(data: typing.Any) -> bool:
+    """Tells whether `data` is a numpy.ndarray, without importing NumPy."""
+    ndarray = _ndarray_type()
+    return ndarray is not None and isinstance(data, ndarray)
+
+
+def check_ndarray(data: typing.Any, ctype: typing.Any) -> None:
+    """
+    Checks that a numpy.ndarray `data` can be handed to libopus as an array
+    of `ctype` without copying.
+    """
+    if not data.flags.c_contiguous:
+        raise ValueError('NumPy arrays must be C-contiguous')
+    dtype = NUMPY_DTYPES.get(ctype)
+    if dtype is not None and data.dtype != dtype:
+        raise TypeError(
+            'Expected a {} array, got {}'.format(dtype, data.dtype))
+
+
+def empty_ndarray(frames: int, channels: int, ctype: typing.Any) -> typing.Any:
+    """
+    Allocates an uninitialised numpy.ndarray of `ctype` shaped
+    (frames, channels).
+    """
+    try:
+        numpy = importlib.import_module('numpy')
+    except ImportError:
+        raise ImportError('NumPy is required for ndarray output') from None
+    return numpy.empty((frames, channels), NUMPY_DTYPES[ctype])
+
+
+def as_array(data: typing.Any, ctype: typing.Any = ctypes.c_char) -> typing.Any:
+    """
+    Returns a ctypes array of `ctype` viewing the memory of `data`.
+
+    `bytes` and writable buffers (bytearray, memoryview, array.array,
+    numpy.ndarray, mmap) are mapped without copying. Other read-only
+    buffers are copied once.
+    """
+    if isinstance(data, bytes):
+        address = ctypes.cast(data, ctypes.c_void_p).value
+        return (ctype * (len(data) // ctypes.sizeof(ctype))).from_address(
+            address)
+
+    ndarray = _ndarray_type()
+    if ndarray is not None and isinstance(data, ndarray):
+        check_ndarray(data, ctype)
+
+    view = memoryview(data)
+    array_type = ctype * (view.nbytes // ctypes.sizeof(ctype))
+    if view.readonly:
+        return array_type.from_buffer_copy(view)
+    return array_type.from_buffer(view)
+
+
+def check_frame(pcm: typing.Any, frame_size: int, channels: int) -> None:
+    """
+    Checks that the ctypes array `pcm` holds a frame of `frame_size`
+    samples per channel, so that libopus does not read past its end.
+    """
+    if frame_size <= 0:
+        raise ValueError('`frame_size` must be positive')
+    if len(pcm) < frame_size * channels:
+        raise ValueError(
+            'PCM holds {} samples, frame_size * channels is {}'.format(
+                len(pcm), frame_size * channels))
+
+
+def check_packet_length(
+        packet: typing.Any,
+        length: typing.Optional[int]
+) -> int:
+    """
+    Checks that a packet of `length` bytes (all of it by default) fits in
+    the ctypes array `packet` and returns that length.
+    """
+    if length is None:
+        length = len(packet)
+    if not 1 <= length <= len(packet):
+        raise ValueError(
+            '`length` must be between 1 and {}, got {}'.format(
+                len(packet), length))
+    return length
+
+
+def check_packet_lengths(
+        packet: typing.Any,
+        length: int,
+        new_length: typing.Optional[int]
+) -> int:
+    """
+    Checks the lengths of a packet of `length` bytes to be padded to
+    `new_length` (all of the ctypes array `packet` by default) in place and
+    returns that new length.
+    """
+    check_packet_length(packet, length)
+    if new_length is None:
+        new_length = len(packet)
+    elif new_length > len(packet):
+        raise ValueError('`data` is shorter than `new_length`')
+    if new_length < length:
+        raise ValueError(
+            '`new_length` {} is smaller than `length` {}'.format(
+                new_length, length))
+    return new_length
+
+
+def as_writable_array(
+        data: typing.Any,
+        ctype: typing.Any = ctypes.c_char
+) -> typing.Any:
+    """
+    Returns a ctypes array of `ctype` viewing the memory of the writable
+    buffer `data`.
+
+    Raises TypeError if `data` is read-only.
+    """
+    ndarray = _ndarray_type()
+    if ndarray is not None and isinstance(data, ndarray):
+        check_ndarray(data, ctype)
+
+    view = memoryview(data)
+    if view.readonly:
+        raise TypeError('Output buffer must be writable')
+    return (ctype * (view.nbytes // ctypes.sizeof(ctype))).from_buffer(view)
+
+
+def as_packet(data: typing.Any) -> typing.Any:
+    """
+    Returns `data` in a form accepted by `const unsigned char *` packet
+    parameters.
+
+    `bytes` and None (packet loss) are passed through unchanged, other
+    buffers are mapped with `as_array`.
+    """
+    if data is None or isinstance(data, bytes):
+        return data
+    return as_array(data)
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_packets(  # pylint: disable=too-many-arguments,too-many-locals
+        decode_frame: typing.Any,
+        ctype: typing.Any,
+        decoder_state: ctypes.Structure,
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]],
+        pcm_data: typing.Any,
+        frame_size: int,
+        decode_fec: bool,
+        channels: int
+) -> typing.Union[array.array, typing.Any]:
+    """
+    Decodes consecutive packets with the libopus function `decode_frame`
+    into the writable buffer `pcm_data` of `ctype` samples, for the
+    decode_packets functions of the decoder modules.
+
+    Returns an `array.array('i')` of decoded samples per channel for each
+    packet.
+    """
+    if offsets is not None:
+        data = as_array(packets)
+        address = ctypes.addressof(data)
+        packets = [
+            ctypes.c_char_p(address + start)
+            for start in offsets[:-1]
+        ]
+        lengths = [
+            end - start
+            for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+    else:
+        lengths = [0 if packet is None else len(packet) for packet in packets]
+        packets = [as_packet(packet) for packet in packets]
+
+    pcm = as_writable_array(pcm_data, ctype)
+    pcm_address = ctypes.addressof(pcm)
+    sample_bytes = ctypes.sizeof(ctype) * channels
+    available = len(pcm) // channels
+    frame_type = ctype * (frame_size * channels)
+    _decode_fec = int(decode_fec)
+    written = 0
+    nb_samples = array.array('i')
+
+    for packet, length in zip(packets, lengths):
+        result = decode_frame(
+            decoder_state,
+            packet,
+            length,
+            frame_type.from_address(pcm_address + written * sample_bytes),
+            min(frame_size, available - written),
+            _decode_fec
+        )
+
+        if result < 0:
+            raise pylibopus.exceptions.OpusError(result)
+
+        written += result
+        nb_samples.append(result)
+
+    return nb_samples
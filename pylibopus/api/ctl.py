@@ -20,52 +20,140 @@ __license__ = 'BSD 3-Clause License'
 
 
 import ctypes  # type: ignore
+import platform
+import sys
 
 import pylibopus.api
 import pylibopus.exceptions
 
 
-def query(request):
+# On Apple arm64 variadic arguments are passed differently from fixed ones,
+# so the `opus_*_ctl` functions must be called as variadic functions there.
+DIRECT_CALLS = not (
+    sys.platform == 'darwin' and platform.machine() == 'arm64')
 
-    """Query encoder/decoder with a request value"""
 
-    def inner(func, obj):
-        result_code = func(obj, request)
+_MISSING = (None, None)
+
+
+class CtlRequest(object):
+
+    """
+    A CTL request, called as `request(ctl_function, state[, value])` with
+    one of the `libopus_ctl` functions of the api modules.
+
+    Calling `libopus_ctl` makes ctypes run `from_param` on the state and
+    the request for every call, which costs more than the CTL itself. The
+    first call of a request for a codec kind instead builds a prototype of
+    the same C function without `argtypes`, stored in a table keyed by the
+    state pointer type of that kind. Later calls with a state of that type
+    pass the state, the request code and the int or pointer argument as
+    they are. A state of any other type goes through `libopus_ctl`, so
+    ctypes still validates it.
+    """
+
+    __slots__ = ('request', '_calls')
+
+    def __init__(self, request: int) -> None:
+        self.request = request
+        self._calls = {}  # type: dict
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(type(self).__name__, self.request)
+
+    def prototype(self, func, obj):
+        """
+        Returns the call of this request for `func` and `obj`, building
+        and storing the prototype of `func` when `obj` is one of its states.
+        """
+        state_type = func.argtypes[0]
+        if obj.__class__ is not state_type:
+            return func
 
-        if result_code is not pylibopus.OK:
+        if DIRECT_CALLS:
+            call = pylibopus.api.direct_call(func)
+        else:
+            call = func
+        self._calls[state_type] = (func, call)
+        return call
+
+
+class Query(CtlRequest):
+
+    """CTL request without an argument."""
+
+    __slots__ = ()
+
+    def __call__(self, func, obj):
+        ctl, call = self._calls.get(obj.__class__, _MISSING)
+        if ctl is not func:
+            call = self.prototype(func, obj)
+        result_code = call(obj, self.request)
+
+        if result_code != pylibopus.OK:
             raise pylibopus.exceptions.OpusError(result_code)
 
         return result_code
 
-    return inner
 
+class Get(CtlRequest):
 
-def get(request, result_type):
+    """CTL request writing its result through a pointer argument."""
 
-    """Get CTL value from a encoder/decoder"""
+    __slots__ = ('result_type',)
 
-    def inner(func, obj):
-        result = result_type()
-        result_code = func(obj, request, ctypes.byref(result))
+    def __init__(self, request: int, result_type) -> None:
+        super().__init__(request)
+        self.result_type = result_type
 
-        if result_code is not pylibopus.OK:
+    def __call__(self, func, obj):
+        ctl, call = self._calls.get(obj.__class__, _MISSING)
+        if ctl is not func:
+            call = self.prototype(func, obj)
+        result = self.result_type()
+        result_code = call(obj, self.request, ctypes.byref(result))
+
+        if result_code != pylibopus.OK:
             raise pylibopus.exceptions.OpusError(result_code)
 
         return result.value
 
-    return inner
 
+class Set(CtlRequest):
 
-def ctl_set(request):
+    """CTL request taking an opus_int32 argument."""
 
-    """Set new CTL value to a encoder/decoder"""
+    __slots__ = ()
+
+    def __call__(self, func, obj, value):
+        ctl, call = self._calls.get(obj.__class__, _MISSING)
+        if ctl is not func:
+            call = self.prototype(func, obj)
+        result_code = call(obj, self.request, value)
 
-    def inner(func, obj, value):
-        result_code = func(obj, request, value)
-        if result_code is not pylibopus.OK:
+        if result_code != pylibopus.OK:
             raise pylibopus.exceptions.OpusError(result_code)
 
-    return inner
+
+def query(request):
+
+    """Query encoder/decoder with a request value"""
+
+    return Query(request)
+
+
+def get(request, result_type):
+
+    """Get CTL value from a encoder/decoder"""
+
+    return Get(request, result_type)
+
+
+def ctl_set(request):
+
+    """Set new CTL value to a encoder/decoder"""
+
+    return Set(request)
 
 #
 # Generic CTLs
@@ -13,6 +13,7 @@ import typing
 
 import pylibopus
 import pylibopus.api
+import pylibopus.api.buffer
 
 __author__ = 'Chris Hold>'
 __copyright__ = 'Copyright (c) 2024, Chris Hold'
@@ -32,7 +33,13 @@ MultiStreamDecoderPointer = ctypes.POINTER(MultiStreamDecoder)
 libopus_get_size = pylibopus.api.libopus.opus_multistream_decoder_get_size
 libopus_get_size.argtypes = (ctypes.c_int, ctypes.c_int)
 libopus_get_size.restype = ctypes.c_int
-libopus_get_size.__doc__ = 'Gets the size of an OpusMSEncoder structure'
+libopus_get_size.__doc__ = 'Gets the size of an OpusMSDecoder structure'
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def get_size(streams: int, coupled_streams: int) -> typing.Union[int, typing.Any]:
+    """Gets the size of an MultiStreamOpusDecoder structure."""
+    return libopus_get_size(streams, coupled_streams)
 
 
 libopus_create = pylibopus.api.libopus.opus_multistream_decoder_create
@@ -83,6 +90,126 @@ def create_state(fs: int, channels: int, streams: int, coupled_streams: int,
     return decoder_state
 
 
+libopus_init = pylibopus.api.libopus.opus_multistream_decoder_init
+libopus_init.argtypes = (
+    MultiStreamDecoderPointer,
+    ctypes.c_int,  # fs
+    ctypes.c_int,  # channels
+    ctypes.c_int,  # streams
+    ctypes.c_int,  # coupled streams
+    pylibopus.api.c_ubyte_pointer  # mapping
+)
+libopus_init.restype = ctypes.c_int
+
+
+def init_state(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        fs: int,
+        channels: int,
+        streams: int,
+        coupled_streams: int,
+        mapping: list
+) -> None:
+    """
+    Initializes a multistream decoder state in caller-allocated memory of
+    at least `libopus_get_size(streams, coupled_streams)` bytes. Such a
+    state must not be passed to `destroy`.
+    """
+    _umapping = (ctypes.c_ubyte * len(mapping))(*mapping)
+
+    result = libopus_init(
+        decoder_state,
+        fs,
+        channels,
+        streams,
+        coupled_streams,
+        _umapping
+    )
+
+    if result != pylibopus.OK:
+        raise pylibopus.exceptions.OpusError(result)
+
+
+libopus_packet_pad = pylibopus.api.libopus.opus_multistream_packet_pad
+libopus_packet_pad.argtypes = (
+    ctypes.c_char_p,
+    ctypes.c_int32,
+    ctypes.c_int32,
+    ctypes.c_int
+)
+libopus_packet_pad.restype = ctypes.c_int
+
+
+def packet_pad_in_place(
+        data: typing.Any,
+        streams: int,
+        length: int,
+        new_length: typing.Optional[int] = None
+) -> None:
+    """
+    Pads the multistream packet of `streams` streams held in the first
+    `length` bytes of the writable buffer `data` to `new_length` bytes (the
+    whole buffer by default), in place. The padding is added to the last
+    stream.
+
+    Raises ValueError when `length` is not within `data` or `new_length`
+    is smaller than `length` or larger than `data`.
+    """
+    packet = pylibopus.api.buffer.as_writable_array(data)
+    new_length = pylibopus.api.buffer.check_packet_lengths(
+        packet, length, new_length)
+
+    result = libopus_packet_pad(packet, length, new_length, streams)
+
+    if result < 0:
+        raise pylibopus.OpusError(result)
+
+
+def packet_pad(data: bytes, streams: int, new_length: int) -> bytes:
+    """Returns the multistream packet `data` padded to `new_length` bytes."""
+    packet = bytearray(max(len(data), new_length))
+    packet[:len(data)] = data
+    packet_pad_in_place(packet, streams, len(data), new_length)
+    return bytes(packet)
+
+
+libopus_packet_unpad = pylibopus.api.libopus.opus_multistream_packet_unpad
+libopus_packet_unpad.argtypes = (ctypes.c_char_p, ctypes.c_int32, ctypes.c_int)
+libopus_packet_unpad.restype = ctypes.c_int32
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def packet_unpad_in_place(
+        data: typing.Any,
+        streams: int,
+        length: typing.Optional[int] = None
+) -> typing.Union[int, typing.Any]:
+    """
+    Removes all padding from every stream of the multistream packet held in
+    the first `length` bytes (the whole buffer by default) of the writable
+    buffer `data`, in place.
+
+    Raises ValueError when `length` is not within `data`.
+
+    Returns the new length of the packet.
+    """
+    packet = pylibopus.api.buffer.as_writable_array(data)
+    length = pylibopus.api.buffer.check_packet_length(packet, length)
+
+    result = libopus_packet_unpad(packet, length, streams)
+
+    if result < 0:
+        raise pylibopus.OpusError(result)
+
+    return result
+
+
+def packet_unpad(data: bytes, streams: int) -> bytes:
+    """Returns the multistream packet `data` with all padding removed."""
+    packet = bytearray(data)
+    return bytes(packet[:packet_unpad_in_place(packet, streams)])
+
+
 libopus_decode = pylibopus.api.libopus.opus_multistream_decode
 libopus_decode.argtypes = (
     MultiStreamDecoderPointer,
@@ -113,13 +240,13 @@ def decode(  # pylint: disable=too-many-arguments
     _decode_fec = int(decode_fec)
     result = 0
 
-    pcm_size = frame_size * channels * ctypes.sizeof(ctypes.c_int16)
+    pcm_size = frame_size * channels
     pcm = (ctypes.c_int16 * pcm_size)()
     pcm_pointer = ctypes.cast(pcm, pylibopus.api.c_int16_pointer)
 
     result = libopus_decode(
         decoder_state,
-        opus_data,
+        pylibopus.api.buffer.as_packet(opus_data),
         length,
         pcm_pointer,
         frame_size,
@@ -129,7 +256,70 @@ def decode(  # pylint: disable=too-many-arguments
     if result < 0:
         raise pylibopus.exceptions.OpusError(result)
 
-    return array.array('h', pcm_pointer[:result * channels]).tobytes()
+    return ctypes.string_at(
+        pcm, result * channels * ctypes.sizeof(ctypes.c_int16))
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_into(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        opus_data: typing.Any,
+        length: int,
+        pcm_data: typing.Any,
+        decode_fec: bool,
+        channels: int = 2
+) -> typing.Union[int, typing.Any]:
+    """
+    Decode an Opus Frame into a caller-supplied opus_int16 PCM buffer.
+
+    `pcm_data` may be any writable buffer-protocol object; its size
+    determines the frame size offered to the decoder.
+
+    Returns the number of decoded samples per channel.
+    """
+    pcm = pylibopus.api.buffer.as_writable_array(pcm_data, ctypes.c_int16)
+
+    result = libopus_decode(
+        decoder_state,
+        pylibopus.api.buffer.as_packet(opus_data),
+        length,
+        pcm,
+        len(pcm) // channels,
+        int(decode_fec)
+    )
+
+    if result < 0:
+        raise pylibopus.exceptions.OpusError(result)
+
+    return result
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_packets(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]],
+        pcm_data: typing.Any,
+        frame_size: int,
+        decode_fec: bool,
+        channels: int = 2
+) -> typing.Union[array.array, typing.Any]:
+    """
+    Decode consecutive Opus packets into one contiguous opus_int16 PCM buffer.
+
+    With `offsets`, `packets` is a single packed buffer and packet `i` is
+    `packets[offsets[i]:offsets[i + 1]]`. Without it, `packets` is a
+    sequence of packets, where None stands for a lost packet.
+
+    Decoded frames are written back to back into the writable buffer
+    `pcm_data`, each limited to `frame_size` samples per channel.
+
+    Returns an `array.array('i')` of decoded samples per channel for each
+    packet.
+    """
+    return pylibopus.api.buffer.decode_packets(
+        libopus_decode, ctypes.c_int16, decoder_state, packets, offsets,
+        pcm_data, frame_size, decode_fec, channels)
 
 
 libopus_decode_float = pylibopus.api.libopus.opus_multistream_decode_float
@@ -161,13 +351,13 @@ def decode_float(  # pylint: disable=too-many-arguments
     """
     _decode_fec = int(decode_fec)
 
-    pcm_size = frame_size * channels * ctypes.sizeof(ctypes.c_float)
+    pcm_size = frame_size * channels
     pcm = (ctypes.c_float * pcm_size)()
     pcm_pointer = ctypes.cast(pcm, pylibopus.api.c_float_pointer)
 
     result = libopus_decode_float(
         decoder_state,
-        opus_data,
+        pylibopus.api.buffer.as_packet(opus_data),
         length,
         pcm_pointer,
         frame_size,
@@ -177,7 +367,70 @@ def decode_float(  # pylint: disable=too-many-arguments
     if result < 0:
         raise pylibopus.exceptions.OpusError(result)
 
-    return array.array('f', pcm[:result * channels]).tobytes()
+    return ctypes.string_at(
+        pcm, result * channels * ctypes.sizeof(ctypes.c_float))
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_float_into(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        opus_data: typing.Any,
+        length: int,
+        pcm_data: typing.Any,
+        decode_fec: bool,
+        channels: int = 2
+) -> typing.Union[int, typing.Any]:
+    """
+    Decode an Opus Frame into a caller-supplied float PCM buffer.
+
+    `pcm_data` may be any writable buffer-protocol object; its size
+    determines the frame size offered to the decoder.
+
+    Returns the number of decoded samples per channel.
+    """
+    pcm = pylibopus.api.buffer.as_writable_array(pcm_data, ctypes.c_float)
+
+    result = libopus_decode_float(
+        decoder_state,
+        pylibopus.api.buffer.as_packet(opus_data),
+        length,
+        pcm,
+        len(pcm) // channels,
+        int(decode_fec)
+    )
+
+    if result < 0:
+        raise pylibopus.exceptions.OpusError(result)
+
+    return result
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_float_packets(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]],
+        pcm_data: typing.Any,
+        frame_size: int,
+        decode_fec: bool,
+        channels: int = 2
+) -> typing.Union[array.array, typing.Any]:
+    """
+    Decode consecutive Opus packets into one contiguous float PCM buffer.
+
+    With `offsets`, `packets` is a single packed buffer and packet `i` is
+    `packets[offsets[i]:offsets[i + 1]]`. Without it, `packets` is a
+    sequence of packets, where None stands for a lost packet.
+
+    Decoded frames are written back to back into the writable buffer
+    `pcm_data`, each limited to `frame_size` samples per channel.
+
+    Returns an `array.array('i')` of decoded samples per channel for each
+    packet.
+    """
+    return pylibopus.api.buffer.decode_packets(
+        libopus_decode_float, ctypes.c_float, decoder_state, packets, offsets,
+        pcm_data, frame_size, decode_fec, channels)
 
 
 libopus_ctl = pylibopus.api.libopus.opus_multistream_decoder_ctl
@@ -13,6 +13,7 @@ import typing
 
 import pylibopus
 import pylibopus.api
+import pylibopus.api.buffer
 
 __author__ = 'Chris Hold>'
 __copyright__ = 'Copyright (c) 2024, Chris Hold'
@@ -30,11 +31,21 @@ ProjectionDecoderPointer = ctypes.POINTER(ProjectionDecoder)
 
 
 libopus_get_size = pylibopus.api.libopus.opus_projection_decoder_get_size
-libopus_get_size.argtypes = (ctypes.c_int, ctypes.c_int)
+libopus_get_size.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_int)
 libopus_get_size.restype = ctypes.c_int
 libopus_get_size.__doc__ = 'Gets the size of an OpusProjectionDecoder structure'
 
 
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def get_size(
+        channels: int,
+        streams: int,
+        coupled_streams: int
+) -> typing.Union[int, typing.Any]:
+    """Gets the size of an ProjectionOpusDecoder structure."""
+    return libopus_get_size(channels, streams, coupled_streams)
+
+
 libopus_create = pylibopus.api.libopus.opus_projection_decoder_create
 libopus_create.argtypes = (
     ctypes.c_int,  # fs
@@ -77,6 +88,49 @@ def create_state(fs: int, channels: int, streams: int, coupled_streams: int,
     return decoder_state
 
 
+libopus_init = pylibopus.api.libopus.opus_projection_decoder_init
+libopus_init.argtypes = (
+    ProjectionDecoderPointer,
+    ctypes.c_int,  # fs
+    ctypes.c_int,  # channels
+    ctypes.c_int,  # streams
+    ctypes.c_int,  # coupled streams
+    pylibopus.api.c_ubyte_pointer,  # demixing_matrix
+    ctypes.c_int  # demixing_matrix_size
+)
+libopus_init.restype = ctypes.c_int
+
+
+def init_state(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        fs: int,
+        channels: int,
+        streams: int,
+        coupled_streams: int,
+        demixing_matrix: list
+) -> None:
+    """
+    Initializes a projection decoder state in caller-allocated memory of at
+    least `libopus_get_size(channels, streams, coupled_streams)` bytes.
+    Such a state must not be passed to `destroy`.
+    """
+    _udemixing_matrix = (ctypes.c_ubyte * len(demixing_matrix))(
+        *demixing_matrix)
+
+    result = libopus_init(
+        decoder_state,
+        fs,
+        channels,
+        streams,
+        coupled_streams,
+        _udemixing_matrix,
+        len(demixing_matrix)
+    )
+
+    if result != pylibopus.OK:
+        raise pylibopus.exceptions.OpusError(result)
+
+
 libopus_decode = pylibopus.api.libopus.opus_projection_decode
 libopus_decode.argtypes = (
     ProjectionDecoderPointer,
@@ -107,13 +161,13 @@ def decode(  # pylint: disable=too-many-arguments
     _decode_fec = int(decode_fec)
     result = 0
 
-    pcm_size = frame_size * channels * ctypes.sizeof(ctypes.c_int16)
+    pcm_size = frame_size * channels
     pcm = (ctypes.c_int16 * pcm_size)()
     pcm_pointer = ctypes.cast(pcm, pylibopus.api.c_int16_pointer)
 
     result = libopus_decode(
         decoder_state,
-        opus_data,
+        pylibopus.api.buffer.as_packet(opus_data),
         length,
         pcm_pointer,
         frame_size,
@@ -123,7 +177,70 @@ def decode(  # pylint: disable=too-many-arguments
     if result < 0:
         raise pylibopus.exceptions.OpusError(result)
 
-    return array.array('h', pcm_pointer[:result * channels]).tobytes()
+    return ctypes.string_at(
+        pcm, result * channels * ctypes.sizeof(ctypes.c_int16))
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_into(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        opus_data: typing.Any,
+        length: int,
+        pcm_data: typing.Any,
+        decode_fec: bool,
+        channels: int = 2
+) -> typing.Union[int, typing.Any]:
+    """
+    Decode an Opus Frame into a caller-supplied opus_int16 PCM buffer.
+
+    `pcm_data` may be any writable buffer-protocol object; its size
+    determines the frame size offered to the decoder.
+
+    Returns the number of decoded samples per channel.
+    """
+    pcm = pylibopus.api.buffer.as_writable_array(pcm_data, ctypes.c_int16)
+
+    result = libopus_decode(
+        decoder_state,
+        pylibopus.api.buffer.as_packet(opus_data),
+        length,
+        pcm,
+        len(pcm) // channels,
+        int(decode_fec)
+    )
+
+    if result < 0:
+        raise pylibopus.exceptions.OpusError(result)
+
+    return result
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_packets(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]],
+        pcm_data: typing.Any,
+        frame_size: int,
+        decode_fec: bool,
+        channels: int = 2
+) -> typing.Union[array.array, typing.Any]:
+    """
+    Decode consecutive Opus packets into one contiguous opus_int16 PCM buffer.
+
+    With `offsets`, `packets` is a single packed buffer and packet `i` is
+    `packets[offsets[i]:offsets[i + 1]]`. Without it, `packets` is a
+    sequence of packets, where None stands for a lost packet.
+
+    Decoded frames are written back to back into the writable buffer
+    `pcm_data`, each limited to `frame_size` samples per channel.
+
+    Returns an `array.array('i')` of decoded samples per channel for each
+    packet.
+    """
+    return pylibopus.api.buffer.decode_packets(
+        libopus_decode, ctypes.c_int16, decoder_state, packets, offsets,
+        pcm_data, frame_size, decode_fec, channels)
 
 
 libopus_decode_float = pylibopus.api.libopus.opus_projection_decode_float
@@ -155,13 +272,13 @@ def decode_float(  # pylint: disable=too-many-arguments
     """
     _decode_fec = int(decode_fec)
 
-    pcm_size = frame_size * channels * ctypes.sizeof(ctypes.c_float)
+    pcm_size = frame_size * channels
     pcm = (ctypes.c_float * pcm_size)()
     pcm_pointer = ctypes.cast(pcm, pylibopus.api.c_float_pointer)
 
     result = libopus_decode_float(
         decoder_state,
-        opus_data,
+        pylibopus.api.buffer.as_packet(opus_data),
         length,
         pcm_pointer,
         frame_size,
@@ -171,7 +288,70 @@ def decode_float(  # pylint: disable=too-many-arguments
     if result < 0:
         raise pylibopus.exceptions.OpusError(result)
 
-    return array.array('f', pcm[:result * channels]).tobytes()
+    return ctypes.string_at(
+        pcm, result * channels * ctypes.sizeof(ctypes.c_float))
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_float_into(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        opus_data: typing.Any,
+        length: int,
+        pcm_data: typing.Any,
+        decode_fec: bool,
+        channels: int = 2
+) -> typing.Union[int, typing.Any]:
+    """
+    Decode an Opus Frame into a caller-supplied float PCM buffer.
+
+    `pcm_data` may be any writable buffer-protocol object; its size
+    determines the frame size offered to the decoder.
+
+    Returns the number of decoded samples per channel.
+    """
+    pcm = pylibopus.api.buffer.as_writable_array(pcm_data, ctypes.c_float)
+
+    result = libopus_decode_float(
+        decoder_state,
+        pylibopus.api.buffer.as_packet(opus_data),
+        length,
+        pcm,
+        len(pcm) // channels,
+        int(decode_fec)
+    )
+
+    if result < 0:
+        raise pylibopus.exceptions.OpusError(result)
+
+    return result
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def decode_float_packets(  # pylint: disable=too-many-arguments
+        decoder_state: ctypes.Structure,
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]],
+        pcm_data: typing.Any,
+        frame_size: int,
+        decode_fec: bool,
+        channels: int = 2
+) -> typing.Union[array.array, typing.Any]:
+    """
+    Decode consecutive Opus packets into one contiguous float PCM buffer.
+
+    With `offsets`, `packets` is a single packed buffer and packet `i` is
+    `packets[offsets[i]:offsets[i + 1]]`. Without it, `packets` is a
+    sequence of packets, where None stands for a lost packet.
+
+    Decoded frames are written back to back into the writable buffer
+    `pcm_data`, each limited to `frame_size` samples per channel.
+
+    Returns an `array.array('i')` of decoded samples per channel for each
+    packet.
+    """
+    return pylibopus.api.buffer.decode_packets(
+        libopus_decode_float, ctypes.c_float, decoder_state, packets, offsets,
+        pcm_data, frame_size, decode_fec, channels)
 
 
 libopus_ctl = pylibopus.api.libopus.opus_projection_decoder_ctl
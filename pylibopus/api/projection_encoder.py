@@ -13,6 +13,7 @@ import typing
 
 import pylibopus
 import pylibopus.api
+import pylibopus.api.buffer
 
 __author__ = 'Chris Hold'
 __copyright__ = 'Copyright (c) 2024, Chris Hold'
@@ -76,6 +77,53 @@ def create_state(fs: int, channels: int, mapping_family: int, streams: int,
     return encoder_state
 
 
+libopus_init = \
+    pylibopus.api.libopus.opus_projection_ambisonics_encoder_init
+libopus_init.argtypes = (
+    ProjectionEncoderPointer,
+    ctypes.c_int,  # fs
+    ctypes.c_int,  # channels
+    ctypes.c_int,  # mapping_family
+    pylibopus.api.c_int_pointer,  # streams
+    pylibopus.api.c_int_pointer,  # coupled streams
+    ctypes.c_int  # application
+)
+libopus_init.restype = ctypes.c_int
+
+
+def init_state(  # pylint: disable=too-many-arguments
+        encoder_state: ctypes.Structure,
+        fs: int,
+        channels: int,
+        mapping_family: int,
+        application: int
+) -> typing.Tuple[int, int]:
+    """
+    Initializes a projection encoder state in caller-allocated memory of at
+    least `get_size(channels, mapping_family)` bytes. Such a state must not
+    be passed to `destroy`.
+
+    Returns the number of streams and coupled streams chosen by libopus.
+    """
+    streams = ctypes.c_int()
+    coupled_streams = ctypes.c_int()
+
+    result = libopus_init(
+        encoder_state,
+        fs,
+        channels,
+        mapping_family,
+        ctypes.byref(streams),
+        ctypes.byref(coupled_streams),
+        application
+    )
+
+    if result != pylibopus.OK:
+        raise pylibopus.OpusError(result)
+
+    return streams.value, coupled_streams.value
+
+
 libopus_projection_encode = pylibopus.api.libopus.opus_projection_encode
 libopus_projection_encode.argtypes = (
     ProjectionEncoderPointer,
@@ -116,12 +164,12 @@ def encode(
         instant bitrate, but should not be used as the only bitrate control.
         Use OPUS_SET_BITRATE to control the bitrate.
     """
-    pcm_pointer = ctypes.cast(pcm_data, pylibopus.api.c_int16_pointer)
+    pcm = pylibopus.api.buffer.as_array(pcm_data, ctypes.c_int16)
     opus_data = (ctypes.c_char * max_data_bytes)()
 
     result = libopus_projection_encode(
         encoder_state,
-        pcm_pointer,
+        pcm,
         frame_size,
         opus_data,
         max_data_bytes
@@ -131,7 +179,97 @@ def encode(
         raise pylibopus.OpusError(
             'Opus Encoder returned result="{}"'.format(result))
 
-    return array.array('b', opus_data[:result]).tobytes()
+    return opus_data[:result]
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def encode_into(
+        encoder_state: ctypes.Structure,
+        pcm_data: typing.Any,
+        frame_size: int,
+        data: typing.Any,
+        channels: int
+) -> typing.Union[int, typing.Any]:
+    """
+    Encodes an Opus Frame into a caller-supplied buffer.
+
+    `pcm_data` may be any buffer-protocol object holding opus_int16 samples,
+    `data` any writable buffer-protocol object (bytearray, memoryview,
+    numpy.ndarray). The whole of `data` is offered to the encoder as
+    max_data_bytes. `pcm_data` must hold at least `frame_size` * `channels`
+    samples, or ValueError is raised.
+
+    Returns the length of the encoded packet in bytes.
+    """
+    pcm = pylibopus.api.buffer.as_array(pcm_data, ctypes.c_int16)
+    pylibopus.api.buffer.check_frame(pcm, frame_size, channels)
+    opus_data = pylibopus.api.buffer.as_writable_array(data)
+
+    result = libopus_projection_encode(
+        encoder_state,
+        pcm,
+        frame_size,
+        opus_data,
+        len(opus_data)
+    )
+
+    if result < 0:
+        raise pylibopus.OpusError(result)
+
+    return result
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def encode_frames(  # pylint: disable=too-many-locals
+        encoder_state: ctypes.Structure,
+        pcm_data: typing.Any,
+        frame_size: int,
+        channels: int,
+        max_data_bytes: int = 4000
+) -> typing.Tuple[bytes, typing.Any]:
+    """
+    Encodes consecutive Opus frames from one contiguous opus_int16 PCM buffer.
+
+    The length of `pcm_data` must be a multiple of `frame_size` * `channels`
+    samples.
+
+    Returns a tuple of the concatenated packets and an `array.array('Q')`
+    of offsets, so that packet `i` is `data[offsets[i]:offsets[i + 1]]`.
+    """
+    pcm = pylibopus.api.buffer.as_array(pcm_data, ctypes.c_int16)
+    if frame_size <= 0:
+        raise ValueError('`frame_size` must be positive')
+    frame_samples = frame_size * channels
+    nb_frames, remainder = divmod(len(pcm), frame_samples)
+    if remainder:
+        raise ValueError(
+            'PCM length must be a multiple of frame_size * channels')
+
+    frame_type = ctypes.c_int16 * frame_samples
+    frame_bytes = ctypes.sizeof(frame_type)
+    address = ctypes.addressof(pcm)
+    opus_data = (ctypes.c_char * max_data_bytes)()
+    opus_view = memoryview(opus_data)
+    encode_frame = libopus_projection_encode
+    data = bytearray()
+    offsets = array.array('Q', [0])
+
+    for index in range(nb_frames):
+        result = encode_frame(
+            encoder_state,
+            frame_type.from_address(address + index * frame_bytes),
+            frame_size,
+            opus_data,
+            max_data_bytes
+        )
+
+        if result < 0:
+            raise pylibopus.OpusError(result)
+
+        data += opus_view[:result]
+        offsets.append(len(data))
+
+    return bytes(data), offsets
 
 
 libopus_projection_encode_float = pylibopus.api.libopus.opus_projection_encode_float
@@ -153,12 +291,12 @@ def encode_float(
         max_data_bytes: int
 ) -> typing.Union[bytes, typing.Any]:
     """Encodes an Opus frame from floating point input"""
-    pcm_pointer = ctypes.cast(pcm_data, pylibopus.api.c_float_pointer)
+    pcm = pylibopus.api.buffer.as_array(pcm_data, ctypes.c_float)
     opus_data = (ctypes.c_char * max_data_bytes)()
 
     result = libopus_projection_encode_float(
         encoder_state,
-        pcm_pointer,
+        pcm,
         frame_size,
         opus_data,
         max_data_bytes
@@ -168,7 +306,92 @@ def encode_float(
         raise pylibopus.OpusError(
             'Encoder returned result="{}"'.format(result))
 
-    return array.array('b', opus_data[:result]).tobytes()
+    return opus_data[:result]
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def encode_float_into(
+        encoder_state: ctypes.Structure,
+        pcm_data: typing.Any,
+        frame_size: int,
+        data: typing.Any,
+        channels: int
+) -> typing.Union[int, typing.Any]:
+    """
+    Encodes an Opus frame from floating point input into a caller-supplied
+    buffer. `pcm_data` must hold at least `frame_size` * `channels` samples.
+
+    Returns the length of the encoded packet in bytes.
+    """
+    pcm = pylibopus.api.buffer.as_array(pcm_data, ctypes.c_float)
+    pylibopus.api.buffer.check_frame(pcm, frame_size, channels)
+    opus_data = pylibopus.api.buffer.as_writable_array(data)
+
+    result = libopus_projection_encode_float(
+        encoder_state,
+        pcm,
+        frame_size,
+        opus_data,
+        len(opus_data)
+    )
+
+    if result < 0:
+        raise pylibopus.OpusError(result)
+
+    return result
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def encode_float_frames(  # pylint: disable=too-many-locals
+        encoder_state: ctypes.Structure,
+        pcm_data: typing.Any,
+        frame_size: int,
+        channels: int,
+        max_data_bytes: int = 4000
+) -> typing.Tuple[bytes, typing.Any]:
+    """
+    Encodes consecutive Opus frames from one contiguous float PCM buffer.
+
+    The length of `pcm_data` must be a multiple of `frame_size` * `channels`
+    samples.
+
+    Returns a tuple of the concatenated packets and an `array.array('Q')`
+    of offsets, so that packet `i` is `data[offsets[i]:offsets[i + 1]]`.
+    """
+    pcm = pylibopus.api.buffer.as_array(pcm_data, ctypes.c_float)
+    if frame_size <= 0:
+        raise ValueError('`frame_size` must be positive')
+    frame_samples = frame_size * channels
+    nb_frames, remainder = divmod(len(pcm), frame_samples)
+    if remainder:
+        raise ValueError(
+            'PCM length must be a multiple of frame_size * channels')
+
+    frame_type = ctypes.c_float * frame_samples
+    frame_bytes = ctypes.sizeof(frame_type)
+    address = ctypes.addressof(pcm)
+    opus_data = (ctypes.c_char * max_data_bytes)()
+    opus_view = memoryview(opus_data)
+    encode_frame = libopus_projection_encode_float
+    data = bytearray()
+    offsets = array.array('Q', [0])
+
+    for index in range(nb_frames):
+        result = encode_frame(
+            encoder_state,
+            frame_type.from_address(address + index * frame_bytes),
+            frame_size,
+            opus_data,
+            max_data_bytes
+        )
+
+        if result < 0:
+            raise pylibopus.OpusError(result)
+
+        data += opus_view[:result]
+        offsets.append(len(data))
+
+    return bytes(data), offsets
 
 
 def get_demixing_matrix(
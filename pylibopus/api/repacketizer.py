@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=invalid-name,too-few-public-methods
+#
+
+"""
+CTypes mapping between libopus repacketizer functions and Python.
+"""
+
+import ctypes  # type: ignore
+import typing
+
+import pylibopus
+import pylibopus.api
+import pylibopus.api.buffer
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class Repacketizer(ctypes.Structure):
+    """Opus repacketizer state.
+    Merges frames of several packets into one packet, or splits a packet
+    into packets of fewer frames.
+    """
+    pass
+
+
+RepacketizerPointer = ctypes.POINTER(Repacketizer)
+
+
+libopus_get_size = pylibopus.api.libopus.opus_repacketizer_get_size
+libopus_get_size.argtypes = ()
+libopus_get_size.restype = ctypes.c_int
+libopus_get_size.__doc__ = 'Gets the size of an OpusRepacketizer structure'
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def get_size() -> typing.Union[int, typing.Any]:
+    """Gets the size of an OpusRepacketizer structure."""
+    return libopus_get_size()
+
+
+libopus_create = pylibopus.api.libopus.opus_repacketizer_create
+libopus_create.argtypes = ()
+libopus_create.restype = RepacketizerPointer
+
+
+def create_state() -> ctypes.Structure:
+    """
+    Allocates memory and initializes the new repacketizer with
+    opus_repacketizer_init().
+    """
+    repacketizer_state = libopus_create()
+
+    if not repacketizer_state:
+        raise pylibopus.OpusError(pylibopus.ALLOC_FAIL)
+
+    return repacketizer_state
+
+
+libopus_init = pylibopus.api.libopus.opus_repacketizer_init
+libopus_init.argtypes = (RepacketizerPointer,)
+libopus_init.restype = RepacketizerPointer
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def init(repacketizer_state: ctypes.Structure) -> typing.Any:
+    """
+    (Re)initializes a repacketizer state, discarding the packets added
+    since the last call.
+    """
+    return libopus_init(repacketizer_state)
+
+
+libopus_cat = pylibopus.api.libopus.opus_repacketizer_cat
+libopus_cat.argtypes = (RepacketizerPointer, ctypes.c_char_p, ctypes.c_int32)
+libopus_cat.restype = ctypes.c_int
+
+
+def cat(
+        repacketizer_state: ctypes.Structure,
+        data: bytes,
+        length: typing.Optional[int] = None
+) -> None:
+    """
+    Adds a packet to the current repacketizer state.
+
+    libopus keeps pointers into `data` rather than copying it, so `data`
+    must stay alive and unchanged until the frames have been output with
+    `out` or `out_range` and the state has been re-initialized.
+
+    Parameters
+    [in]	rp	OpusRepacketizer*: The repacketizer state
+    [in]	data	const unsigned char*: The packet data
+    [in]	len	opus_int32: The number of bytes in the packet data
+
+    Return values
+    OPUS_INVALID_PACKET	The packet did not have a valid TOC sequence, the
+        packet's TOC sequence was not compatible with previously submitted
+        packets, or adding this packet would increase the total amount of
+        audio stored in the repacketizer state to more than 120 ms.
+    """
+    if length is None:
+        length = len(data)
+
+    result = libopus_cat(repacketizer_state, data, length)
+
+    if result < 0:
+        raise pylibopus.OpusError(result)
+
+
+libopus_out_range = pylibopus.api.libopus.opus_repacketizer_out_range
+libopus_out_range.argtypes = (
+    RepacketizerPointer,
+    ctypes.c_int,
+    ctypes.c_int,
+    ctypes.c_char_p,
+    ctypes.c_int32
+)
+libopus_out_range.restype = ctypes.c_int32
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def out_range(
+        repacketizer_state: ctypes.Structure,
+        begin: int,
+        end: int,
+        data: typing.Any
+) -> typing.Union[int, typing.Any]:
+    """
+    Constructs a new packet from frames [begin, end) of the current
+    repacketizer state into the writable buffer `data`.
+
+    Returns the length of the new packet in bytes.
+
+    Return values
+    OPUS_BAD_ARG	[begin, end) was an invalid range of frames
+    OPUS_BUFFER_TOO_SMALL	`data` was not large enough for the packet
+    """
+    out = pylibopus.api.buffer.as_writable_array(data)
+
+    result = libopus_out_range(repacketizer_state, begin, end, out, len(out))
+
+    if result < 0:
+        raise pylibopus.OpusError(result)
+
+    return result
+
+
+libopus_get_nb_frames = pylibopus.api.libopus.opus_repacketizer_get_nb_frames
+libopus_get_nb_frames.argtypes = (RepacketizerPointer,)
+libopus_get_nb_frames.restype = ctypes.c_int
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def get_nb_frames(
+        repacketizer_state: ctypes.Structure
+) -> typing.Union[int, typing.Any]:
+    """
+    Returns the total number of frames contained in packet data submitted
+    to the repacketizer state since the last call to `init` or
+    `create_state`.
+    """
+    return libopus_get_nb_frames(repacketizer_state)
+
+
+libopus_out = pylibopus.api.libopus.opus_repacketizer_out
+libopus_out.argtypes = (RepacketizerPointer, ctypes.c_char_p, ctypes.c_int32)
+libopus_out.restype = ctypes.c_int32
+
+
+# FIXME: Remove typing.Any once we have a stub for ctypes
+def out(
+        repacketizer_state: ctypes.Structure,
+        data: typing.Any
+) -> typing.Union[int, typing.Any]:
+    """
+    Constructs a new packet from all frames of the current repacketizer
+    state into the writable buffer `data`.
+
+    Returns the length of the new packet in bytes.
+    """
+    out_data = pylibopus.api.buffer.as_writable_array(data)
+
+    result = libopus_out(repacketizer_state, out_data, len(out_data))
+
+    if result < 0:
+        raise pylibopus.OpusError(result)
+
+    return result
+
+
+destroy = pylibopus.api.libopus.opus_repacketizer_destroy
+destroy.argtypes = (RepacketizerPointer,)  # must be sequence (,) of types!
+destroy.restype = None
+destroy.__doc__ = \
+    "Frees an OpusRepacketizer allocated by opus_repacketizer_create()"
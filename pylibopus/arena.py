@@ -0,0 +1,425 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Codec states allocated together in one contiguous block.
+
+`opus_*_create` allocates every state on its own. An arena instead asks
+libopus for the state size once, allocates a single block for `count`
+states and initializes each of them in place with `opus_*_init`. Indexing
+an arena returns a view: an instance of the matching high-level class
+(`arena[0]` of an `EncoderArena` is an `Encoder`) that uses the state in
+the block and never frees it. The block is freed with the arena once no
+view of it is left.
+
+Views are cheap to create and are not cached, so two views of one slot
+share its state.
+
+Usage example:
+
+>>> import pylibopus
+>>> import pylibopus.arena
+>>> arena = pylibopus.arena.EncoderArena(1000, 48000, 2, 'voip')
+>>> encoder = arena[42]
+>>> encoder.bitrate = 24000
+>>> packet = encoder.encode(bytes(3840), 960)
+
+"""
+
+import abc
+import ctypes  # type: ignore
+import typing
+
+import pylibopus
+import pylibopus.api.decoder
+import pylibopus.api.encoder
+import pylibopus.api.multistream_decoder
+import pylibopus.api.multistream_encoder
+import pylibopus.api.projection_decoder
+import pylibopus.api.projection_encoder
+import pylibopus.classes
+import pylibopus.memory
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+# States are placed on 16-byte boundaries.
+ALIGNMENT = 16
+
+
+def _application(application: typing.Any) -> int:
+    if application in pylibopus.APPLICATION_TYPES_MAP:
+        return pylibopus.APPLICATION_TYPES_MAP[application]
+    if application in pylibopus.APPLICATION_TYPES_MAP.values():
+        return application
+    raise ValueError(
+        "`application` value must be in 'voip', 'audio' or "
+        "'restricted_lowdelay'")
+
+
+class StateArena(abc.ABC):
+
+    """
+    One block of memory holding `count` codec states of `state_size` bytes.
+
+    Subclasses initialize the states and build the views.
+    """
+
+    pointer_type = ctypes.c_void_p  # type: typing.Any
+
+    def __init__(self, count: int, state_size: int) -> None:
+        if count < 1:
+            raise ValueError('`count` must be positive')
+        self.count = count
+        self.state_size = state_size
+        self.stride = -(-state_size // ALIGNMENT) * ALIGNMENT
+        # One extra stride leaves room to align the first state.
+        self._block = (ctypes.c_char * (self.stride * (count + 1)))()
+        address = ctypes.addressof(self._block)
+        self._address = address + (-address % ALIGNMENT)
+        pylibopus.memory.track(self, self.nbytes)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> typing.Any:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('arena index out of range')
+        return self._view(index, self.state(index))
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        for index in range(self.count):
+            yield self[index]
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the whole block in bytes."""
+        return ctypes.sizeof(self._block)
+
+    def state(self, index: int) -> typing.Any:
+        """Returns a `pointer_type` to the state in slot `index`."""
+        return ctypes.cast(self._address + index * self.stride,
+                           self.pointer_type)
+
+    def _init_states(self) -> None:
+        for index in range(self.count):
+            self._init_state(self.state(index))
+
+    @abc.abstractmethod
+    def _init_state(self, state: typing.Any) -> None:
+        """Initializes the uninitialized codec state `state` in place."""
+
+    @abc.abstractmethod
+    def _view(self, index: int, state: typing.Any) -> typing.Any:
+        """Returns a high-level object using `state`, in slot `index`."""
+
+
+class EncoderView(pylibopus.classes.Encoder):
+
+    """`Encoder` whose state lives in an `EncoderArena`."""
+
+    def __init__(  # pylint: disable=super-init-not-called
+            self,
+            arena: 'EncoderArena',
+            index: int,
+            encoder_state: typing.Any
+    ) -> None:
+        self.arena = arena
+        self.index = index
+        self._fs = arena.fs
+        self._channels = arena.channels
+        self._application = arena.application
+        self.encoder_state = encoder_state
+
+
+class EncoderArena(StateArena):
+
+    """`count` encoder states in one block."""
+
+    pointer_type = pylibopus.api.encoder.EncoderPointer
+
+    def __init__(
+            self,
+            count: int,
+            fs: int,
+            channels: int,
+            application: typing.Any
+    ) -> None:
+        self.fs = fs
+        self.channels = channels
+        self.application = _application(application)
+        super().__init__(count, pylibopus.api.encoder.get_size(channels))
+        self._init_states()
+
+    def _init_state(self, state: typing.Any) -> None:
+        pylibopus.api.encoder.init_state(
+            state, self.fs, self.channels, self.application)
+
+    def _view(self, index: int, state: typing.Any) -> EncoderView:
+        return EncoderView(self, index, state)
+
+
+class DecoderView(pylibopus.classes.Decoder):
+
+    """`Decoder` whose state lives in a `DecoderArena`."""
+
+    def __init__(  # pylint: disable=super-init-not-called
+            self,
+            arena: 'DecoderArena',
+            index: int,
+            decoder_state: typing.Any
+    ) -> None:
+        self.arena = arena
+        self.index = index
+        self._fs = arena.fs
+        self._channels = arena.channels
+        self.decoder_state = decoder_state
+
+
+class DecoderArena(StateArena):
+
+    """`count` decoder states in one block."""
+
+    pointer_type = pylibopus.api.decoder.DecoderPointer
+
+    def __init__(self, count: int, fs: int, channels: int) -> None:
+        if channels not in (1, 2):
+            raise ValueError('Wrong channels value. Must be equal to 1 or 2')
+        self.fs = fs
+        self.channels = channels
+        super().__init__(
+            count, pylibopus.api.decoder.get_size(channels))
+        self._init_states()
+
+    def _init_state(self, state: typing.Any) -> None:
+        pylibopus.api.decoder.init_state(state, self.fs, self.channels)
+
+    def _view(self, index: int, state: typing.Any) -> DecoderView:
+        return DecoderView(self, index, state)
+
+
+class MultiStreamEncoderView(pylibopus.classes.MultiStreamEncoder):
+
+    """`MultiStreamEncoder` whose state lives in a `MultiStreamEncoderArena`."""
+
+    def __init__(  # pylint: disable=super-init-not-called
+            self,
+            arena: 'MultiStreamEncoderArena',
+            index: int,
+            msencoder_state: typing.Any
+    ) -> None:
+        self.arena = arena
+        self.index = index
+        self._fs = arena.fs
+        self._channels = arena.channels
+        self._streams = arena.streams
+        self._coupled_streams = arena.coupled_streams
+        self._mapping = arena.mapping
+        self._application = arena.application
+        self.msencoder_state = msencoder_state
+
+
+class MultiStreamEncoderArena(StateArena):
+
+    """`count` multistream encoder states in one block."""
+
+    pointer_type = pylibopus.api.multistream_encoder.MultiStreamEncoderPointer
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            count: int,
+            fs: int,
+            channels: int,
+            streams: int,
+            coupled_streams: int,
+            mapping: list,
+            application: typing.Any
+    ) -> None:
+        self.fs = fs
+        self.channels = channels
+        self.streams = streams
+        self.coupled_streams = coupled_streams
+        self.mapping = mapping
+        self.application = _application(application)
+        super().__init__(count, pylibopus.api.multistream_encoder.get_size(
+            streams, coupled_streams))
+        self._init_states()
+
+    def _init_state(self, state: typing.Any) -> None:
+        pylibopus.api.multistream_encoder.init_state(
+            state, self.fs, self.channels, self.streams,
+            self.coupled_streams, self.mapping, self.application)
+
+    def _view(self, index: int, state: typing.Any) -> MultiStreamEncoderView:
+        return MultiStreamEncoderView(self, index, state)
+
+
+class MultiStreamDecoderView(pylibopus.classes.MultiStreamDecoder):
+
+    """`MultiStreamDecoder` whose state lives in a `MultiStreamDecoderArena`."""
+
+    def __init__(  # pylint: disable=super-init-not-called
+            self,
+            arena: 'MultiStreamDecoderArena',
+            index: int,
+            msdecoder_state: typing.Any
+    ) -> None:
+        self.arena = arena
+        self.index = index
+        self._fs = arena.fs
+        self._channels = arena.channels
+        self._streams = arena.streams
+        self._coupled_streams = arena.coupled_streams
+        self._mapping = arena.mapping
+        self.msdecoder_state = msdecoder_state
+
+
+class MultiStreamDecoderArena(StateArena):
+
+    """`count` multistream decoder states in one block."""
+
+    pointer_type = pylibopus.api.multistream_decoder.MultiStreamDecoderPointer
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            count: int,
+            fs: int,
+            channels: int,
+            streams: int,
+            coupled_streams: int,
+            mapping: list
+    ) -> None:
+        self.fs = fs
+        self.channels = channels
+        self.streams = streams
+        self.coupled_streams = coupled_streams
+        self.mapping = mapping
+        super().__init__(
+            count, pylibopus.api.multistream_decoder.get_size(
+                streams, coupled_streams))
+        self._init_states()
+
+    def _init_state(self, state: typing.Any) -> None:
+        pylibopus.api.multistream_decoder.init_state(
+            state, self.fs, self.channels, self.streams,
+            self.coupled_streams, self.mapping)
+
+    def _view(self, index: int, state: typing.Any) -> MultiStreamDecoderView:
+        return MultiStreamDecoderView(self, index, state)
+
+
+class ProjectionEncoderView(pylibopus.classes.ProjectionEncoder):
+
+    """`ProjectionEncoder` whose state lives in a `ProjectionEncoderArena`."""
+
+    def __init__(  # pylint: disable=super-init-not-called
+            self,
+            arena: 'ProjectionEncoderArena',
+            index: int,
+            projencoder_state: typing.Any
+    ) -> None:
+        self.arena = arena
+        self.index = index
+        self._fs = arena.fs
+        self._channels = arena.channels
+        self._mapping_family = arena.mapping_family
+        self._streams = arena.streams
+        self._coupled_streams = arena.coupled_streams
+        self._application = arena.application
+        self.projencoder_state = projencoder_state
+
+
+class ProjectionEncoderArena(StateArena):
+
+    """
+    `count` projection encoder states in one block.
+
+    `streams` and `coupled_streams` are chosen by libopus and are set once
+    the states are initialized.
+    """
+
+    pointer_type = pylibopus.api.projection_encoder.ProjectionEncoderPointer
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            count: int,
+            fs: int,
+            channels: int,
+            mapping_family: int,
+            application: typing.Any
+    ) -> None:
+        self.fs = fs
+        self.channels = channels
+        self.mapping_family = mapping_family
+        self.application = _application(application)
+        self.streams = self.coupled_streams = 0
+        super().__init__(count, pylibopus.api.projection_encoder.get_size(
+            channels, mapping_family))
+        self._init_states()
+
+    def _init_state(self, state: typing.Any) -> None:
+        self.streams, self.coupled_streams = \
+            pylibopus.api.projection_encoder.init_state(
+                state, self.fs, self.channels, self.mapping_family,
+                self.application)
+
+    def _view(self, index: int, state: typing.Any) -> ProjectionEncoderView:
+        return ProjectionEncoderView(self, index, state)
+
+
+class ProjectionDecoderView(pylibopus.classes.ProjectionDecoder):
+
+    """`ProjectionDecoder` whose state lives in a `ProjectionDecoderArena`."""
+
+    def __init__(  # pylint: disable=super-init-not-called
+            self,
+            arena: 'ProjectionDecoderArena',
+            index: int,
+            projdecoder_state: typing.Any
+    ) -> None:
+        self.arena = arena
+        self.index = index
+        self._fs = arena.fs
+        self._channels = arena.channels
+        self._streams = arena.streams
+        self._coupled_streams = arena.coupled_streams
+        self._demixing_matrix = arena.demixing_matrix
+        self.projdecoder_state = projdecoder_state
+
+
+class ProjectionDecoderArena(StateArena):
+
+    """`count` projection decoder states in one block."""
+
+    pointer_type = pylibopus.api.projection_decoder.ProjectionDecoderPointer
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            count: int,
+            fs: int,
+            channels: int,
+            streams: int,
+            coupled_streams: int,
+            demixing_matrix: list
+    ) -> None:
+        self.fs = fs
+        self.channels = channels
+        self.streams = streams
+        self.coupled_streams = coupled_streams
+        self.demixing_matrix = demixing_matrix
+        super().__init__(
+            count, pylibopus.api.projection_decoder.get_size(
+                channels, streams, coupled_streams))
+        self._init_states()
+
+    def _init_state(self, state: typing.Any) -> None:
+        pylibopus.api.projection_decoder.init_state(
+            state, self.fs, self.channels, self.streams,
+            self.coupled_streams, self.demixing_matrix)
+
+    def _view(self, index: int, state: typing.Any) -> ProjectionDecoderView:
+        return ProjectionDecoderView(self, index, state)
@@ -0,0 +1,416 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Process-pool bulk encoding, decoding and transcoding of files.
+
+ctypes state pointers cannot cross process boundaries, so workers receive
+a picklable `CodecConfig` and build their own codec from it. Files are
+cut into chunks of `chunk_frames` frames which are queued on a shared
+`ProcessPoolExecutor`; idle workers pick up the next chunk, so one long
+file is spread over the whole pool instead of stalling a single worker.
+
+Each chunk is encoded by a fresh encoder primed with the `preroll_frames`
+frames that precede it, whose packets are discarded, so chunk seams are
+not audible as encoder resets. Decoding chunks start through the Ogg seek
+index, which decodes `pylibopus.ogg.SEEK_PREROLL` samples ahead of the
+chunk for the same reason.
+
+Raw PCM files hold interleaved signed 16-bit native-endian PCM; a partial
+trailing frame is padded with silence when encoding. Compressed files are
+Ogg Opus, decoded at the sample rate of the config. Their seek index is
+built in memory once per file and handed to the workers with each chunk;
+no sidecar file is written.
+"""
+
+import array
+import concurrent.futures
+import os
+import time
+import typing
+
+import pylibopus
+import pylibopus.ogg
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class CodecConfig(typing.NamedTuple):
+    """Picklable description of an encoder and of its PCM format."""
+
+    fs: int = 48000
+    channels: int = 2
+    application: int = pylibopus.APPLICATION_AUDIO
+    frame_size: int = 960
+    bitrate: typing.Optional[int] = None
+    complexity: typing.Optional[int] = None
+    max_data_bytes: int = 4000
+
+    @property
+    def frame_bytes(self) -> int:
+        """Size in bytes of one frame of 16-bit PCM."""
+        return self.frame_size * self.channels * 2
+
+    def create_encoder(self) -> pylibopus.Encoder:
+        """Builds an `Encoder` configured from this description."""
+        encoder = pylibopus.Encoder(self.fs, self.channels, self.application)
+        if self.bitrate is not None:
+            encoder.bitrate = self.bitrate
+        if self.complexity is not None:
+            encoder.complexity = self.complexity
+        return encoder
+
+    def create_decoder(
+            self,
+            reader: pylibopus.ogg.OggOpusReader
+    ) -> typing.Any:
+        """
+        Builds a decoder for the stream of `reader` at this sample rate.
+        Raises ValueError if the stream does not have this channel count.
+        """
+        if reader.channels != self.channels:
+            raise ValueError('{} has {} channels, expected {}'.format(
+                reader.path, reader.channels, self.channels))
+        return reader.create_decoder(self.fs)
+
+
+class FileResult(typing.NamedTuple):
+    """Packets of one encoded file, in the `encode_frames` layout."""
+
+    path: str
+    data: bytes
+    offsets: array.array
+    frames: int
+
+
+class DecodedFile(typing.NamedTuple):
+    """PCM of one decoded file."""
+
+    path: str
+    pcm: bytes
+    samples: int
+
+
+class BatchStats(typing.NamedTuple):
+    """Aggregate throughput of a batch run."""
+
+    files: int
+    frames: int
+    bytes_in: int
+    bytes_out: int
+    audio_seconds: float
+    elapsed: float
+
+    @property
+    def realtime_factor(self) -> float:
+        """Seconds of audio processed per wall-clock second."""
+        return self.audio_seconds / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def frames_per_second(self) -> float:
+        """Frames processed per wall-clock second."""
+        return self.frames / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Input megabytes consumed per wall-clock second."""
+        return self.bytes_in / self.elapsed / 1e6 if self.elapsed else 0.0
+
+
+class BatchResult(typing.NamedTuple):
+    """
+    Return value of the batch functions: a `FileResult` per file, or a
+    `DecodedFile` from `decode_files`.
+    """
+
+    files: typing.List[typing.Any]
+    stats: BatchStats
+
+
+def _encode_pcm(
+        pcm: bytearray,
+        config: CodecConfig,
+        preroll: int
+) -> typing.Tuple[bytes, array.array]:
+    """Encodes `pcm`, discarding the packets of its first `preroll` frames."""
+    frame_bytes = config.frame_bytes
+    pcm.extend(bytes(-len(pcm) % frame_bytes))
+
+    encoder = config.create_encoder()
+    view = memoryview(pcm)
+    if preroll:
+        encoder.encode_frames(
+            view[:preroll * frame_bytes], config.frame_size,
+            config.max_data_bytes)
+    return encoder.encode_frames(
+        view[preroll * frame_bytes:], config.frame_size,
+        config.max_data_bytes)
+
+
+def _encode_chunk(
+        path: str,
+        config: CodecConfig,
+        start: int,
+        nb_frames: int,
+        preroll_frames: int
+) -> typing.Tuple[bytes, array.array]:
+    """Worker entry point: encodes frames [start, start + nb_frames)."""
+    preroll = min(preroll_frames, start)
+    frame_bytes = config.frame_bytes
+
+    with open(path, 'rb') as source:
+        source.seek((start - preroll) * frame_bytes)
+        pcm = bytearray(source.read((preroll + nb_frames) * frame_bytes))
+    return _encode_pcm(pcm, config, preroll)
+
+
+def _decode_samples(
+        path: str,
+        config: CodecConfig,
+        index: pylibopus.ogg.SeekIndex,
+        start: int,
+        nb_samples: int
+) -> bytearray:
+    """
+    Decodes samples [start, start + nb_samples) of an Ogg Opus file, whose
+    seek index is `index`.
+    """
+    wanted = nb_samples * config.channels * 2
+    pcm = bytearray()
+    with pylibopus.ogg.OggOpusReader(path) as reader:
+        reader.index = index
+        decoder = config.create_decoder(reader)
+        position = start * pylibopus.ogg.GRANULE_RATE // config.fs
+        for chunk in reader.seek(position, decoder):
+            pcm += chunk
+            if len(pcm) >= wanted:
+                break
+    del pcm[wanted:]
+    return pcm
+
+
+def _decode_chunk(  # pylint: disable=too-many-arguments
+        path: str,
+        config: CodecConfig,
+        start: int,
+        nb_frames: int,
+        index: pylibopus.ogg.SeekIndex
+) -> bytearray:
+    """Worker entry point: decodes frames [start, start + nb_frames)."""
+    return _decode_samples(
+        path, config, index, start * config.frame_size,
+        nb_frames * config.frame_size)
+
+
+def _transcode_chunk(  # pylint: disable=too-many-arguments
+        path: str,
+        config: CodecConfig,
+        start: int,
+        nb_frames: int,
+        index: pylibopus.ogg.SeekIndex,
+        preroll_frames: int
+) -> typing.Tuple[bytes, array.array]:
+    """Worker entry point: re-encodes frames [start, start + nb_frames)."""
+    preroll = min(preroll_frames, start)
+    pcm = _decode_samples(
+        path, config, index, (start - preroll) * config.frame_size,
+        (preroll + nb_frames) * config.frame_size)
+    return _encode_pcm(pcm, config, preroll)
+
+
+def _index_stream(
+        path: str,
+        config: CodecConfig
+) -> typing.Tuple[pylibopus.ogg.SeekIndex, int]:
+    """
+    Returns the in-memory seek index of an Ogg Opus file and its number of
+    samples per channel.
+    """
+    with pylibopus.ogg.OggOpusReader(path) as reader:
+        config.create_decoder(reader)
+        index = pylibopus.ogg.SeekIndex.build(reader)
+        if not len(index):
+            return index, 0
+        fs = config.fs
+        rate = pylibopus.ogg.GRANULE_RATE
+        return index, max(0, index.granules[-1] * fs // rate -
+                          reader.pre_skip * fs // rate)
+
+
+def _run_chunks(  # pylint: disable=too-many-arguments
+        worker: typing.Callable,
+        paths: typing.Sequence[str],
+        frame_counts: typing.Sequence[int],
+        config: CodecConfig,
+        extras: typing.Sequence[typing.Tuple[typing.Any, ...]],
+        max_workers: typing.Optional[int],
+        chunk_frames: int
+) -> typing.List[typing.List[typing.Any]]:
+    """
+    Runs `worker(path, config, start, nb_frames, *extra)` over chunks of
+    every file, with the `extra` arguments of that file in `extras`,
+    returning the chunk results of each file in order.
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        chunks = {}  # type: typing.Dict[int, typing.List[typing.Any]]
+        # Longest files first, so their chunks are not left for the end.
+        for index in sorted(range(len(paths)),
+                            key=lambda i: -frame_counts[i]):
+            nb_frames = frame_counts[index]
+            chunks[index] = [
+                executor.submit(
+                    worker, paths[index], config, start,
+                    min(chunk_frames, nb_frames - start), *extras[index])
+                for start in range(0, nb_frames, chunk_frames)
+            ]
+        return [
+            [future.result() for future in chunks[index]]
+            for index in range(len(paths))
+        ]
+
+
+def _join_packets(
+        path: str,
+        chunks: typing.List[typing.Tuple[bytes, array.array]]
+) -> FileResult:
+    data = bytearray()
+    offsets = array.array('Q', [0])
+    for chunk_data, chunk_offsets in chunks:
+        base = len(data)
+        data += chunk_data
+        offsets.extend(base + offset for offset in chunk_offsets[1:])
+    return FileResult(path, bytes(data), offsets, len(offsets) - 1)
+
+
+def _packet_stats(
+        files: typing.List[FileResult],
+        config: CodecConfig,
+        bytes_in: int,
+        started: float
+) -> BatchStats:
+    frames = sum(result.frames for result in files)
+    return BatchStats(
+        files=len(files),
+        frames=frames,
+        bytes_in=bytes_in,
+        bytes_out=sum(len(result.data) for result in files),
+        audio_seconds=frames * config.frame_size / config.fs,
+        elapsed=time.perf_counter() - started,
+    )
+
+
+def encode_files(
+        paths: typing.Sequence[str],
+        config: CodecConfig,
+        max_workers: typing.Optional[int] = None,
+        chunk_frames: int = 3000,
+        preroll_frames: int = 25
+) -> BatchResult:
+    """
+    Encodes raw PCM files on a process pool.
+
+    :param paths: Input files of interleaved 16-bit PCM.
+    :param config: Encoder settings shared by all workers.
+    :param max_workers: Number of worker processes.
+    :param chunk_frames: Frames per unit of work.
+    :param preroll_frames: Frames encoded and discarded ahead of each chunk.
+    """
+    if chunk_frames < 1:
+        raise ValueError('`chunk_frames` must be positive')
+
+    frame_bytes = config.frame_bytes
+    sizes = [os.path.getsize(path) for path in paths]
+    started = time.perf_counter()
+
+    results = _run_chunks(
+        _encode_chunk, paths, [-(-size // frame_bytes) for size in sizes],
+        config, [(preroll_frames,)] * len(paths), max_workers, chunk_frames)
+    files = [_join_packets(path, chunks)
+             for path, chunks in zip(paths, results)]
+    return BatchResult(
+        files, _packet_stats(files, config, sum(sizes), started))
+
+
+def decode_files(
+        paths: typing.Sequence[str],
+        config: CodecConfig,
+        max_workers: typing.Optional[int] = None,
+        chunk_frames: int = 3000
+) -> BatchResult:
+    """
+    Decodes Ogg Opus files to 16-bit PCM on a process pool.
+
+    Pre-skip and end trimming are applied as by `OggOpusReader.decode`.
+    Decoding restarts at each chunk, after the seek preroll, so the PCM
+    around chunk seams may differ slightly from a continuous decode.
+
+    :param paths: Ogg Opus input files with `config.channels` channels.
+    :param config: Output sample rate, channels and frame size; frames
+        of `config.frame_size` samples are the unit of `chunk_frames`.
+    :param max_workers: Number of worker processes.
+    :param chunk_frames: Frames per unit of work.
+    """
+    if chunk_frames < 1:
+        raise ValueError('`chunk_frames` must be positive')
+
+    sizes = [os.path.getsize(path) for path in paths]
+    started = time.perf_counter()
+    streams = [_index_stream(path, config) for path in paths]
+    samples = [count for _, count in streams]
+
+    results = _run_chunks(
+        _decode_chunk, paths,
+        [-(-count // config.frame_size) for count in samples],
+        config, [(index,) for index, _ in streams], max_workers,
+        chunk_frames)
+    files = [
+        DecodedFile(path, b''.join(chunks), count)
+        for path, chunks, count in zip(paths, results, samples)
+    ]
+    stats = BatchStats(
+        files=len(files),
+        frames=sum(-(-count // config.frame_size) for count in samples),
+        bytes_in=sum(sizes),
+        bytes_out=sum(len(result.pcm) for result in files),
+        audio_seconds=sum(samples) / config.fs,
+        elapsed=time.perf_counter() - started,
+    )
+    return BatchResult(files, stats)
+
+
+def transcode_files(
+        paths: typing.Sequence[str],
+        config: CodecConfig,
+        max_workers: typing.Optional[int] = None,
+        chunk_frames: int = 3000,
+        preroll_frames: int = 25
+) -> BatchResult:
+    """
+    Decodes Ogg Opus files and encodes them again with `config` on a
+    process pool, for instance to re-encode an archive at a lower bitrate.
+
+    :param paths: Ogg Opus input files with `config.channels` channels.
+    :param config: Encoder settings shared by all workers.
+    :param max_workers: Number of worker processes.
+    :param chunk_frames: Frames per unit of work.
+    :param preroll_frames: Frames decoded, encoded and discarded ahead of
+        each chunk.
+    """
+    if chunk_frames < 1:
+        raise ValueError('`chunk_frames` must be positive')
+
+    sizes = [os.path.getsize(path) for path in paths]
+    started = time.perf_counter()
+    streams = [_index_stream(path, config) for path in paths]
+
+    results = _run_chunks(
+        _transcode_chunk, paths,
+        [-(-count // config.frame_size) for _, count in streams], config,
+        [(index, preroll_frames) for index, _ in streams], max_workers,
+        chunk_frames)
+    files = [_join_packets(path, chunks)
+             for path, chunks in zip(paths, results)]
+    return BatchResult(
+        files, _packet_stats(files, config, sum(sizes), started))
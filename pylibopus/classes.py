@@ -3,17 +3,22 @@
 
 """High-level interface to a Opus decoder functions"""
 
+import abc
+import ctypes  # type: ignore
 import typing
+import weakref
 
 import pylibopus
 import pylibopus.api
+import pylibopus.api.buffer
 import pylibopus.api.ctl
 import pylibopus.api.decoder
 import pylibopus.api.encoder
-import pylibopus.api.multistream_encoder
-import pylibopus.api.multistream_decoder
-import pylibopus.api.projection_encoder
-import pylibopus.api.projection_decoder
+import pylibopus.framing
+import pylibopus.memory
+
+# The multistream, projection and repacketizer bindings are imported by
+# pylibopus.api on first use.
 
 
 __author__ = 'Никита Кузнецов <self@svartalf.info>'
@@ -21,10 +26,311 @@ __copyright__ = 'Copyright (c) 2012, SvartalF'
 __license__ = 'BSD 3-Clause License'
 
 
-class Encoder(object):
+# Encoder CTL properties accepted by `configure()`, with their valid values.
+ENCODER_SETTINGS = {
+    'application': lambda value: value in (
+        pylibopus.APPLICATION_TYPES_MAP.values()),
+    'bitrate': lambda value: value in (
+        pylibopus.AUTO, pylibopus.BITRATE_MAX) or value > 0,
+    'bandwidth': lambda value: value == pylibopus.AUTO or (
+        pylibopus.BANDWIDTH_NARROWBAND <= value <=
+        pylibopus.BANDWIDTH_FULLBAND),
+    'max_bandwidth': lambda value: (
+        pylibopus.BANDWIDTH_NARROWBAND <= value <=
+        pylibopus.BANDWIDTH_FULLBAND),
+    'signal': lambda value: value in (
+        pylibopus.AUTO, pylibopus.SIGNAL_VOICE, pylibopus.SIGNAL_MUSIC),
+    'force_channels': lambda value: value in (pylibopus.AUTO, 1, 2),
+    'complexity': lambda value: 0 <= value <= 10,
+    'vbr': lambda value: value in (0, 1),
+    'vbr_constraint': lambda value: value in (0, 1),
+    'inband_fec': lambda value: 0 <= value <= 2,
+    'packet_loss_perc': lambda value: 0 <= value <= 100,
+    'dtx': lambda value: value in (0, 1),
+    'lsb_depth': lambda value: 8 <= value <= 24,
+}
+
+# Settings that cannot be read back, left out of settings snapshots.
+WRITE_ONLY_SETTINGS = ('bandwidth',)
+
+# Settings whose getter reports the value in effect rather than the value
+# set: libopus clamps bitrates and resolves OPUS_AUTO/OPUS_BITRATE_MAX from
+# the frame size, so only a value read back after an explicit set is cached.
+RESOLVED_SETTINGS = ('bitrate',)
+
+
+def _cached_setting(name: str, setting: property) -> property:
+    """Wraps a CTL property to go through the instance's `_ctl_cache`."""
+    fget, fset = setting.fget, setting.fset
+    resolved = name in RESOLVED_SETTINGS
+
+    def getter(self):
+        cache = self._ctl_cache  # pylint: disable=protected-access
+        if cache is None:
+            return fget(self)
+        value = cache.get(name)
+        if value is None:
+            value = fget(self)
+            if not resolved or name in cache:
+                cache[name] = value
+        return value
+
+    def setter(self, value):
+        fset(self, value)
+        cache = self._ctl_cache  # pylint: disable=protected-access
+        if cache is None:
+            return
+        if not resolved:
+            cache[name] = value
+        elif value in (pylibopus.AUTO, pylibopus.BITRATE_MAX):
+            cache.pop(name, None)
+        else:
+            cache[name] = None
+
+    return property(fget and getter, fset and setter)
+
+
+def _packets_output(out: typing.Any, used: int, channels: int) -> typing.Any:
+    """
+    Returns the part of a caller-supplied `out` filled by `decode_packets`
+    with `used` bytes: a view of the same shape (1-D, or shaped
+    (samples, channels)) of a numpy.ndarray, or a byte memoryview of other
+    buffers.
+    """
+    if pylibopus.api.buffer.is_ndarray(out):
+        pcm = out.reshape(-1)[:used // out.itemsize]
+        return pcm if out.ndim == 1 else pcm.reshape(-1, channels)
+    return memoryview(out).cast('B')[:used]
+
+
+class _NativeState(object):
+
+    """
+    Ownership of the libopus state held in `_state_attribute`.
+
+    The state is freed by `close()`, at the end of a `with` block, or by a
+    `weakref.finalize` callback once the object is garbage collected,
+    whichever comes first. After `close()` the state attribute is gone and
+    reading it raises ValueError, so a closed object never passes freed
+    memory to libopus. `close()` must not race with other calls on the
+    same object.
+    """
+
+    __slots__ = ()
+
+    _state_attribute = ''
+    _closed = False
+
+    def _own_state(
+            self,
+            destroy: typing.Callable[[typing.Any], None]
+    ) -> None:
+        """Registers the state just created for release with `destroy`."""
+        finalizer = weakref.finalize(
+            self, destroy, getattr(self, self._state_attribute))
+        # Memory is returned to the OS at exit anyway.
+        finalizer.atexit = False
+        self._finalizer = finalizer
+        pylibopus.memory.track(self)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        if self._closed and name == self._state_attribute:
+            raise ValueError('{} is closed'.format(type(self).__name__))
+        raise AttributeError('{!r} object has no attribute {!r}'.format(
+            type(self).__name__, name))
+
+    def __enter__(self) -> typing.Any:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """Whether `close()` has been called."""
+        return self._closed
+
+    def close(self) -> None:
+        """
+        Frees the libopus state now. Closing an object again does nothing.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            delattr(self, self._state_attribute)
+        except AttributeError:
+            pass
+        pylibopus.memory.untrack(self)
+        finalizer = getattr(self, '_finalizer', None)
+        if finalizer is not None:
+            finalizer()
+
+
+class StateSnapshot(typing.NamedTuple):
+    """
+    Copy of a decoder state returned by `snapshot()`, with the class and
+    configuration it can be restored into.
+    """
+
+    config: typing.Tuple[typing.Any, ...]
+    data: bytes
+
+
+class _CodecState(_NativeState, metaclass=abc.ABCMeta):
+
+    """
+    Copies of a codec state.
+
+    libopus states are flat blocks of `state_size` bytes without pointers
+    into themselves, so a state can be copied byte for byte into another
+    state created with the same configuration. The copy includes the
+    signal history and the CTL settings.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def _init_args(self) -> typing.Tuple[typing.Any, ...]:
+        """Returns the arguments the codec class was created with."""
+
+    def _config(self) -> typing.Tuple[typing.Any, ...]:
+        for cls in type(self).__mro__:
+            if '_state_attribute' in cls.__dict__:
+                return (cls,) + tuple(
+                    tuple(arg) if isinstance(arg, list) else arg
+                    for arg in self._init_args())
+        raise TypeError('No codec class for {!r}'.format(self))
+
+    def clone(self) -> typing.Any:
+        """
+        Returns a new codec of the same class and configuration with a copy
+        of this codec's state, so that both continue from the same point.
+        Views of an arena are cloned into a codec owning its state.
+        """
+        state = getattr(self, self._state_attribute)
+        clone = self._config()[0](*self._init_args())
+        ctypes.memmove(getattr(clone, self._state_attribute), state,
+                       self.state_size)
+        cache = getattr(self, '_ctl_cache', None)
+        if cache is not None:
+            setattr(clone, '_ctl_cache', dict(cache))
+        return clone
+
+
+class _DecoderState(_CodecState):
+
+    """Snapshots of a decoder state."""
+
+    __slots__ = ()
+
+    def snapshot(self) -> StateSnapshot:
+        """Returns a copy of the decoder state."""
+        state = getattr(self, self._state_attribute)
+        return StateSnapshot(
+            self._config(), ctypes.string_at(state, self.state_size))
+
+    def restore(self, snapshot: StateSnapshot) -> None:
+        """
+        Overwrites the decoder state with a `snapshot()` of this decoder or
+        of one with the same class and configuration.
+        """
+        state = getattr(self, self._state_attribute)
+        if snapshot.config != self._config():
+            raise ValueError(
+                'Snapshot of a different decoder configuration')
+        if len(snapshot.data) != self.state_size:
+            raise ValueError('Snapshot has the wrong size')
+        ctypes.memmove(state, snapshot.data, len(snapshot.data))
+
+
+class _EncoderSettings(object):
+
+    """
+    Bulk access to the CTL properties of the encoder classes.
+
+    With `ctl_cache` enabled, values set through the properties or
+    `configure()` are remembered, and reading them back does not call into
+    libopus again.
+    """
+
+    _ctl_cache = None  # type: typing.Optional[typing.Dict[str, typing.Any]]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in ENCODER_SETTINGS:
+            if isinstance(cls.__dict__.get(name), property):
+                setattr(cls, name, _cached_setting(name, cls.__dict__[name]))
+
+    def _get_ctl_cache(self) -> bool:
+        return self._ctl_cache is not None
+
+    def _set_ctl_cache(self, enabled: bool) -> None:
+        if not enabled:
+            self._ctl_cache = None
+        elif self._ctl_cache is None:
+            self._ctl_cache = {}
+
+    ctl_cache = property(_get_ctl_cache, _set_ctl_cache)
+
+    def configure(self, **settings) -> None:
+        """
+        Applies several CTL settings, e.g.
+        `encoder.configure(bitrate=24000, complexity=5, inband_fec=1)`.
+
+        All names and values are checked before the first one is applied,
+        so a typo or an out-of-range value leaves the encoder untouched.
+        Settings are applied in the order given.
+        """
+        values = []
+        for name, value in settings.items():
+            if name not in ENCODER_SETTINGS:
+                raise TypeError('Unknown encoder setting {!r}'.format(name))
+            if name == 'application':
+                value = pylibopus.APPLICATION_TYPES_MAP.get(value, value)
+            if not isinstance(value, int):
+                raise TypeError('Setting {!r} must be an int, got {!r}'.format(
+                    name, value))
+            if not ENCODER_SETTINGS[name](value):
+                raise ValueError('Invalid value {!r} for setting {!r}'.format(
+                    value, name))
+            values.append((name, int(value)))
+
+        for name, value in values:
+            setattr(self, name, value)
+
+    def settings_snapshot(self) -> typing.Dict[str, int]:
+        """
+        Returns the readable CTL settings as a dict that
+        `restore_settings()` and `configure()` accept. Use `clone()` to
+        copy the whole encoder state instead.
+
+        Settings left on OPUS_AUTO may be captured as their resolved value
+        (the bitrate in particular). Settings the encoder cannot report,
+        such as max_bandwidth of a multistream encoder, are left out.
+        """
+        snapshot = {}
+        for name in ENCODER_SETTINGS:
+            if name in WRITE_ONLY_SETTINGS:
+                continue
+            try:
+                snapshot[name] = getattr(self, name)
+            except pylibopus.OpusError as exc:
+                if exc.code != pylibopus.UNIMPLEMENTED:
+                    raise
+        return snapshot
+
+    def restore_settings(self, snapshot: typing.Dict[str, int]) -> None:
+        """Re-applies the settings of a `settings_snapshot()`."""
+        self.configure(**snapshot)
+
+
+class Encoder(_EncoderSettings, _CodecState):
 
     """High-Level Encoder Object."""
 
+    _state_attribute = 'encoder_state'
+
     def __init__(self, fs, channels, application) -> None:
         """
         Parameters:
@@ -46,11 +352,15 @@ class Encoder(object):
         self._application = application
         self.encoder_state = pylibopus.api.encoder.create_state(
             fs, channels, application)
+        self._own_state(pylibopus.api.encoder.destroy)
+
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.encoder.get_size(self._channels)
 
-    def __del__(self) -> None:
-        if hasattr(self, 'encoder_state'):
-            # Destroying state only if __init__ completed successfully
-            pylibopus.api.encoder.destroy(self.encoder_state)
+    def _init_args(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._fs, self._channels, self._application)
 
     def reset_state(self) -> None:
         """
@@ -67,7 +377,7 @@ class Encoder(object):
             self.encoder_state,
             pcm_data,
             frame_size,
-            len(pcm_data)
+            memoryview(pcm_data).nbytes
         )
 
     def encode_float(self, pcm_data: bytes, frame_size: int) -> bytes:
@@ -78,9 +388,123 @@ class Encoder(object):
             self.encoder_state,
             pcm_data,
             frame_size,
-            len(pcm_data)
+            memoryview(pcm_data).nbytes
+        )
+
+    def encode_into(self, pcm_data, frame_size: int, out) -> int:
+        """
+        Encodes given PCM data as Opus into the writable buffer `out`.
+
+        Returns the number of bytes written.
+        """
+        return pylibopus.api.encoder.encode_into(
+            self.encoder_state,
+            pcm_data,
+            frame_size,
+            out,
+            channels=self._channels
+        )
+
+    def encode_float_into(self, pcm_data, frame_size: int, out) -> int:
+        """
+        Encodes given float PCM data as Opus into the writable buffer `out`.
+
+        Returns the number of bytes written.
+        """
+        return pylibopus.api.encoder.encode_float_into(
+            self.encoder_state,
+            pcm_data,
+            frame_size,
+            out,
+            channels=self._channels
+        )
+
+    def encode_frames(
+        self,
+        pcm_data,
+        frame_size: int,
+        max_data_bytes: int = 4000
+    ) -> typing.Tuple[bytes, typing.Any]:
+        """
+        Encodes consecutive frames of a long PCM buffer as Opus.
+
+        Returns the concatenated packets and an array of packet offsets.
+        """
+        return pylibopus.api.encoder.encode_frames(
+            self.encoder_state,
+            pcm_data,
+            frame_size,
+            self._channels,
+            max_data_bytes
         )
 
+    def encode_float_frames(
+        self,
+        pcm_data,
+        frame_size: int,
+        max_data_bytes: int = 4000
+    ) -> typing.Tuple[bytes, typing.Any]:
+        """
+        Encodes consecutive frames of a long float PCM buffer as Opus.
+
+        Returns the concatenated packets and an array of packet offsets.
+        """
+        return pylibopus.api.encoder.encode_float_frames(
+            self.encoder_state,
+            pcm_data,
+            frame_size,
+            self._channels,
+            max_data_bytes
+        )
+
+    def encode_stream(
+        self,
+        chunks: typing.Iterable[typing.Any],
+        frame_size: int,
+        flush: bool = True
+    ) -> typing.Iterator[bytes]:
+        """
+        Encodes PCM chunks of any size, yielding a packet as soon as a
+        full frame is available.
+
+        With `flush`, a partial frame left at the end of the stream is
+        padded with silence and encoded too.
+        """
+        reframer = pylibopus.framing.Reframer(
+            frame_size * self._channels * 2)
+        for chunk in chunks:
+            for frame in reframer.push(chunk):
+                yield self.encode(frame, frame_size)
+
+        if flush:
+            frame = reframer.flush()
+            if frame is not None:
+                yield self.encode(frame, frame_size)
+
+    def encode_float_stream(
+        self,
+        chunks: typing.Iterable[typing.Any],
+        frame_size: int,
+        flush: bool = True
+    ) -> typing.Iterator[bytes]:
+        """
+        Encodes float PCM chunks of any size, yielding a packet as soon as a
+        full frame is available.
+
+        With `flush`, a partial frame left at the end of the stream is
+        padded with silence and encoded too.
+        """
+        reframer = pylibopus.framing.Reframer(
+            frame_size * self._channels * 4)
+        for chunk in chunks:
+            for frame in reframer.push(chunk):
+                yield self.encode_float(frame, frame_size)
+
+        if flush:
+            frame = reframer.flush()
+            if frame is not None:
+                yield self.encode_float(frame, frame_size)
+
     # CTL interfaces
 
     def _get_final_range(self): return pylibopus.api.encoder.encoder_ctl(
@@ -212,10 +636,12 @@ class Encoder(object):
     dtx = property(_get_dtx, _set_dtx)
 
 
-class Decoder(object):
+class Decoder(_DecoderState):
 
     """High-Level Decoder Object."""
 
+    _state_attribute = 'decoder_state'
+
     def __init__(self, fs: int, channels: int) -> None:
         """
         :param fs: Sample Rate.
@@ -224,11 +650,15 @@ class Decoder(object):
         self._fs = fs
         self._channels = channels
         self.decoder_state = pylibopus.api.decoder.create_state(fs, channels)
+        self._own_state(pylibopus.api.decoder.destroy)
 
-    def __del__(self) -> None:
-        if hasattr(self, 'decoder_state'):
-            # Destroying state only if __init__ completed successfully
-            pylibopus.api.decoder.destroy(self.decoder_state)
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.decoder.get_size(self._channels)
+
+    def _init_args(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._fs, self._channels)
 
     def reset_state(self) -> None:
         """
@@ -277,6 +707,164 @@ class Decoder(object):
             channels=self._channels
         )
 
+    def decode_into(
+        self,
+        opus_data: bytes,
+        out,
+        decode_fec: bool = False
+    ) -> int:
+        """
+        Decodes given Opus data to PCM in the writable buffer `out`.
+
+        Returns the number of decoded samples per channel.
+        """
+        return pylibopus.api.decoder.decode_into(
+            self.decoder_state,
+            opus_data,
+            len(opus_data),
+            out,
+            decode_fec,
+            channels=self._channels
+        )
+
+    def decode_float_into(
+        self,
+        opus_data: bytes,
+        out,
+        decode_fec: bool = False
+    ) -> int:
+        """
+        Decodes given Opus data to float PCM in the writable buffer `out`.
+
+        Returns the number of decoded samples per channel.
+        """
+        return pylibopus.api.decoder.decode_float_into(
+            self.decoder_state,
+            opus_data,
+            len(opus_data),
+            out,
+            decode_fec,
+            channels=self._channels
+        )
+
+    def decode_array(
+        self,
+        opus_data: bytes,
+        frame_size: int,
+        decode_fec: bool = False
+    ) -> typing.Any:
+        """
+        Decodes given Opus data to a int16 numpy.ndarray shaped
+        (samples, channels). Requires NumPy.
+        """
+        pcm = pylibopus.api.buffer.empty_ndarray(
+            frame_size, self._channels, ctypes.c_int16)
+        result = self.decode_into(opus_data, pcm, decode_fec)
+        return pcm[:result]
+
+    def decode_float_array(
+        self,
+        opus_data: bytes,
+        frame_size: int,
+        decode_fec: bool = False
+    ) -> typing.Any:
+        """
+        Decodes given Opus data to a float32 numpy.ndarray shaped
+        (samples, channels). Requires NumPy.
+        """
+        pcm = pylibopus.api.buffer.empty_ndarray(
+            frame_size, self._channels, ctypes.c_float)
+        result = self.decode_float_into(opus_data, pcm, decode_fec)
+        return pcm[:result]
+
+    def decode_packets(  # pylint: disable=too-many-arguments
+        self,
+        packets,
+        frame_size: int,
+        offsets=None,
+        decode_fec: bool = False,
+        out=None
+    ) -> typing.Tuple[typing.Any, typing.Any]:
+        """
+        Decodes many Opus packets to PCM in one call.
+
+        `packets` is either a sequence of packets or, with `offsets`, one
+        packed buffer as returned by `encode_frames`. Output goes to
+        the writable buffer `out`, or to a new bytearray if it is omitted.
+
+        Returns the decoded PCM and an array of samples per channel for
+        each packet. The PCM is a view of `out` when given: an ndarray of
+        its dtype, which must match the sample format, or else a byte
+        memoryview.
+        """
+        frame_bytes = frame_size * self._channels * 2
+        if out is None:
+            pcm = bytearray(
+                frame_bytes * (len(packets) if offsets is None
+                               else len(offsets) - 1))
+        else:
+            pcm = out
+
+        nb_samples = pylibopus.api.decoder.decode_packets(
+            self.decoder_state,
+            packets,
+            offsets,
+            pcm,
+            frame_size,
+            decode_fec,
+            channels=self._channels
+        )
+
+        used = sum(nb_samples) * self._channels * 2
+        if out is None:
+            del pcm[used:]
+            return pcm, nb_samples
+        return _packets_output(out, used, self._channels), nb_samples
+
+    def decode_float_packets(  # pylint: disable=too-many-arguments
+        self,
+        packets,
+        frame_size: int,
+        offsets=None,
+        decode_fec: bool = False,
+        out=None
+    ) -> typing.Tuple[typing.Any, typing.Any]:
+        """
+        Decodes many Opus packets to float PCM in one call.
+
+        `packets` is either a sequence of packets or, with `offsets`, one
+        packed buffer as returned by `encode_float_frames`. Output goes to
+        the writable buffer `out`, or to a new bytearray if it is omitted.
+
+        Returns the decoded PCM and an array of samples per channel for
+        each packet. The PCM is a view of `out` when given: an ndarray of
+        its dtype, which must match the sample format, or else a byte
+        memoryview.
+        """
+        frame_bytes = frame_size * self._channels * 4
+        if out is None:
+            pcm = bytearray(
+                frame_bytes * (len(packets) if offsets is None
+                               else len(offsets) - 1))
+        else:
+            pcm = out
+
+        nb_samples = pylibopus.api.decoder.decode_float_packets(
+            self.decoder_state,
+            packets,
+            offsets,
+            pcm,
+            frame_size,
+            decode_fec,
+            channels=self._channels
+        )
+
+        used = sum(nb_samples) * self._channels * 4
+        if out is None:
+            del pcm[used:]
+            return pcm, nb_samples
+        return _packets_output(out, used, self._channels), nb_samples
+
     # CTL interfaces
 
     def _get_final_range(self): return pylibopus.api.decoder.decoder_ctl(
@@ -327,9 +915,11 @@ class Decoder(object):
     gain = property(_get_gain, _set_gain)
 
 
-class MultiStreamEncoder(object):
+class MultiStreamEncoder(_EncoderSettings, _CodecState):
     """High-Level MultiStreamEncoder Object."""
 
+    _state_attribute = 'msencoder_state'
+
     def __init__(self, fs: int, channels: int, streams: int,
                  coupled_streams: int, mapping: list,
                  application: int) -> None:
@@ -357,11 +947,17 @@ class MultiStreamEncoder(object):
         self.msencoder_state = pylibopus.api.multistream_encoder.create_state(
             self._fs, self._channels, self._streams, self._coupled_streams,
             self._mapping, self._application)
+        self._own_state(pylibopus.api.multistream_encoder.destroy)
 
-    def __del__(self) -> None:
-        if hasattr(self, 'msencoder_state'):
-            # Destroying state only if __init__ completed successfully
-            pylibopus.api.multistream_encoder.destroy(self.msencoder_state)
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.multistream_encoder.get_size(
+            self._streams, self._coupled_streams)
+
+    def _init_args(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._fs, self._channels, self._streams,
+                self._coupled_streams, self._mapping, self._application)
 
     def reset_state(self) -> None:
         """
@@ -378,7 +974,7 @@ class MultiStreamEncoder(object):
             self.msencoder_state,
             pcm_data,
             frame_size,
-            len(pcm_data)
+            memoryview(pcm_data).nbytes
         )
 
     def encode_float(self, pcm_data: bytes, frame_size: int) -> bytes:
@@ -389,9 +985,123 @@ class MultiStreamEncoder(object):
             self.msencoder_state,
             pcm_data,
             frame_size,
-            len(pcm_data)
+            memoryview(pcm_data).nbytes
+        )
+
+    def encode_into(self, pcm_data, frame_size: int, out) -> int:
+        """
+        Encodes given PCM data as Opus into the writable buffer `out`.
+
+        Returns the number of bytes written.
+        """
+        return pylibopus.api.multistream_encoder.encode_into(
+            self.msencoder_state,
+            pcm_data,
+            frame_size,
+            out,
+            channels=self._channels
         )
 
+    def encode_float_into(self, pcm_data, frame_size: int, out) -> int:
+        """
+        Encodes given float PCM data as Opus into the writable buffer `out`.
+
+        Returns the number of bytes written.
+        """
+        return pylibopus.api.multistream_encoder.encode_float_into(
+            self.msencoder_state,
+            pcm_data,
+            frame_size,
+            out,
+            channels=self._channels
+        )
+
+    def encode_frames(
+        self,
+        pcm_data,
+        frame_size: int,
+        max_data_bytes: int = 4000
+    ) -> typing.Tuple[bytes, typing.Any]:
+        """
+        Encodes consecutive frames of a long PCM buffer as Opus.
+
+        Returns the concatenated packets and an array of packet offsets.
+        """
+        return pylibopus.api.multistream_encoder.encode_frames(
+            self.msencoder_state,
+            pcm_data,
+            frame_size,
+            self._channels,
+            max_data_bytes
+        )
+
+    def encode_float_frames(
+        self,
+        pcm_data,
+        frame_size: int,
+        max_data_bytes: int = 4000
+    ) -> typing.Tuple[bytes, typing.Any]:
+        """
+        Encodes consecutive frames of a long float PCM buffer as Opus.
+
+        Returns the concatenated packets and an array of packet offsets.
+        """
+        return pylibopus.api.multistream_encoder.encode_float_frames(
+            self.msencoder_state,
+            pcm_data,
+            frame_size,
+            self._channels,
+            max_data_bytes
+        )
+
+    def encode_stream(
+        self,
+        chunks: typing.Iterable[typing.Any],
+        frame_size: int,
+        flush: bool = True
+    ) -> typing.Iterator[bytes]:
+        """
+        Encodes PCM chunks of any size, yielding a packet as soon as a
+        full frame is available.
+
+        With `flush`, a partial frame left at the end of the stream is
+        padded with silence and encoded too.
+        """
+        reframer = pylibopus.framing.Reframer(
+            frame_size * self._channels * 2)
+        for chunk in chunks:
+            for frame in reframer.push(chunk):
+                yield self.encode(frame, frame_size)
+
+        if flush:
+            frame = reframer.flush()
+            if frame is not None:
+                yield self.encode(frame, frame_size)
+
+    def encode_float_stream(
+        self,
+        chunks: typing.Iterable[typing.Any],
+        frame_size: int,
+        flush: bool = True
+    ) -> typing.Iterator[bytes]:
+        """
+        Encodes float PCM chunks of any size, yielding a packet as soon as a
+        full frame is available.
+
+        With `flush`, a partial frame left at the end of the stream is
+        padded with silence and encoded too.
+        """
+        reframer = pylibopus.framing.Reframer(
+            frame_size * self._channels * 4)
+        for chunk in chunks:
+            for frame in reframer.push(chunk):
+                yield self.encode_float(frame, frame_size)
+
+        if flush:
+            frame = reframer.flush()
+            if frame is not None:
+                yield self.encode_float(frame, frame_size)
+
     # CTL interfaces
 
     def _get_final_range(self): return \
@@ -475,7 +1185,7 @@ class MultiStreamEncoder(object):
     force_channels = property(_get_force_channels, _set_force_channels)
 
     def _get_max_bandwidth(self): return \
-        pylibopus.api.encoder.multistream_encoder.encoder_ctl(
+        pylibopus.api.multistream_encoder.encoder_ctl(
         self.msencoder_state, pylibopus.api.ctl.get_max_bandwidth)
 
     def _set_max_bandwidth(self, x): return \
@@ -553,9 +1263,11 @@ class MultiStreamEncoder(object):
     dtx = property(_get_dtx, _set_dtx)
 
 
-class MultiStreamDecoder(object):
+class MultiStreamDecoder(_DecoderState):
     """High-Level MultiStreamDecoder Object."""
 
+    _state_attribute = 'msdecoder_state'
+
     def __init__(self, fs: int, channels: int, streams: int,
                  coupled_streams: int, mapping: list) -> None:
         """
@@ -570,11 +1282,17 @@ class MultiStreamDecoder(object):
         self.msdecoder_state = pylibopus.api.multistream_decoder.create_state(
             self._fs, self._channels, self._streams, self._coupled_streams,
             self._mapping)
+        self._own_state(pylibopus.api.multistream_decoder.destroy)
 
-    def __del__(self) -> None:
-        if hasattr(self, 'msdecoder_state'):
-            # Destroying state only if __init__ completed successfully
-            pylibopus.api.multistream_decoder.destroy(self.msdecoder_state)
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.multistream_decoder.get_size(
+            self._streams, self._coupled_streams)
+
+    def _init_args(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._fs, self._channels, self._streams,
+                self._coupled_streams, self._mapping)
 
     def reset_state(self) -> None:
         """
@@ -623,6 +1341,164 @@ class MultiStreamDecoder(object):
             channels=self._channels
         )
 
+    def decode_into(
+        self,
+        opus_data: bytes,
+        out,
+        decode_fec: bool = False
+    ) -> int:
+        """
+        Decodes given Opus data to PCM in the writable buffer `out`.
+
+        Returns the number of decoded samples per channel.
+        """
+        return pylibopus.api.multistream_decoder.decode_into(
+            self.msdecoder_state,
+            opus_data,
+            len(opus_data),
+            out,
+            decode_fec,
+            channels=self._channels
+        )
+
+    def decode_float_into(
+        self,
+        opus_data: bytes,
+        out,
+        decode_fec: bool = False
+    ) -> int:
+        """
+        Decodes given Opus data to float PCM in the writable buffer `out`.
+
+        Returns the number of decoded samples per channel.
+        """
+        return pylibopus.api.multistream_decoder.decode_float_into(
+            self.msdecoder_state,
+            opus_data,
+            len(opus_data),
+            out,
+            decode_fec,
+            channels=self._channels
+        )
+
+    def decode_array(
+        self,
+        opus_data: bytes,
+        frame_size: int,
+        decode_fec: bool = False
+    ) -> typing.Any:
+        """
+        Decodes given Opus data to a int16 numpy.ndarray shaped
+        (samples, channels). Requires NumPy.
+        """
+        pcm = pylibopus.api.buffer.empty_ndarray(
+            frame_size, self._channels, ctypes.c_int16)
+        result = self.decode_into(opus_data, pcm, decode_fec)
+        return pcm[:result]
+
+    def decode_float_array(
+        self,
+        opus_data: bytes,
+        frame_size: int,
+        decode_fec: bool = False
+    ) -> typing.Any:
+        """
+        Decodes given Opus data to a float32 numpy.ndarray shaped
+        (samples, channels). Requires NumPy.
+        """
+        pcm = pylibopus.api.buffer.empty_ndarray(
+            frame_size, self._channels, ctypes.c_float)
+        result = self.decode_float_into(opus_data, pcm, decode_fec)
+        return pcm[:result]
+
+    def decode_packets(  # pylint: disable=too-many-arguments
+        self,
+        packets,
+        frame_size: int,
+        offsets=None,
+        decode_fec: bool = False,
+        out=None
+    ) -> typing.Tuple[typing.Any, typing.Any]:
+        """
+        Decodes many Opus packets to PCM in one call.
+
+        `packets` is either a sequence of packets or, with `offsets`, one
+        packed buffer as returned by `encode_frames`. Output goes to
+        the writable buffer `out`, or to a new bytearray if it is omitted.
+
+        Returns the decoded PCM and an array of samples per channel for
+        each packet. The PCM is a view of `out` when given: an ndarray of
+        its dtype, which must match the sample format, or else a byte
+        memoryview.
+        """
+        frame_bytes = frame_size * self._channels * 2
+        if out is None:
+            pcm = bytearray(
+                frame_bytes * (len(packets) if offsets is None
+                               else len(offsets) - 1))
+        else:
+            pcm = out
+
+        nb_samples = pylibopus.api.multistream_decoder.decode_packets(
+            self.msdecoder_state,
+            packets,
+            offsets,
+            pcm,
+            frame_size,
+            decode_fec,
+            channels=self._channels
+        )
+
+        used = sum(nb_samples) * self._channels * 2
+        if out is None:
+            del pcm[used:]
+            return pcm, nb_samples
+        return _packets_output(out, used, self._channels), nb_samples
+
+    def decode_float_packets(  # pylint: disable=too-many-arguments
+        self,
+        packets,
+        frame_size: int,
+        offsets=None,
+        decode_fec: bool = False,
+        out=None
+    ) -> typing.Tuple[typing.Any, typing.Any]:
+        """
+        Decodes many Opus packets to float PCM in one call.
+
+        `packets` is either a sequence of packets or, with `offsets`, one
+        packed buffer as returned by `encode_float_frames`. Output goes to
+        the writable buffer `out`, or to a new bytearray if it is omitted.
+
+        Returns the decoded PCM and an array of samples per channel for
+        each packet. The PCM is a view of `out` when given: an ndarray of
+        its dtype, which must match the sample format, or else a byte
+        memoryview.
+        """
+        frame_bytes = frame_size * self._channels * 4
+        if out is None:
+            pcm = bytearray(
+                frame_bytes * (len(packets) if offsets is None
+                               else len(offsets) - 1))
+        else:
+            pcm = out
+
+        nb_samples = pylibopus.api.multistream_decoder.decode_float_packets(
+            self.msdecoder_state,
+            packets,
+            offsets,
+            pcm,
+            frame_size,
+            decode_fec,
+            channels=self._channels
+        )
+
+        used = sum(nb_samples) * self._channels * 4
+        if out is None:
+            del pcm[used:]
+            return pcm, nb_samples
+        return _packets_output(out, used, self._channels), nb_samples
+
     # CTL interfaces
 
     def _get_final_range(self): return \
@@ -664,9 +1540,11 @@ class MultiStreamDecoder(object):
     gain = property(_get_gain, _set_gain)
 
 
-class ProjectionEncoder(object):
+class ProjectionEncoder(_EncoderSettings, _CodecState):
     """High-Level ProjectionEncoder Object."""
 
+    _state_attribute = 'projencoder_state'
+
     def __init__(self, fs: int, channels: int, mapping_family: int,
                  streams: int, coupled_streams: int, application: int) -> None:
         """
@@ -693,11 +1571,17 @@ class ProjectionEncoder(object):
         self.projencoder_state = pylibopus.api.projection_encoder.create_state(
             self._fs, self._channels, self._mapping_family, self._streams,
             self._coupled_streams, self._application)
+        self._own_state(pylibopus.api.projection_encoder.destroy)
+
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.projection_encoder.get_size(
+            self._channels, self._mapping_family)
 
-    def __del__(self) -> None:
-        if hasattr(self, 'projencoder_state'):
-            # Destroying state only if __init__ completed successfully
-            pylibopus.api.projection_encoder.destroy(self.projencoder_state)
+    def _init_args(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._fs, self._channels, self._mapping_family,
+                self._streams, self._coupled_streams, self._application)
 
     def reset_state(self) -> None:
         """
@@ -714,7 +1598,7 @@ class ProjectionEncoder(object):
             self.projencoder_state,
             pcm_data,
             frame_size,
-            len(pcm_data)
+            memoryview(pcm_data).nbytes
         )
 
     def encode_float(self, pcm_data: bytes, frame_size: int) -> bytes:
@@ -725,9 +1609,123 @@ class ProjectionEncoder(object):
             self.projencoder_state,
             pcm_data,
             frame_size,
-            len(pcm_data)
+            memoryview(pcm_data).nbytes
+        )
+
+    def encode_into(self, pcm_data, frame_size: int, out) -> int:
+        """
+        Encodes given PCM data as Opus into the writable buffer `out`.
+
+        Returns the number of bytes written.
+        """
+        return pylibopus.api.projection_encoder.encode_into(
+            self.projencoder_state,
+            pcm_data,
+            frame_size,
+            out,
+            channels=self._channels
+        )
+
+    def encode_float_into(self, pcm_data, frame_size: int, out) -> int:
+        """
+        Encodes given float PCM data as Opus into the writable buffer `out`.
+
+        Returns the number of bytes written.
+        """
+        return pylibopus.api.projection_encoder.encode_float_into(
+            self.projencoder_state,
+            pcm_data,
+            frame_size,
+            out,
+            channels=self._channels
+        )
+
+    def encode_frames(
+        self,
+        pcm_data,
+        frame_size: int,
+        max_data_bytes: int = 4000
+    ) -> typing.Tuple[bytes, typing.Any]:
+        """
+        Encodes consecutive frames of a long PCM buffer as Opus.
+
+        Returns the concatenated packets and an array of packet offsets.
+        """
+        return pylibopus.api.projection_encoder.encode_frames(
+            self.projencoder_state,
+            pcm_data,
+            frame_size,
+            self._channels,
+            max_data_bytes
+        )
+
+    def encode_float_frames(
+        self,
+        pcm_data,
+        frame_size: int,
+        max_data_bytes: int = 4000
+    ) -> typing.Tuple[bytes, typing.Any]:
+        """
+        Encodes consecutive frames of a long float PCM buffer as Opus.
+
+        Returns the concatenated packets and an array of packet offsets.
+        """
+        return pylibopus.api.projection_encoder.encode_float_frames(
+            self.projencoder_state,
+            pcm_data,
+            frame_size,
+            self._channels,
+            max_data_bytes
         )
 
+    def encode_stream(
+        self,
+        chunks: typing.Iterable[typing.Any],
+        frame_size: int,
+        flush: bool = True
+    ) -> typing.Iterator[bytes]:
+        """
+        Encodes PCM chunks of any size, yielding a packet as soon as a
+        full frame is available.
+
+        With `flush`, a partial frame left at the end of the stream is
+        padded with silence and encoded too.
+        """
+        reframer = pylibopus.framing.Reframer(
+            frame_size * self._channels * 2)
+        for chunk in chunks:
+            for frame in reframer.push(chunk):
+                yield self.encode(frame, frame_size)
+
+        if flush:
+            frame = reframer.flush()
+            if frame is not None:
+                yield self.encode(frame, frame_size)
+
+    def encode_float_stream(
+        self,
+        chunks: typing.Iterable[typing.Any],
+        frame_size: int,
+        flush: bool = True
+    ) -> typing.Iterator[bytes]:
+        """
+        Encodes float PCM chunks of any size, yielding a packet as soon as a
+        full frame is available.
+
+        With `flush`, a partial frame left at the end of the stream is
+        padded with silence and encoded too.
+        """
+        reframer = pylibopus.framing.Reframer(
+            frame_size * self._channels * 4)
+        for chunk in chunks:
+            for frame in reframer.push(chunk):
+                yield self.encode_float(frame, frame_size)
+
+        if flush:
+            frame = reframer.flush()
+            if frame is not None:
+                yield self.encode_float(frame, frame_size)
+
 
     # CTL interfaces
 
@@ -900,9 +1898,11 @@ class ProjectionEncoder(object):
         self.projencoder_state, matrix_size)
 
 
-class ProjectionDecoder(object):
+class ProjectionDecoder(_DecoderState):
     """High-Level ProjectionDecoder Object."""
 
+    _state_attribute = 'projdecoder_state'
+
     def __init__(self, fs: int, channels: int, streams: int,
                  coupled_streams: int, demixing_matrix: list) -> None:
         """
@@ -917,11 +1917,17 @@ class ProjectionDecoder(object):
         self.projdecoder_state = pylibopus.api.projection_decoder.create_state(
             self._fs, self._channels, self._streams, self._coupled_streams,
             self._demixing_matrix)
+        self._own_state(pylibopus.api.projection_decoder.destroy)
 
-    def __del__(self) -> None:
-        if hasattr(self, 'projdecoder_state'):
-            # Destroying state only if __init__ completed successfully
-            pylibopus.api.projection_decoder.destroy(self.projdecoder_state)
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.projection_decoder.get_size(
+            self._channels, self._streams, self._coupled_streams)
+
+    def _init_args(self) -> typing.Tuple[typing.Any, ...]:
+        return (self._fs, self._channels, self._streams,
+                self._coupled_streams, self._demixing_matrix)
 
     def reset_state(self) -> None:
         """
@@ -970,3 +1976,290 @@ class ProjectionDecoder(object):
             channels=self._channels
         )
 
+    def decode_into(
+        self,
+        opus_data: bytes,
+        out,
+        decode_fec: bool = False
+    ) -> int:
+        """
+        Decodes given Opus data to PCM in the writable buffer `out`.
+
+        Returns the number of decoded samples per channel.
+        """
+        return pylibopus.api.projection_decoder.decode_into(
+            self.projdecoder_state,
+            opus_data,
+            len(opus_data),
+            out,
+            decode_fec,
+            channels=self._channels
+        )
+
+    def decode_float_into(
+        self,
+        opus_data: bytes,
+        out,
+        decode_fec: bool = False
+    ) -> int:
+        """
+        Decodes given Opus data to float PCM in the writable buffer `out`.
+
+        Returns the number of decoded samples per channel.
+        """
+        return pylibopus.api.projection_decoder.decode_float_into(
+            self.projdecoder_state,
+            opus_data,
+            len(opus_data),
+            out,
+            decode_fec,
+            channels=self._channels
+        )
+
+    def decode_array(
+        self,
+        opus_data: bytes,
+        frame_size: int,
+        decode_fec: bool = False
+    ) -> typing.Any:
+        """
+        Decodes given Opus data to a int16 numpy.ndarray shaped
+        (samples, channels). Requires NumPy.
+        """
+        pcm = pylibopus.api.buffer.empty_ndarray(
+            frame_size, self._channels, ctypes.c_int16)
+        result = self.decode_into(opus_data, pcm, decode_fec)
+        return pcm[:result]
+
+    def decode_float_array(
+        self,
+        opus_data: bytes,
+        frame_size: int,
+        decode_fec: bool = False
+    ) -> typing.Any:
+        """
+        Decodes given Opus data to a float32 numpy.ndarray shaped
+        (samples, channels). Requires NumPy.
+        """
+        pcm = pylibopus.api.buffer.empty_ndarray(
+            frame_size, self._channels, ctypes.c_float)
+        result = self.decode_float_into(opus_data, pcm, decode_fec)
+        return pcm[:result]
+
+    def decode_packets(  # pylint: disable=too-many-arguments
+        self,
+        packets,
+        frame_size: int,
+        offsets=None,
+        decode_fec: bool = False,
+        out=None
+    ) -> typing.Tuple[typing.Any, typing.Any]:
+        """
+        Decodes many Opus packets to PCM in one call.
+
+        `packets` is either a sequence of packets or, with `offsets`, one
+        packed buffer as returned by `encode_frames`. Output goes to
+        the writable buffer `out`, or to a new bytearray if it is omitted.
+
+        Returns the decoded PCM and an array of samples per channel for
+        each packet. The PCM is a view of `out` when given: an ndarray of
+        its dtype, which must match the sample format, or else a byte
+        memoryview.
+        """
+        frame_bytes = frame_size * self._channels * 2
+        if out is None:
+            pcm = bytearray(
+                frame_bytes * (len(packets) if offsets is None
+                               else len(offsets) - 1))
+        else:
+            pcm = out
+
+        nb_samples = pylibopus.api.projection_decoder.decode_packets(
+            self.projdecoder_state,
+            packets,
+            offsets,
+            pcm,
+            frame_size,
+            decode_fec,
+            channels=self._channels
+        )
+
+        used = sum(nb_samples) * self._channels * 2
+        if out is None:
+            del pcm[used:]
+            return pcm, nb_samples
+        return _packets_output(out, used, self._channels), nb_samples
+
+    def decode_float_packets(  # pylint: disable=too-many-arguments
+        self,
+        packets,
+        frame_size: int,
+        offsets=None,
+        decode_fec: bool = False,
+        out=None
+    ) -> typing.Tuple[typing.Any, typing.Any]:
+        """
+        Decodes many Opus packets to float PCM in one call.
+
+        `packets` is either a sequence of packets or, with `offsets`, one
+        packed buffer as returned by `encode_float_frames`. Output goes to
+        the writable buffer `out`, or to a new bytearray if it is omitted.
+
+        Returns the decoded PCM and an array of samples per channel for
+        each packet. The PCM is a view of `out` when given: an ndarray of
+        its dtype, which must match the sample format, or else a byte
+        memoryview.
+        """
+        frame_bytes = frame_size * self._channels * 4
+        if out is None:
+            pcm = bytearray(
+                frame_bytes * (len(packets) if offsets is None
+                               else len(offsets) - 1))
+        else:
+            pcm = out
+
+        nb_samples = pylibopus.api.projection_decoder.decode_float_packets(
+            self.projdecoder_state,
+            packets,
+            offsets,
+            pcm,
+            frame_size,
+            decode_fec,
+            channels=self._channels
+        )
+
+        used = sum(nb_samples) * self._channels * 4
+        if out is None:
+            del pcm[used:]
+            return pcm, nb_samples
+        return _packets_output(out, used, self._channels), nb_samples
+
+
+
+class Repacketizer(_NativeState):
+
+    """
+    High-Level Repacketizer Object.
+
+    Merges consecutive packets into one packet of several frames, and
+    splits such packets up again. The output buffer is kept between calls
+    and only grows.
+    """
+
+    _state_attribute = 'repacketizer_state'
+
+    def __init__(self) -> None:
+        self.repacketizer_state = \
+            pylibopus.api.repacketizer.create_state()
+        self._buffer = bytearray()
+        self._out = None  # type: typing.Any
+        self._view = memoryview(self._buffer)
+        self._own_state(pylibopus.api.repacketizer.destroy)
+
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.repacketizer.get_size()
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._buffer):
+            return
+        self._view.release()
+        self._buffer = bytearray(size)
+        self._out = (ctypes.c_char * size).from_buffer(self._buffer)
+        self._view = memoryview(self._buffer)
+
+    def _flush(self, held) -> bytes:
+        """
+        Outputs all frames of the current state, whose packets are `held`,
+        and re-initializes it.
+        """
+        # Frames keep their size; the code 3 header needs 2 bytes and each
+        # frame length at most 2 more, whatever the framing of the input.
+        frames = pylibopus.api.repacketizer.get_nb_frames(
+            self.repacketizer_state)
+        self._reserve(sum(len(packet) for packet in held) + 2 + 2 * frames)
+        result = pylibopus.api.repacketizer.libopus_out(
+            self.repacketizer_state, self._out, len(self._out))
+        pylibopus.api.repacketizer.init(self.repacketizer_state)
+        if result < 0:
+            raise pylibopus.OpusError(result)
+        return bytes(self._view[:result])
+
+    def merge(self, packets) -> bytes:
+        """
+        Merges the frames of `packets` into one packet.
+
+        All packets must share the same mode, bandwidth and frame size, and
+        hold at most 120 ms of audio together.
+        """
+        pylibopus.api.repacketizer.init(self.repacketizer_state)
+        held = [pylibopus.api.buffer.as_packet(packet) for packet in packets]
+        try:
+            for packet in held:
+                pylibopus.api.repacketizer.cat(
+                    self.repacketizer_state, packet)
+        except pylibopus.OpusError:
+            pylibopus.api.repacketizer.init(self.repacketizer_state)
+            raise
+        return self._flush(held)
+
+    def merge_many(self, packets, count: int) -> typing.List[bytes]:
+        """
+        Merges up to `count` consecutive packets into one packet.
+
+        A packet that cannot join the current group, because its mode,
+        bandwidth or frame size differs or the group would exceed 120 ms,
+        starts a new group instead.
+        """
+        if count < 1:
+            raise ValueError('`count` must be positive')
+
+        pylibopus.api.repacketizer.init(self.repacketizer_state)
+        merged = []
+        held = []  # type: typing.List[typing.Any]
+        for packet in packets:
+            packet = pylibopus.api.buffer.as_packet(packet)
+            if len(held) == count:
+                merged.append(self._flush(held))
+                held = []
+            try:
+                pylibopus.api.repacketizer.cat(
+                    self.repacketizer_state, packet)
+            except pylibopus.OpusError:
+                if not held:
+                    raise
+                merged.append(self._flush(held))
+                held = []
+                pylibopus.api.repacketizer.cat(
+                    self.repacketizer_state, packet)
+            held.append(packet)
+
+        if held:
+            merged.append(self._flush(held))
+        return merged
+
+    def split(self, packet) -> typing.List[bytes]:
+        """Splits a packet into one packet per frame."""
+        self._reserve(len(packet) + 2)
+        held = pylibopus.api.buffer.as_packet(packet)
+        pylibopus.api.repacketizer.init(self.repacketizer_state)
+        pylibopus.api.repacketizer.cat(self.repacketizer_state, held)
+
+        packets = []
+        for frame in range(pylibopus.api.repacketizer.get_nb_frames(
+                self.repacketizer_state)):
+            result = pylibopus.api.repacketizer.libopus_out_range(
+                self.repacketizer_state, frame, frame + 1, self._out,
+                len(self._out))
+            if result < 0:
+                raise pylibopus.OpusError(result)
+            packets.append(bytes(self._view[:result]))
+        return packets
+
+    def split_many(self, packets) -> typing.List[bytes]:
+        """Splits every packet of `packets`, returning all frames in order."""
+        frames = []  # type: typing.List[bytes]
+        for packet in packets:
+            frames.extend(self.split(packet))
+        return frames
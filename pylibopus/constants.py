@@ -93,6 +93,7 @@ OPUS_PROJECTION_GET_DEMIXING_MATRIX_SIZE_REQUEST = 6003
 OPUS_PROJECTION_GET_DEMIXING_MATRIX_REQUEST = 6005
 
 AUTO = -1000
+BITRATE_MAX = -1
 
 BANDWIDTH_NARROWBAND = 1101
 BANDWIDTH_MEDIUMBAND = 1102
@@ -7,7 +7,7 @@ Exceptions for pylibopus.
 
 import typing
 
-import pylibopus.api.info
+import pylibopus.api
 
 __author__ = 'Никита Кузнецов <self@svartalf.info>'
 __copyright__ = 'Copyright (c) 2012, SvartalF'
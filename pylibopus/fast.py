@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Low-overhead encoder and decoder for fixed frame sizes.
+
+`FastEncoder` and `FastDecoder` trade the flexibility of `Encoder` and
+`Decoder` for less work per call. Frame size, sample format and CTL
+settings are validated once when the codec is created or configured. The
+objects use `__slots__`, keep direct function pointers to `opus_encode*`
+and `opus_decode*` (see `pylibopus.api.direct_call`), and reuse their
+output buffers, so a call only checks the input size before going into
+libopus.
+
+The reused buffers make an instance unsafe to share between threads, as
+is the codec state itself.
+
+Usage example:
+
+>>> import pylibopus.fast
+>>> encoder = pylibopus.fast.FastEncoder(48000, 2, 'audio', 960)
+>>> decoder = pylibopus.fast.FastDecoder(48000, 2)
+>>> len(decoder.decode(encoder.encode(bytes(3840))))
+3840
+
+"""
+
+import ctypes  # type: ignore
+import typing
+
+import pylibopus
+import pylibopus.api
+import pylibopus.api.buffer
+import pylibopus.api.ctl
+import pylibopus.api.decoder
+import pylibopus.api.encoder
+import pylibopus.classes
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+# Frame durations accepted by opus_encode, in units of 2.5 ms.
+FRAME_DURATIONS = (1, 2, 4, 8, 16, 24, 32, 40, 48)
+
+# Decoder CTL settings accepted by `FastDecoder.configure()`.
+DECODER_SETTINGS = {
+    'gain': lambda value: -32768 <= value <= 32767,
+}
+
+_encode = pylibopus.api.direct_call(pylibopus.api.encoder.libopus_encode)
+_encode_float = pylibopus.api.direct_call(
+    pylibopus.api.encoder.libopus_encode_float)
+_decode = pylibopus.api.direct_call(pylibopus.api.decoder.libopus_decode)
+_decode_float = pylibopus.api.direct_call(
+    pylibopus.api.decoder.libopus_decode_float)
+
+
+def frame_sizes(fs: int) -> typing.Tuple[int, ...]:
+    """Returns the frame sizes, in samples per channel, valid at `fs`."""
+    return tuple(fs * duration // 400 for duration in FRAME_DURATIONS)
+
+
+def _check_format(fs: int, channels: int) -> None:
+    if fs not in SAMPLE_RATES:
+        raise ValueError('`fs` must be one of {}'.format(SAMPLE_RATES))
+    if channels not in (1, 2):
+        raise ValueError('`channels` must be 1 or 2')
+
+
+def _configure(
+        ctl: typing.Callable,
+        state: typing.Any,
+        validators: typing.Dict[str, typing.Callable[[int], bool]],
+        settings: typing.Dict[str, int]
+) -> None:
+    """Validates all `settings` before applying any of them."""
+    for name, value in settings.items():
+        validator = validators.get(name)
+        if validator is None:
+            raise TypeError('Unknown setting {!r}'.format(name))
+        if not validator(value):
+            raise ValueError('Invalid {}: {!r}'.format(name, value))
+    for name, value in settings.items():
+        ctl(state, getattr(pylibopus.api.ctl, 'set_' + name), value)
+
+
+class FastEncoder(
+        pylibopus.classes._NativeState):  # pylint: disable=protected-access
+
+    """
+    Encoder of frames of `frame_size` samples per channel, each packet at
+    most `max_data_bytes` long. CTL `settings` are applied as with
+    `configure()`.
+    """
+
+    __slots__ = (
+        'encoder_state', '_fs', '_channels', '_application', '_frame_size',
+        '_max_data_bytes', '_pcm_bytes', '_float_bytes', '_out', '_closed',
+        '_finalizer', '__weakref__',
+    )
+
+    _state_attribute = 'encoder_state'
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            fs: int,
+            channels: int,
+            application: typing.Any,
+            frame_size: int,
+            max_data_bytes: int = 4000,
+            **settings: int
+    ) -> None:
+        self._closed = False
+        _check_format(fs, channels)
+        application = pylibopus.APPLICATION_TYPES_MAP.get(
+            application, application)
+        if application not in pylibopus.APPLICATION_TYPES_MAP.values():
+            raise ValueError(
+                "`application` value must be in 'voip', 'audio' or "
+                "'restricted_lowdelay'")
+        if frame_size not in frame_sizes(fs):
+            raise ValueError('`frame_size` must be one of {}'.format(
+                frame_sizes(fs)))
+        if max_data_bytes < 1:
+            raise ValueError('`max_data_bytes` must be positive')
+
+        self._fs = fs
+        self._channels = channels
+        self._application = application
+        self._frame_size = frame_size
+        self._max_data_bytes = max_data_bytes
+        self._pcm_bytes = frame_size * channels * ctypes.sizeof(
+            ctypes.c_int16)
+        self._float_bytes = frame_size * channels * ctypes.sizeof(
+            ctypes.c_float)
+        self._out = (ctypes.c_char * max_data_bytes)()
+        self.encoder_state = pylibopus.api.encoder.create_state(
+            fs, channels, application)
+        self._own_state(pylibopus.api.encoder.destroy)
+        if settings:
+            self.configure(**settings)
+
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.encoder.get_size(self._channels)
+
+    @property
+    def frame_size(self) -> int:
+        """Samples per channel of each frame."""
+        return self._frame_size
+
+    def configure(self, **settings: int) -> None:
+        """
+        Applies encoder CTL settings, such as bitrate or complexity, named
+        as the `Encoder` properties.
+        """
+        _configure(pylibopus.api.encoder.encoder_ctl, self.encoder_state,
+                   pylibopus.classes.ENCODER_SETTINGS, settings)
+
+    def reset_state(self) -> None:
+        """
+        Resets the codec state to be equivalent to a freshly initialized state
+        """
+        pylibopus.api.encoder.encoder_ctl(
+            self.encoder_state, pylibopus.api.ctl.reset_state)
+
+    def encode(self, pcm_data: typing.Any) -> bytes:
+        """Encodes one frame of int16 PCM as Opus."""
+        if pcm_data.__class__ is bytes:
+            size = len(pcm_data)
+        else:
+            pcm_data = pylibopus.api.buffer.as_array(
+                pcm_data, ctypes.c_int16)
+            size = ctypes.sizeof(pcm_data)
+        if size != self._pcm_bytes:
+            raise ValueError('Expected {} bytes of PCM, got {}'.format(
+                self._pcm_bytes, size))
+
+        result = _encode(self.encoder_state, pcm_data, self._frame_size,
+                         self._out, self._max_data_bytes)
+        if result < 0:
+            raise pylibopus.OpusError(result)
+        return self._out[:result]
+
+    def encode_float(self, pcm_data: typing.Any) -> bytes:
+        """Encodes one frame of float PCM as Opus."""
+        if pcm_data.__class__ is bytes:
+            size = len(pcm_data)
+        else:
+            pcm_data = pylibopus.api.buffer.as_array(
+                pcm_data, ctypes.c_float)
+            size = ctypes.sizeof(pcm_data)
+        if size != self._float_bytes:
+            raise ValueError('Expected {} bytes of PCM, got {}'.format(
+                self._float_bytes, size))
+
+        result = _encode_float(self.encoder_state, pcm_data,
+                               self._frame_size, self._out,
+                               self._max_data_bytes)
+        if result < 0:
+            raise pylibopus.OpusError(result)
+        return self._out[:result]
+
+
+class FastDecoder(
+        pylibopus.classes._NativeState):  # pylint: disable=protected-access
+
+    """
+    Decoder of packets of up to `max_frame_size` samples per channel,
+    120 ms by default. CTL `settings` are applied as with `configure()`.
+    """
+
+    __slots__ = (
+        'decoder_state', '_fs', '_channels', '_max_frame_size',
+        '_sample_bytes', '_float_bytes', '_pcm', '_float_pcm', '_closed',
+        '_finalizer', '__weakref__',
+    )
+
+    _state_attribute = 'decoder_state'
+
+    def __init__(
+            self,
+            fs: int,
+            channels: int,
+            max_frame_size: typing.Optional[int] = None,
+            **settings: int
+    ) -> None:
+        self._closed = False
+        _check_format(fs, channels)
+        if max_frame_size is None:
+            max_frame_size = frame_sizes(fs)[-1]
+        elif max_frame_size < 1:
+            raise ValueError('`max_frame_size` must be positive')
+
+        self._fs = fs
+        self._channels = channels
+        self._max_frame_size = max_frame_size
+        self._sample_bytes = channels * ctypes.sizeof(ctypes.c_int16)
+        self._float_bytes = channels * ctypes.sizeof(ctypes.c_float)
+        self._pcm = (ctypes.c_int16 * (max_frame_size * channels))()
+        self._float_pcm = (ctypes.c_float * (max_frame_size * channels))()
+        self.decoder_state = pylibopus.api.decoder.create_state(fs, channels)
+        self._own_state(pylibopus.api.decoder.destroy)
+        if settings:
+            self.configure(**settings)
+
+    @property
+    def state_size(self) -> int:
+        """Size of the libopus state in bytes."""
+        return pylibopus.api.decoder.get_size(self._channels)
+
+    @property
+    def max_frame_size(self) -> int:
+        """Most samples per channel a single call can return."""
+        return self._max_frame_size
+
+    def configure(self, **settings: int) -> None:
+        """Applies decoder CTL settings (`gain`)."""
+        _configure(pylibopus.api.decoder.decoder_ctl, self.decoder_state,
+                   DECODER_SETTINGS, settings)
+
+    def reset_state(self) -> None:
+        """
+        Resets the codec state to be equivalent to a freshly initialized state
+        """
+        pylibopus.api.decoder.decoder_ctl(
+            self.decoder_state, pylibopus.api.ctl.reset_state)
+
+    def decode(self, opus_data: typing.Any) -> bytes:
+        """Decodes one Opus packet to int16 PCM."""
+        if opus_data.__class__ is not bytes:
+            opus_data = pylibopus.api.buffer.as_array(opus_data)
+        result = _decode(self.decoder_state, opus_data, len(opus_data),
+                         self._pcm, self._max_frame_size, 0)
+        if result < 0:
+            raise pylibopus.OpusError(result)
+        return ctypes.string_at(self._pcm, result * self._sample_bytes)
+
+    def decode_float(self, opus_data: typing.Any) -> bytes:
+        """Decodes one Opus packet to float PCM."""
+        if opus_data.__class__ is not bytes:
+            opus_data = pylibopus.api.buffer.as_array(opus_data)
+        result = _decode_float(self.decoder_state, opus_data, len(opus_data),
+                               self._float_pcm, self._max_frame_size, 0)
+        if result < 0:
+            raise pylibopus.OpusError(result)
+        return ctypes.string_at(self._float_pcm, result * self._float_bytes)
+
+    def conceal(
+            self,
+            frame_size: int,
+            opus_data: typing.Any = None
+    ) -> bytes:
+        """
+        Returns `frame_size` samples per channel of int16 PCM replacing a
+        lost packet. With the packet following the loss as `opus_data`,
+        its in-band FEC data is used if present.
+        """
+        if not 0 < frame_size <= self._max_frame_size:
+            raise ValueError('`frame_size` must be in 1..{}'.format(
+                self._max_frame_size))
+        if opus_data is None:
+            result = _decode(self.decoder_state, None, 0, self._pcm,
+                             frame_size, 0)
+        else:
+            if opus_data.__class__ is not bytes:
+                opus_data = pylibopus.api.buffer.as_array(opus_data)
+            result = _decode(self.decoder_state, opus_data, len(opus_data),
+                             self._pcm, frame_size, 1)
+        if result < 0:
+            raise pylibopus.OpusError(result)
+        return ctypes.string_at(self._pcm, result * self._sample_bytes)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Re-framing of arbitrarily sized PCM chunks into Opus frames.
+"""
+
+import typing
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class Reframer(object):
+
+    """
+    Collects PCM chunks of any size into frames of `frame_bytes` bytes.
+
+    Samples are copied once into a fixed frame buffer, so long streams cost
+    linear time. The frames handed out are views of that buffer and are
+    only valid until the next call.
+    """
+
+    def __init__(self, frame_bytes: int) -> None:
+        if frame_bytes < 1:
+            raise ValueError('`frame_bytes` must be positive')
+        self._buffer = bytearray(frame_bytes)
+        self._view = memoryview(self._buffer)
+        self._filled = 0
+
+    @property
+    def frame_bytes(self) -> int:
+        """Size of one frame in bytes."""
+        return len(self._buffer)
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes that do not make up a full frame yet."""
+        return self._filled
+
+    def push(self, chunk: typing.Any) -> typing.Iterator[memoryview]:
+        """Adds a chunk of PCM and yields every frame it completes."""
+        data = memoryview(chunk).cast('B')
+        frame_bytes = len(self._buffer)
+        position = 0
+
+        while position < len(data):
+            count = min(frame_bytes - self._filled, len(data) - position)
+            self._view[self._filled:self._filled + count] = \
+                data[position:position + count]
+            self._filled += count
+            position += count
+
+            if self._filled == frame_bytes:
+                self._filled = 0
+                yield self._view
+
+    def flush(self) -> typing.Optional[memoryview]:
+        """
+        Pads the buffered tail with silence and returns it as a frame, or
+        returns None if nothing is buffered.
+        """
+        if not self._filled:
+            return None
+        self._view[self._filled:] = bytes(len(self._buffer) - self._filled)
+        self._filled = 0
+        return self._view
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Accounting of the native memory held by codec objects.
+
+Every codec object reports the size of its libopus state as `state_size`,
+from the matching `opus_*_get_size` function. Objects that allocate their
+own state register with `track()` when created; the registry only holds
+weak references, so it never keeps an object alive. `usage()` returns the
+live objects and bytes per kind. Arenas are tracked as a whole, and their
+views are not tracked on their own.
+
+`estimate()` predicts the native memory a mix of sessions needs, before
+any codec is created.
+
+Usage example:
+
+>>> import pylibopus
+>>> import pylibopus.memory
+>>> decoders = [pylibopus.Decoder(48000, 2) for _ in range(10)]
+>>> usage = pylibopus.memory.usage()
+>>> usage.kinds['Decoder'].count >= 10
+True
+>>> plan = pylibopus.memory.estimate([
+...     (10000, 'Decoder', {'channels': 1}),
+...     (500, 'Encoder', {'channels': 2}),
+... ])
+>>> plan.bytes == (10000 * pylibopus.api.decoder.get_size(1) +
+...                500 * pylibopus.api.encoder.get_size(2))
+True
+
+"""
+
+import threading
+import typing
+import weakref
+
+import pylibopus
+import pylibopus.api
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class KindUsage(typing.NamedTuple):
+    """Live objects of one kind and the bytes of their states."""
+
+    count: int
+    bytes: int
+
+
+class MemoryUsage(typing.NamedTuple):
+    """Totals returned by `usage()`, with a `KindUsage` per class name."""
+
+    count: int
+    bytes: int
+    kinds: typing.Dict[str, KindUsage]
+
+
+class CapacityEstimate(typing.NamedTuple):
+    """Prediction returned by `estimate()`."""
+
+    count: int
+    bytes: int
+    kinds: typing.Dict[str, KindUsage]
+
+    def fits(self, budget: int) -> bool:
+        """Whether the states fit in `budget` bytes."""
+        return self.bytes <= budget
+
+
+# Class name -> (api module, parameters of its get_size).
+STATE_SIZES = {
+    'Encoder': ('encoder', ('channels',)),
+    'Decoder': ('decoder', ('channels',)),
+    'MultiStreamEncoder': (
+        'multistream_encoder', ('streams', 'coupled_streams')),
+    'MultiStreamDecoder': (
+        'multistream_decoder', ('streams', 'coupled_streams')),
+    'ProjectionEncoder': (
+        'projection_encoder', ('channels', 'mapping_family')),
+    'ProjectionDecoder': (
+        'projection_decoder', ('channels', 'streams', 'coupled_streams')),
+    'Repacketizer': ('repacketizer', ()),
+}
+
+_lock = threading.Lock()
+# Class name -> live object -> bytes.
+_live = {}  # type: typing.Dict[str, weakref.WeakKeyDictionary]
+
+
+def _kind_name(kind: typing.Any) -> str:
+    name = kind if isinstance(kind, str) else kind.__name__
+    if name.startswith('Fast'):
+        name = name[4:]
+    if name not in STATE_SIZES:
+        raise ValueError('Unknown codec kind {!r}'.format(kind))
+    return name
+
+
+def state_size(kind: typing.Any, **params: int) -> int:
+    """
+    Returns the state size in bytes of a codec `kind` (a class or class
+    name) created with `params`, named as in `STATE_SIZES`.
+    """
+    module, names = STATE_SIZES[_kind_name(kind)]
+    missing = set(names) - set(params)
+    if missing:
+        raise TypeError('Missing parameters: {}'.format(
+            ', '.join(sorted(missing))))
+    size = getattr(pylibopus.api, module).get_size(
+        *(params[name] for name in names))
+    if size <= 0:
+        raise pylibopus.OpusError(pylibopus.BAD_ARG)
+    return size
+
+
+def track(obj: typing.Any, size: typing.Optional[int] = None) -> None:
+    """
+    Registers `obj` as holding `size` bytes, by default its `state_size`,
+    until it is garbage collected or passed to `untrack()`.
+    """
+    if size is None:
+        size = obj.state_size
+    with _lock:
+        live = _live.get(type(obj).__name__)
+        if live is None:
+            live = _live[type(obj).__name__] = weakref.WeakKeyDictionary()
+        live[obj] = size
+
+
+def untrack(obj: typing.Any) -> None:
+    """Unregisters `obj`, for instance once its state has been freed."""
+    with _lock:
+        live = _live.get(type(obj).__name__)
+        if live is not None:
+            live.pop(obj, None)
+
+
+def usage() -> MemoryUsage:
+    """Returns the tracked objects and bytes alive now."""
+    with _lock:
+        kinds = {
+            name: KindUsage(len(live), sum(live.values()))
+            for name, live in _live.items()
+        }
+    return MemoryUsage(
+        count=sum(kind.count for kind in kinds.values()),
+        bytes=sum(kind.bytes for kind in kinds.values()),
+        kinds={name: kind for name, kind in kinds.items() if kind.count},
+    )
+
+
+def estimate(
+        mix: typing.Iterable[
+            typing.Tuple[int, typing.Any, typing.Dict[str, int]]]
+) -> CapacityEstimate:
+    """
+    Predicts the native memory of a session mix, given as
+    `(count, kind, params)` entries: `count` codecs of `kind` (a class or
+    class name) created with `params`, as taken by `state_size()`.
+
+    Only libopus states are counted, not Python objects or buffers.
+    """
+    kinds = {}  # type: typing.Dict[str, KindUsage]
+    for count, kind, params in mix:
+        if count < 0:
+            raise ValueError('Counts must not be negative')
+        name = _kind_name(kind)
+        size = count * state_size(name, **params)
+        total = kinds.get(name, KindUsage(0, 0))
+        kinds[name] = KindUsage(total.count + count, total.bytes + size)
+    return CapacityEstimate(
+        count=sum(kind.count for kind in kinds.values()),
+        bytes=sum(kind.bytes for kind in kinds.values()),
+        kinds=kinds,
+    )
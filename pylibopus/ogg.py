@@ -0,0 +1,839 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Ogg Opus (RFC 7845) container support.
+
+`OggOpusWriter` streams packets from an encoder into pages, and
+`OggOpusReader` walks the pages of a memory-mapped file. A `SeekIndex` of
+page offsets and granule positions, kept in a sidecar file next to the
+stream, makes random access a bisection instead of a scan.
+
+Usage example:
+
+>>> import io
+>>> import pylibopus
+>>> import pylibopus.ogg
+>>> sink = io.BytesIO()
+>>> encoder = pylibopus.Encoder(48000, 2, 'audio')
+>>> with pylibopus.ogg.OggOpusWriter(sink, encoder) as writer:
+...     writer.encode_stream([bytes(10000)], 960)
+>>> sink.getvalue()[:4]
+b'OggS'
+
+"""
+
+import array
+import bisect
+import mmap
+import os
+import random
+import struct
+import sys
+import typing
+
+import pylibopus
+import pylibopus.api.info
+import pylibopus.framing
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+# Ogg page header_type flags
+CONTINUED = 0x01
+BOS = 0x02
+EOS = 0x04
+
+# Opus granule positions always count samples at 48 kHz.
+GRANULE_RATE = 48000
+# Decoder pre-roll recommended by RFC 7845 when seeking: 80 ms.
+SEEK_PREROLL = 3840
+
+PAGE_HEADER = struct.Struct('<4sBBqIIIB')
+OPUS_HEAD = struct.Struct('<8sBBHIhB')
+OPUS_HEAD_MAPPING = struct.Struct('<BB')
+
+INDEX_MAGIC = b'OpusIdx\x00'
+INDEX_VERSION = 2
+# magic, version, stream serial, stream file size, stream modification time
+# in nanoseconds, number of pages
+INDEX_HEADER = struct.Struct('<8sIIQqQ')
+
+
+class Page(typing.NamedTuple):
+    """One Ogg page; `lacing` and `body` are views into the file mapping."""
+
+    offset: int
+    header_type: int
+    granule: int
+    serial: int
+    sequence: int
+    crc: int
+    lacing: memoryview
+    body: memoryview
+
+    @property
+    def size(self) -> int:
+        """Size of the whole page in bytes."""
+        return PAGE_HEADER.size + len(self.lacing) + len(self.body)
+
+
+def _crc_table() -> typing.Tuple[int, ...]:
+    table = []
+    for index in range(256):
+        crc = index << 24
+        for _ in range(8):
+            if crc & 0x80000000:
+                crc = (crc << 1) ^ 0x04c11db7
+            else:
+                crc <<= 1
+        table.append(crc & 0xffffffff)
+    return tuple(table)
+
+
+CRC_TABLE = _crc_table()
+
+
+def crc32(data: typing.Any, crc: int = 0) -> int:
+    """
+    Computes the Ogg CRC-32 (polynomial 0x04c11db7, no reflection, zero
+    initial value) of `data`.
+    """
+    table = CRC_TABLE
+    for byte in memoryview(data).cast('B'):
+        crc = ((crc << 8) & 0xffffffff) ^ table[(crc >> 24) ^ byte]
+    return crc
+
+
+def build_page(
+        header_type: int,
+        granule: int,
+        serial: int,
+        sequence: int,
+        lacing: typing.Sequence[int],
+        body: typing.Sequence[typing.Any]
+) -> bytes:
+    """Assembles one Ogg page, CRC included, from its lacing and body."""
+    page = bytearray(PAGE_HEADER.pack(
+        b'OggS', 0, header_type, granule, serial, sequence, 0, len(lacing)))
+    page += bytes(lacing)
+    for part in body:
+        page += part
+    struct.pack_into('<I', page, 22, crc32(page))
+    return bytes(page)
+
+
+def opus_head(  # pylint: disable=too-many-arguments
+        channels: int,
+        pre_skip: int,
+        input_sample_rate: int,
+        output_gain: int = 0,
+        mapping_family: int = 0,
+        streams: int = 1,
+        coupled_streams: int = 0,
+        mapping: typing.Sequence[int] = ()
+) -> bytes:
+    """Builds an OpusHead identification header packet."""
+    head = OPUS_HEAD.pack(
+        b'OpusHead', 1, channels, pre_skip, input_sample_rate, output_gain,
+        mapping_family)
+    if mapping_family == 0:
+        return head
+    return head + OPUS_HEAD_MAPPING.pack(streams, coupled_streams) + \
+        bytes(mapping)
+
+
+def opus_tags(vendor: str, comments: typing.Iterable[str] = ()) -> bytes:
+    """Builds an OpusTags comment header packet."""
+    encoded = [comment.encode('utf-8') for comment in comments]
+    vendor_bytes = vendor.encode('utf-8')
+    tags = bytearray(b'OpusTags')
+    tags += struct.pack('<I', len(vendor_bytes)) + vendor_bytes
+    tags += struct.pack('<I', len(encoded))
+    for comment in encoded:
+        tags += struct.pack('<I', len(comment)) + comment
+    return bytes(tags)
+
+
+class OggOpusWriter(object):  # pylint: disable=too-many-instance-attributes
+
+    """
+    Streams Opus packets into an Ogg Opus container.
+
+    Packets are collected into a page until it holds `page_packets` packets
+    or `page_duration` seconds of audio, and every page is handed to
+    `sink.write()` in a single call.
+
+    Granule positions count decoded samples from 0, pre-skip included, as
+    in RFC 7845. On `close()` the encoder's lookahead is flushed with
+    `pre_skip` samples of silence, and the last page is written with the
+    end-of-stream flag and a granule position of `pre_skip` plus the input
+    samples, which trims that silence and any padding added by
+    `encode_stream`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+            self,
+            sink: typing.Any,
+            encoder: typing.Any,
+            comments: typing.Iterable[str] = (),
+            serial: typing.Optional[int] = None,
+            page_duration: float = 1.0,
+            page_packets: typing.Optional[int] = None,
+            output_gain: int = 0,
+            mapping_family: typing.Optional[int] = None
+    ) -> None:
+        """
+        :param sink: Object with a `write()` method, e.g. a binary file.
+        :param encoder: `Encoder` or `MultiStreamEncoder` producing packets.
+        :param comments: OpusTags user comments such as 'TITLE=...'.
+        :param serial: Ogg stream serial number, random if omitted.
+        :param page_duration: Target audio duration per page in seconds.
+        :param page_packets: Maximum packets per page.
+        :param output_gain: OpusHead output gain in Q7.8 dB.
+        :param mapping_family: OpusHead channel mapping family; defaults to
+            0 for `Encoder` and 1 for `MultiStreamEncoder`.
+        """
+        self.sink = sink
+        self.encoder = encoder
+        self.serial = random.getrandbits(32) if serial is None else serial
+        self._fs = encoder.sample_rate
+        self.pre_skip = encoder.lookahead * GRANULE_RATE // self._fs
+        self._page_samples = int(page_duration * GRANULE_RATE)
+        self._page_packets = page_packets
+
+        self._sequence = 0
+        self._granule = 0
+        self._padding = 0
+        # Frame size of the silence flushing the lookahead on close().
+        self._frame_size = self._fs // 50
+        self._lacing = []  # type: typing.List[int]
+        self._body = []  # type: typing.List[bytes]
+        self._page_granule = -1
+        self._page_start = self._granule
+        self._packets_in_page = 0
+        self._page_continued = False
+        self._closed = False
+
+        if isinstance(encoder, pylibopus.MultiStreamEncoder):
+            # pylint: disable=protected-access
+            head = opus_head(
+                encoder._channels, self.pre_skip, self._fs, output_gain,
+                1 if mapping_family is None else mapping_family,
+                encoder._streams, encoder._coupled_streams,
+                encoder._mapping)
+        else:
+            head = opus_head(
+                encoder._channels,  # pylint: disable=protected-access
+                self.pre_skip, self._fs, output_gain,
+                mapping_family or 0)
+
+        vendor = pylibopus.api.info.get_version_string().decode('utf-8')
+        self._write_page(BOS, 0, [len(head)], [head])
+        self._append(opus_tags(vendor, comments), 0)
+        self._flush_page(0)
+
+    def __enter__(self) -> 'OggOpusWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_page(
+            self,
+            header_type: int,
+            granule: int,
+            lacing: typing.Sequence[int],
+            body: typing.Sequence[typing.Any]
+    ) -> None:
+        self.sink.write(build_page(
+            header_type, granule, self.serial, self._sequence, lacing, body))
+        self._sequence += 1
+
+    def _flush_page(self, header_type: int = 0) -> None:
+        if self._page_continued:
+            header_type |= CONTINUED
+        self._write_page(
+            header_type, self._page_granule, self._lacing, self._body)
+        self._lacing = []
+        self._body = []
+        self._page_granule = -1
+        self._page_start = self._granule
+        self._packets_in_page = 0
+        self._page_continued = False
+
+    def _append(self, packet: typing.Any, granule: int) -> None:
+        """Laces `packet` into the current page, spilling over if needed."""
+        data = bytes(packet)
+        segments = len(data) // 255 + 1
+        position = 0
+
+        while segments:
+            if len(self._lacing) == 255:
+                self._flush_page()
+                self._page_continued = position > 0
+            count = min(segments, 255 - len(self._lacing))
+            end = min(len(data), position + 255 * count)
+            self._lacing.extend([255] * (count - 1))
+            self._lacing.append(
+                255 if count < segments else end - position - 255 * (count - 1))
+            self._body.append(data[position:end])
+            position = end
+            segments -= count
+
+        self._page_granule = granule
+        self._packets_in_page += 1
+
+    def write_packet(self, packet: typing.Any, samples: int) -> None:
+        """
+        Adds one Opus packet holding `samples` samples per channel at the
+        encoder's sampling rate.
+        """
+        if self._closed:
+            raise ValueError('Writer is closed')
+
+        if self._packets_in_page and (
+                self._granule - self._page_start >= self._page_samples or
+                self._packets_in_page == self._page_packets):
+            self._flush_page()
+
+        self._granule += samples * GRANULE_RATE // self._fs
+        self._append(packet, self._granule)
+
+    def encode(self, pcm_data: typing.Any, frame_size: int) -> None:
+        """Encodes one frame of PCM and adds the packet."""
+        self._frame_size = frame_size
+        self.write_packet(
+            self.encoder.encode(pcm_data, frame_size), frame_size)
+
+    def encode_float(self, pcm_data: typing.Any, frame_size: int) -> None:
+        """Encodes one frame of float PCM and adds the packet."""
+        self._frame_size = frame_size
+        self.write_packet(
+            self.encoder.encode_float(pcm_data, frame_size), frame_size)
+
+    def encode_stream(
+            self,
+            chunks: typing.Iterable[typing.Any],
+            frame_size: int
+    ) -> None:
+        """
+        Encodes PCM chunks of any size. The padding of the final frame is
+        trimmed from the stream on `close()`.
+        """
+        # pylint: disable=protected-access
+        frame_bytes = frame_size * self.encoder._channels * 2
+        reframer = pylibopus.framing.Reframer(frame_bytes)
+        for chunk in chunks:
+            for frame in reframer.push(chunk):
+                self.encode(frame, frame_size)
+
+        pending = reframer.pending
+        frame = reframer.flush()
+        if frame is not None:
+            self.encode(frame, frame_size)
+            self._padding += (frame_bytes - pending) * frame_size // \
+                frame_bytes * GRANULE_RATE // self._fs
+
+    def flush(self) -> None:
+        """Writes the packets collected so far as a page right away."""
+        if self._packets_in_page:
+            self._flush_page()
+
+    def close(self) -> None:
+        """Writes the final end-of-stream page. The sink is left open."""
+        if self._closed:
+            return
+        self._closed = True
+        end = self.pre_skip + self._granule - self._padding
+
+        # The encoder holds back `pre_skip` samples; flush them with
+        # silence. These packets stay on the last page, past its limits,
+        # so that no earlier page has a granule position beyond `end`.
+        # pylint: disable=protected-access
+        frame_size = self._frame_size
+        silence = bytes(frame_size * self.encoder._channels * 2)
+        while self._granule < end:
+            self._granule += frame_size * GRANULE_RATE // self._fs
+            self._append(
+                self.encoder.encode(silence, frame_size), self._granule)
+
+        self._page_granule = end
+        self._flush_page(EOS)
+
+
+class SeekIndex(object):
+
+    """
+    Byte offsets and granule positions of the pages of an Opus stream on
+    which at least one packet ends.
+
+    Both columns are plain arrays, so an index loaded from a sidecar file
+    is a memory mapping rather than a copy on little-endian hosts, and a
+    byte-swapped copy on others. Sidecar layout: an
+    `INDEX_HEADER`, then the `Q` offsets, then the `q` granule positions,
+    all little-endian.
+    """
+
+    def __init__(
+            self,
+            offsets: typing.Any,
+            granules: typing.Any,
+            serial: int,
+            file_size: int,
+            mtime_ns: int
+    ) -> None:
+        if len(offsets) != len(granules):
+            raise ValueError('`offsets` and `granules` differ in length')
+        self.offsets = offsets
+        self.granules = granules
+        self.serial = serial
+        self.file_size = file_size
+        self.mtime_ns = mtime_ns
+        self._map = None  # type: typing.Optional[mmap.mmap]
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def build(cls, reader: 'OggOpusReader') -> 'SeekIndex':
+        """Indexes the audio pages of `reader` in one pass."""
+        offsets = array.array('Q')
+        granules = array.array('q')
+        for page in reader.pages(reader.audio_offset):
+            if page.granule != -1:
+                offsets.append(page.offset)
+                granules.append(page.granule)
+        return cls(offsets, granules, reader.serial, reader.file_size,
+                   reader.mtime_ns)
+
+    @classmethod
+    def load(cls, path: str) -> 'SeekIndex':
+        """Maps a sidecar file written by `save`."""
+        with open(path, 'rb') as source:
+            data = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(data) < INDEX_HEADER.size:
+                raise ValueError('Truncated seek index: {}'.format(path))
+            magic, version, serial, file_size, mtime_ns, count = \
+                INDEX_HEADER.unpack_from(data)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError('Not a seek index: {}'.format(path))
+            if len(data) != INDEX_HEADER.size + 16 * count:
+                raise ValueError('Truncated seek index: {}'.format(path))
+
+            start = INDEX_HEADER.size
+            if sys.byteorder != 'little':
+                # The columns cannot be mapped as native arrays.
+                offsets = array.array('Q', struct.unpack_from(
+                    '<{}Q'.format(count), data, start))
+                granules = array.array('q', struct.unpack_from(
+                    '<{}q'.format(count), data, start + 8 * count))
+                data.close()
+                return cls(offsets, granules, serial, file_size, mtime_ns)
+
+            view = memoryview(data)
+            index = cls(
+                view[start:start + 8 * count].cast('Q'),
+                view[start + 8 * count:].cast('q'),
+                serial, file_size, mtime_ns)
+        except BaseException:
+            if not data.closed:
+                data.close()
+            raise
+        index._map = data  # pylint: disable=protected-access
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Writes the index to the sidecar file `path`, replacing it atomically
+        so concurrent readers never map a partial index.
+        """
+        temporary = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temporary, 'wb') as sink:
+            sink.write(INDEX_HEADER.pack(
+                INDEX_MAGIC, INDEX_VERSION, self.serial, self.file_size,
+                self.mtime_ns, len(self)))
+            for column, typecode in ((self.offsets, 'Q'),
+                                     (self.granules, 'q')):
+                sink.write(struct.pack(
+                    '<{}{}'.format(len(column), typecode), *column))
+        os.replace(temporary, path)
+
+    def close(self) -> None:
+        """Unmaps an index returned by `load`."""
+        if self._map is None:
+            return
+        self.offsets.release()
+        self.granules.release()
+        self._map.close()
+        self._map = None
+
+    def find(self, granule: int) -> int:
+        """
+        Returns the position in the index of the first page whose packets
+        all end after `granule`.
+        """
+        return bisect.bisect_right(self.granules, granule)
+
+
+class OggOpusReader(object):  # pylint: disable=too-many-instance-attributes
+
+    """
+    Reads an Ogg Opus file through a memory mapping.
+
+    The file is mapped copy-on-write, so packets are handed out as writable
+    memoryviews into the mapping that the decoders accept without copying.
+    Only packets spanning a page boundary are joined into new `bytes`.
+    A mapping still referenced by packet views when `close()` is called is
+    unmapped once the last view is released.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            verify_crc: bool = False,
+            index: bool = False
+    ) -> None:
+        """
+        :param path: Ogg Opus file to read.
+        :param verify_crc: Check the CRC of every page that is read.
+        :param index: Load the seek index sidecar, building it if needed.
+        """
+        self.path = path
+        self.verify_crc = verify_crc
+        self.index = None  # type: typing.Optional[SeekIndex]
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except BaseException:
+            self._file.close()
+            raise
+        self._view = memoryview(self._map)
+        self.file_size = len(self._map)
+        self.mtime_ns = os.fstat(self._file.fileno()).st_mtime_ns
+
+        try:
+            self._read_headers()
+            if index:
+                self.load_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'OggOpusReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Releases the mapping and the file."""
+        if self._file.closed:
+            return
+        if self.index is not None:
+            self.index.close()
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def _read_headers(self) -> None:
+        first = next(self.pages(serial=None), None)
+        if first is None or not first.header_type & BOS:
+            raise ValueError('Not an Ogg stream: {}'.format(self.path))
+        self.serial = first.serial
+
+        head = first.body
+        if len(head) < OPUS_HEAD.size or \
+                head[:8].tobytes() != b'OpusHead':
+            raise ValueError('Not an Ogg Opus stream: {}'.format(self.path))
+        (_, self.version, self.channels, self.pre_skip, self.input_sample_rate,
+         self.output_gain, self.mapping_family) = OPUS_HEAD.unpack_from(head)
+        if self.mapping_family == 0:
+            self.streams = 1
+            self.coupled_streams = self.channels - 1
+            self.mapping = list(range(self.channels))
+        else:
+            self.streams, self.coupled_streams = \
+                OPUS_HEAD_MAPPING.unpack_from(head, OPUS_HEAD.size)
+            start = OPUS_HEAD.size + OPUS_HEAD_MAPPING.size
+            self.mapping = list(head[start:start + self.channels])
+
+        packets = self._packets(first.offset + first.size)
+        try:
+            page, tags = next(packets)
+            while not tags:
+                page, tags = next(packets)
+        except StopIteration:
+            raise ValueError(
+                'Missing OpusTags header: {}'.format(self.path)) from None
+        tags = bytes(tags[0])
+        packets.close()
+        self._parse_tags(tags)
+        self.audio_offset = page.offset + page.size
+
+    def _parse_tags(self, tags: bytes) -> None:
+        if tags[:8] != b'OpusTags':
+            raise ValueError('Missing OpusTags header: {}'.format(self.path))
+        (length,) = struct.unpack_from('<I', tags, 8)
+        self.vendor = tags[12:12 + length].decode('utf-8', 'replace')
+        position = 12 + length
+        (count,) = struct.unpack_from('<I', tags, position)
+        position += 4
+        self.comments = []  # type: typing.List[str]
+        for _ in range(count):
+            (length,) = struct.unpack_from('<I', tags, position)
+            position += 4
+            self.comments.append(
+                tags[position:position + length].decode('utf-8', 'replace'))
+            position += length
+
+    def pages(
+            self,
+            offset: int = 0,
+            serial: typing.Optional[int] = -1
+    ) -> typing.Iterator[Page]:
+        """
+        Walks the pages from byte `offset` onwards.
+
+        Only pages of the Opus stream are returned unless `serial` is None.
+        """
+        if serial == -1:
+            serial = self.serial
+        data = self._map
+        view = self._view
+        size = len(data)
+        header_size = PAGE_HEADER.size
+
+        while offset + header_size <= size:
+            if data[offset:offset + 4] != b'OggS':
+                offset = data.find(b'OggS', offset + 1)
+                if offset < 0:
+                    return
+                continue
+
+            (_, _, header_type, granule, page_serial, sequence, crc,
+             nb_segments) = PAGE_HEADER.unpack_from(data, offset)
+            lacing_end = offset + header_size + nb_segments
+            end = lacing_end + sum(view[offset + header_size:lacing_end])
+            if end > size:
+                return
+
+            if self.verify_crc:
+                page = bytearray(view[offset:end])
+                page[22:26] = bytes(4)
+                if crc32(page) != crc:
+                    offset += 1
+                    continue
+
+            if serial is None or page_serial == serial:
+                yield Page(
+                    offset, header_type, granule, page_serial, sequence, crc,
+                    view[offset + header_size:lacing_end],
+                    view[lacing_end:end])
+            offset = end
+
+    def _packets(
+            self,
+            offset: int
+    ) -> typing.Iterator[typing.Tuple[Page, typing.List[typing.Any]]]:
+        """
+        Yields every page from `offset` with the packets completed on it.
+
+        A packet continued from before `offset` is skipped.
+        """
+        partial = None  # type: typing.Optional[typing.List[typing.Any]]
+        skip = True
+
+        for page in self.pages(offset):
+            if not page.header_type & CONTINUED:
+                partial = None
+                skip = False
+
+            packets = []
+            start = position = 0
+            for value in page.lacing:
+                position += value
+                if value == 255:
+                    continue
+                piece = page.body[start:position]
+                if skip:
+                    skip = False
+                elif partial is not None:
+                    partial.append(piece)
+                    packets.append(b''.join(partial))
+                    partial = None
+                else:
+                    packets.append(piece)
+                start = position
+
+            if start < position and not skip:
+                partial = (partial or []) + [page.body[start:position]]
+
+            yield page, packets
+
+    def packets(self) -> typing.Iterator[typing.Any]:
+        """Yields every audio packet as a memoryview (or `bytes`)."""
+        for _, packets in self._packets(self.audio_offset):
+            for packet in packets:
+                yield packet
+
+    def create_decoder(self, fs: int = GRANULE_RATE) -> typing.Any:
+        """
+        Builds a `Decoder` or `MultiStreamDecoder` for this stream with the
+        OpusHead output gain applied.
+        """
+        if self.mapping_family == 0:
+            decoder = pylibopus.Decoder(fs, self.channels)
+        elif self.mapping_family in (1, 255):
+            decoder = pylibopus.MultiStreamDecoder(
+                fs, self.channels, self.streams, self.coupled_streams,
+                self.mapping)
+        else:
+            raise ValueError('Unsupported channel mapping family {}'.format(
+                self.mapping_family))
+        if self.output_gain:
+            decoder.gain = self.output_gain
+        return decoder
+
+    def decode(
+            self,
+            decoder: typing.Any = None,
+            frame_size: int = 5760
+    ) -> typing.Iterator[bytes]:
+        """
+        Decodes the stream to 16-bit PCM, yielding one chunk per packet.
+
+        Pre-skip and end trimming are applied from the granule positions,
+        so the output is sample-exact. `decoder` defaults to
+        `create_decoder()` at 48 kHz.
+        """
+        if decoder is None:
+            decoder = self.create_decoder()
+        return self._decode(
+            decoder, frame_size, self.audio_offset, None, None)
+
+    def _decode(  # pylint: disable=too-many-arguments,too-many-locals
+            self,
+            decoder: typing.Any,
+            frame_size: int,
+            offset: int,
+            start: typing.Optional[int],
+            page_start: typing.Optional[int]
+    ) -> typing.Iterator[bytes]:
+        """
+        Decodes pages from byte `offset`, dropping output before granule
+        `start` (the pre-skip when None).
+
+        `page_start` is the granule position where the first packet
+        decoded starts: that of the page before. When None, as at the
+        start of the stream, it is derived from the first page completing
+        a packet, or taken as 0 if that page is the end-trimmed last one
+        (RFC 7845, section 4.5).
+        """
+        fs = decoder._fs  # pylint: disable=protected-access
+        sample_bytes = 2 * self.channels
+        keep_from = (self.pre_skip if start is None else start) * fs // \
+            GRANULE_RATE
+        position = None if page_start is None else \
+            page_start * fs // GRANULE_RATE
+
+        for page, packets in self._packets(offset):
+            pcm = [decoder.decode(packet, frame_size) for packet in packets]
+            if not pcm:
+                continue
+            if position is None and page.header_type & EOS:
+                position = 0
+            elif position is None:
+                position = page.granule * fs // GRANULE_RATE - \
+                    sum(len(chunk) for chunk in pcm) // sample_bytes
+            keep_to = page.granule * fs // GRANULE_RATE \
+                if page.header_type & EOS else None
+
+            for chunk in pcm:
+                samples = len(chunk) // sample_bytes
+                first = max(0, keep_from - position)
+                last = samples if keep_to is None else \
+                    min(samples, keep_to - position)
+                if last > first:
+                    yield chunk[first * sample_bytes:last * sample_bytes]
+                position += samples
+
+    def load_index(self, path: typing.Optional[str] = None) -> SeekIndex:
+        """
+        Loads the seek index from the sidecar `path` (`<file>.idx` by
+        default). A missing or stale sidecar, one whose stream serial, file
+        size or modification time differ from the file, is rebuilt and
+        saved.
+        """
+        if path is None:
+            path = self.path + '.idx'
+
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+        try:
+            index = SeekIndex.load(path)
+        except (OSError, ValueError):
+            index = None
+        if index is not None and (index.serial != self.serial or
+                                  index.file_size != self.file_size or
+                                  index.mtime_ns != self.mtime_ns):
+            index.close()
+            index = None
+
+        if index is None:
+            index = SeekIndex.build(self)
+            try:
+                index.save(path)
+            except OSError:
+                # A read-only location still gets the in-memory index.
+                pass
+
+        self.index = index
+        return index
+
+    def seek(
+            self,
+            position: int,
+            decoder: typing.Any = None,
+            frame_size: int = 5760
+    ) -> typing.Iterator[bytes]:
+        """
+        Decodes the stream to 16-bit PCM from `position`, given in 48 kHz
+        samples from the start of the audio (after pre-skip).
+
+        The page is found by bisecting the seek index, built in memory on
+        first use when none was loaded. Decoding starts `SEEK_PREROLL`
+        samples early so the decoder has converged at `position`; `decoder`
+        is reset first.
+        """
+        if position < 0:
+            raise ValueError('`position` must not be negative')
+        if self.index is None:
+            self.index = SeekIndex.build(self)
+        if decoder is None:
+            decoder = self.create_decoder()
+        decoder.reset_state()
+
+        target = position + self.pre_skip
+        page = min(self.index.find(target - SEEK_PREROLL), len(self.index) - 1)
+        # Packets completed on a continued page started on an earlier one.
+        while page > 0 and self._map[self.index.offsets[page] + 5] & CONTINUED:
+            page -= 1
+
+        if page > 0:
+            offset = self.index.offsets[page]
+            page_start = self.index.granules[page - 1]
+        else:
+            offset = self.audio_offset
+            page_start = None
+        return self._decode(decoder, frame_size, offset, target, page_start)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Batch parsing of Opus packet TOC bytes (RFC 6716, section 3.1).
+
+`inspect_many` reads the table-of-contents byte, and the frame count byte
+of code 3 packets, of many packets at once without a call into libopus
+per packet. The loop runs in NumPy when it is installed.
+
+`unpad_many` strips the padding of many packets in a single buffer.
+
+Usage example:
+
+>>> import pylibopus
+>>> import pylibopus.packet
+>>> encoder = pylibopus.Encoder(48000, 2, 'audio')
+>>> data, offsets = encoder.encode_frames(bytes(38400), 960)
+>>> info = pylibopus.packet.inspect_many(data, offsets)
+>>> int(sum(info.duration))
+9600
+
+"""
+
+import array
+import ctypes  # type: ignore
+import itertools
+import typing
+
+import pylibopus.api.decoder
+import pylibopus.api.multistream_decoder
+import pylibopus.constants
+import pylibopus.exceptions
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+# Codec modes, as numbered inside libopus.
+MODE_SILK_ONLY = 1000
+MODE_HYBRID = 1001
+MODE_CELT_ONLY = 1002
+
+# Longest duration of a packet, in 48 kHz samples (120 ms).
+MAX_PACKET_DURATION = 5760
+
+
+def _config_table() -> typing.List[typing.Tuple[int, int, int]]:
+    """(mode, bandwidth, samples per frame at 48 kHz) of each TOC config."""
+    table = []
+    for config in range(32):
+        if config < 12:
+            mode = MODE_SILK_ONLY
+            bandwidth = pylibopus.constants.BANDWIDTH_NARROWBAND + config // 4
+            size = (480, 960, 1920, 2880)[config & 3]
+        elif config < 16:
+            mode = MODE_HYBRID
+            bandwidth = pylibopus.constants.BANDWIDTH_SUPERWIDEBAND + \
+                (config - 12) // 2
+            size = (480, 960)[config & 1]
+        else:
+            mode = MODE_CELT_ONLY
+            bandwidth = pylibopus.constants.BANDWIDTH_NARROWBAND + \
+                (config - 16) // 4
+            if bandwidth != pylibopus.constants.BANDWIDTH_NARROWBAND:
+                # CELT has no mediumband configurations.
+                bandwidth += 1
+            size = (120, 240, 480, 960)[config & 3]
+        table.append((mode, bandwidth, size))
+    return table
+
+
+CONFIGS = _config_table()
+
+
+class PacketInfo(typing.NamedTuple):
+    """
+    Columns returned by `inspect_many`, one entry per packet.
+
+    Invalid packets (empty, code 3 without a frame count byte, or longer
+    than 120 ms) have a frame count and duration of 0.
+    """
+
+    config: typing.Any
+    mode: typing.Any
+    bandwidth: typing.Any
+    stereo: typing.Any
+    frames: typing.Any
+    duration: typing.Any
+
+
+def _heads(
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]]
+) -> typing.Tuple[bytes, bytes, typing.Any]:
+    """
+    Collects the first two bytes (zero when missing) and the length of each
+    packet.
+    """
+    if offsets is not None:
+        data = memoryview(packets).cast('B')
+        pairs = zip(offsets[:-1], offsets[1:])
+        packets = [data[start:end] for start, end in pairs]
+
+    tocs = bytearray(len(packets))
+    counts = bytearray(len(packets))
+    lengths = array.array('Q', bytes(8 * len(packets)))
+    for index, packet in enumerate(packets):
+        length = len(packet)
+        lengths[index] = length
+        if length:
+            tocs[index] = packet[0]
+            if length > 1:
+                counts[index] = packet[1]
+    return bytes(tocs), bytes(counts), lengths
+
+
+def _inspect_numpy(
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]],
+        fs: int
+) -> PacketInfo:
+    if offsets is not None:
+        data = numpy.frombuffer(packets, numpy.uint8)
+        offsets = numpy.asarray(offsets, numpy.int64)
+        starts = offsets[:-1]
+        lengths = offsets[1:] - starts
+        if len(data):
+            tocs = numpy.where(
+                lengths > 0, data[numpy.minimum(starts, len(data) - 1)], 0)
+            counts = numpy.where(
+                lengths > 1, data[numpy.minimum(starts + 1, len(data) - 1)],
+                0)
+        else:
+            tocs = counts = numpy.zeros(len(lengths), numpy.uint8)
+    else:
+        tocs, counts, lengths = _heads(packets, None)
+        tocs = numpy.frombuffer(tocs, numpy.uint8)
+        counts = numpy.frombuffer(counts, numpy.uint8)
+        lengths = numpy.frombuffer(lengths, numpy.uint64).astype(numpy.int64)
+
+    table = numpy.array(CONFIGS, numpy.int32)
+    tocs = tocs.astype(numpy.uint8)
+    config = tocs >> 3
+    code = tocs & 3
+
+    frames = numpy.choose(code, [
+        numpy.ones(len(tocs), numpy.uint8), 2, 2, counts & 0x3f])
+    frames = frames.astype(numpy.uint8)
+    frames[(lengths == 0) | ((code == 3) & (lengths < 2))] = 0
+    size = table[config, 2]
+    frames[frames.astype(numpy.int32) * size > MAX_PACKET_DURATION] = 0
+
+    return PacketInfo(
+        config=config,
+        mode=table[config, 0].astype(numpy.uint16),
+        bandwidth=table[config, 1].astype(numpy.uint16),
+        stereo=(tocs >> 2) & 1,
+        frames=frames,
+        duration=(frames * size * fs // 48000).astype(numpy.uint32),
+    )
+
+
+def _inspect_array(
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]],
+        fs: int
+) -> PacketInfo:
+    tocs, counts, lengths = _heads(packets, offsets)
+    info = PacketInfo(
+        config=array.array('B'),
+        mode=array.array('H'),
+        bandwidth=array.array('H'),
+        stereo=array.array('B'),
+        frames=array.array('B'),
+        duration=array.array('I'),
+    )
+
+    for toc, count, length in zip(tocs, counts, lengths):
+        config = toc >> 3
+        mode, bandwidth, size = CONFIGS[config]
+        code = toc & 3
+        if not length or (code == 3 and length < 2):
+            frames = 0
+        else:
+            frames = (1, 2, 2, count & 0x3f)[code]
+            if frames * size > MAX_PACKET_DURATION:
+                frames = 0
+
+        info.config.append(config)
+        info.mode.append(mode)
+        info.bandwidth.append(bandwidth)
+        info.stereo.append((toc >> 2) & 1)
+        info.frames.append(frames)
+        info.duration.append(frames * size * fs // 48000)
+    return info
+
+
+def inspect_many(
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]] = None,
+        fs: int = 48000
+) -> PacketInfo:
+    """
+    Parses the TOC of many packets, returning one column per field.
+
+    :param packets: A sequence of packets, or, with `offsets`, one buffer
+        holding packets back to back (the `encode_frames` layout).
+    :param offsets: Start of each packet in `packets` plus the end of the
+        last one.
+    :param fs: Sample rate `duration` is given in (Hz).
+
+    The columns are numpy.ndarray when NumPy is installed and array.array
+    otherwise. `mode` holds a `MODE_*` and `bandwidth` a `BANDWIDTH_*`
+    constant; `duration` is the number of samples per channel.
+    """
+    if numpy is not None:
+        return _inspect_numpy(packets, offsets, fs)
+    return _inspect_array(packets, offsets, fs)
+
+
+def unpad_many(
+        packets: typing.Any,
+        offsets: typing.Optional[typing.Sequence[int]] = None,
+        streams: typing.Optional[int] = None
+) -> typing.Tuple[bytes, array.array]:
+    """
+    Removes the padding of many packets, returning them packed back to back
+    with their new offsets (the `encode_frames` layout).
+
+    :param packets: A sequence of packets, or, with `offsets`, one buffer
+        holding packets back to back.
+    :param offsets: Start of each packet in `packets` plus the end of the
+        last one.
+    :param streams: Number of streams of multistream packets; None for
+        single-stream packets.
+
+    The packets are unpadded and compacted in place inside one copy of the
+    input. Empty packets are kept as they are.
+    """
+    if offsets is None:
+        lengths = [memoryview(packet).nbytes for packet in packets]
+        offsets = array.array('Q', itertools.accumulate([0] + lengths))
+        data = bytearray(b''.join(packets))
+    else:
+        data = bytearray(packets)
+
+    new_offsets = array.array('Q', [0])
+    if not data:
+        new_offsets.extend(0 for _ in offsets[1:])
+        return b'', new_offsets
+
+    buffer = (ctypes.c_char * len(data)).from_buffer(data)
+    address = ctypes.addressof(buffer)
+    written = 0
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        length = end - start
+        if length:
+            packet = ctypes.c_char_p(address + start)
+            if streams is None:
+                length = pylibopus.api.decoder.libopus_packet_unpad(
+                    packet, length)
+            else:
+                length = \
+                    pylibopus.api.multistream_decoder.libopus_packet_unpad(
+                        packet, length, streams)
+            if length < 0:
+                raise pylibopus.exceptions.OpusError(length)
+            ctypes.memmove(address + written, address + start, length)
+        written += length
+        new_offsets.append(written)
+
+    del buffer
+    del data[written:]
+    return bytes(data), new_offsets
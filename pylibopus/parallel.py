@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access
+
+"""
+Thread-pool encoding across many independent encoders.
+
+libopus calls made through ctypes release the GIL, so encoding the
+frames of independent sessions on a thread pool scales with the number
+of cores.
+
+Usage example:
+
+>>> import pylibopus
+>>> import pylibopus.parallel
+>>> encoders = [pylibopus.Encoder(48000, 2, 'voip') for _ in range(4)]
+>>> with pylibopus.parallel.EncoderPool(max_workers=2) as pool:
+...     packets = pool.encode([(enc, bytes(3840)) for enc in encoders])
+>>> len(packets)
+4
+
+"""
+
+import concurrent.futures
+import threading
+import typing
+import weakref
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class EncoderPool(object):
+
+    """
+    Fans a tick's worth of (encoder, pcm) jobs out to a thread pool.
+
+    Jobs for the same encoder always run in submission order on a single
+    worker, and each encoder is locked while it is in use, so an encoder
+    is never touched by two threads at once, even across overlapping
+    calls.
+    """
+
+    def __init__(self, max_workers: typing.Optional[int] = None) -> None:
+        """
+        :param max_workers: Number of worker threads, as for
+            `concurrent.futures.ThreadPoolExecutor`.
+        """
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self._locks = weakref.WeakKeyDictionary()  # type: typing.Any
+        self._locks_lock = threading.Lock()
+
+    def __enter__(self) -> 'EncoderPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the worker threads."""
+        self._executor.shutdown(wait)
+
+    def _lock_for(self, encoder: typing.Any) -> threading.Lock:
+        with self._locks_lock:
+            lock = self._locks.get(encoder)
+            if lock is None:
+                lock = self._locks[encoder] = threading.Lock()
+            return lock
+
+    def _run(self, jobs, method: str, sample_size: int) -> typing.List[bytes]:
+        jobs = list(jobs)
+        groups = {}  # type: typing.Dict[int, typing.List[int]]
+        for index, (encoder, _) in enumerate(jobs):
+            groups.setdefault(id(encoder), []).append(index)
+
+        results = [b''] * len(jobs)
+
+        def encode_group(indices: typing.List[int]) -> None:
+            encoder = jobs[indices[0]][0]
+            encode = getattr(encoder, method)
+            frame_bytes = sample_size * encoder._channels
+            with self._lock_for(encoder):
+                for index in indices:
+                    pcm_data = jobs[index][1]
+                    results[index] = encode(
+                        pcm_data, memoryview(pcm_data).nbytes // frame_bytes)
+
+        futures = [
+            self._executor.submit(encode_group, indices)
+            for indices in groups.values()
+        ]
+        for future in futures:
+            future.result()
+
+        return results
+
+    def encode(self, jobs) -> typing.List[bytes]:
+        """
+        Encodes one frame of 16-bit PCM for every (encoder, pcm_data) job.
+
+        The frame size is derived from the length of `pcm_data` and the
+        encoder's channel count. Returns the packets in job order.
+        """
+        return self._run(jobs, 'encode', 2)
+
+    def encode_float(self, jobs) -> typing.List[bytes]:
+        """
+        Encodes one frame of float PCM for every (encoder, pcm_data) job.
+
+        Returns the packets in job order.
+        """
+        return self._run(jobs, 'encode_float', 4)
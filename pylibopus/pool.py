@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Keyed pool of reusable encoders and decoders.
+
+Creating and destroying a codec allocates and frees its libopus state.
+Sessions that come and go at a high rate can instead take a codec from a
+`CodecPool` and give it back when done. Released codecs are reset with
+`reset_state()` and kept idle under their configuration key: the class
+and its sample rate, channels, application and stream layout. Only an
+idle codec with the same key is handed out again.
+
+`reset_state()` clears the signal history but keeps CTL settings, so a
+codec tuned by an earlier session (bitrate, complexity, gain, ...) comes
+back with those settings.
+
+Usage example:
+
+>>> import pylibopus
+>>> import pylibopus.pool
+>>> pool = pylibopus.pool.CodecPool(max_idle_per_key=8)
+>>> encoder = pool.acquire_encoder(48000, 1, 'voip')
+>>> packet = encoder.encode(bytes(1920), 960)
+>>> pool.release(encoder)
+>>> encoder is pool.acquire_encoder(48000, 1, 'voip')
+True
+>>> pool.stats().hits
+1
+
+"""
+
+import collections
+import ctypes  # type: ignore
+import threading
+import typing
+
+import pylibopus
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+# Pooled kinds; subclasses (such as arena views) share their base's key.
+CODEC_TYPES = (
+    pylibopus.Encoder,
+    pylibopus.Decoder,
+    pylibopus.MultiStreamEncoder,
+    pylibopus.MultiStreamDecoder,
+    pylibopus.ProjectionEncoder,
+    pylibopus.ProjectionDecoder,
+)
+
+# Configuration attributes of the high-level classes, in key order.
+KEY_ATTRIBUTES = (
+    '_fs',
+    '_channels',
+    '_application',
+    '_mapping_family',
+    '_streams',
+    '_coupled_streams',
+    '_mapping',
+    '_demixing_matrix',
+)
+
+
+def _freeze(value: typing.Any) -> typing.Any:
+    # Mappings and demixing matrices may be lists, bytes or ctypes arrays.
+    if isinstance(value, (list, bytes, bytearray, ctypes.Array)):
+        return tuple(value)
+    return value
+
+
+def make_key(codec_type: type, **settings) -> typing.Tuple[typing.Any, ...]:
+    """
+    Builds the pool key of a `codec_type` created with `settings`, named
+    after `KEY_ATTRIBUTES` without the leading underscore.
+    """
+    application = settings.get('application')
+    if application is not None:
+        settings['application'] = pylibopus.APPLICATION_TYPES_MAP.get(
+            application, application)
+    return (codec_type,) + tuple(
+        _freeze(settings.get(name[1:])) for name in KEY_ATTRIBUTES)
+
+
+def codec_key(codec: typing.Any) -> typing.Tuple[typing.Any, ...]:
+    """Returns the pool key of an existing codec object."""
+    for codec_type in CODEC_TYPES:
+        if isinstance(codec, codec_type):
+            break
+    else:
+        raise TypeError('Cannot pool {!r}'.format(codec))
+    return (codec_type,) + tuple(
+        _freeze(getattr(codec, name, None)) for name in KEY_ATTRIBUTES)
+
+
+class PoolStats(typing.NamedTuple):
+    """Counters of a `CodecPool`."""
+
+    hits: int
+    misses: int
+    releases: int
+    evictions: int
+    idle: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of acquisitions served from idle codecs."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CodecPool(object):
+
+    """
+    Thread-safe pool of idle codecs keyed by configuration.
+
+    At most `max_idle_per_key` codecs are kept per key and, if given, at
+    most `max_idle` in total. When a limit is exceeded the least recently
+    released codec is dropped and closed, which frees its state.
+    """
+
+    def __init__(
+            self,
+            max_idle_per_key: int = 16,
+            max_idle: typing.Optional[int] = None
+    ) -> None:
+        if max_idle_per_key < 0 or (max_idle is not None and max_idle < 0):
+            raise ValueError('Idle limits must not be negative')
+        self.max_idle_per_key = max_idle_per_key
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        # key -> deque of idle codecs, oldest first. Keys are kept in least
+        # recently released order.
+        self._idle = collections.OrderedDict()  # type: typing.Any
+        self._idle_count = 0
+        # id() of every idle codec, to catch codecs released twice.
+        self._idle_ids = set()  # type: typing.Set[int]
+        self._hits = 0
+        self._misses = 0
+        self._releases = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return self._idle_count
+
+    def _acquire(
+            self,
+            key: typing.Tuple[typing.Any, ...],
+            factory: typing.Callable[[], typing.Any]
+    ) -> typing.Any:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                codec = idle.pop()
+                if not idle:
+                    del self._idle[key]
+                self._idle_count -= 1
+                self._idle_ids.discard(id(codec))
+                self._hits += 1
+                return codec
+            self._misses += 1
+        return factory()
+
+    def acquire_encoder(
+            self,
+            fs: int,
+            channels: int,
+            application: typing.Any
+    ) -> pylibopus.Encoder:
+        """Returns an idle or new `Encoder`."""
+        return self._acquire(
+            make_key(pylibopus.Encoder, fs=fs, channels=channels,
+                     application=application),
+            lambda: pylibopus.Encoder(fs, channels, application))
+
+    def acquire_decoder(self, fs: int, channels: int) -> pylibopus.Decoder:
+        """Returns an idle or new `Decoder`."""
+        return self._acquire(
+            make_key(pylibopus.Decoder, fs=fs, channels=channels),
+            lambda: pylibopus.Decoder(fs, channels))
+
+    def acquire_multistream_encoder(  # pylint: disable=too-many-arguments
+            self,
+            fs: int,
+            channels: int,
+            streams: int,
+            coupled_streams: int,
+            mapping: list,
+            application: typing.Any
+    ) -> pylibopus.MultiStreamEncoder:
+        """Returns an idle or new `MultiStreamEncoder`."""
+        return self._acquire(
+            make_key(pylibopus.MultiStreamEncoder, fs=fs, channels=channels,
+                     streams=streams, coupled_streams=coupled_streams,
+                     mapping=mapping, application=application),
+            lambda: pylibopus.MultiStreamEncoder(
+                fs, channels, streams, coupled_streams, mapping,
+                application))
+
+    def acquire_multistream_decoder(  # pylint: disable=too-many-arguments
+            self,
+            fs: int,
+            channels: int,
+            streams: int,
+            coupled_streams: int,
+            mapping: list
+    ) -> pylibopus.MultiStreamDecoder:
+        """Returns an idle or new `MultiStreamDecoder`."""
+        return self._acquire(
+            make_key(pylibopus.MultiStreamDecoder, fs=fs, channels=channels,
+                     streams=streams, coupled_streams=coupled_streams,
+                     mapping=mapping),
+            lambda: pylibopus.MultiStreamDecoder(
+                fs, channels, streams, coupled_streams, mapping))
+
+    def acquire_projection_encoder(  # pylint: disable=too-many-arguments
+            self,
+            fs: int,
+            channels: int,
+            mapping_family: int,
+            streams: int,
+            coupled_streams: int,
+            application: typing.Any
+    ) -> pylibopus.ProjectionEncoder:
+        """Returns an idle or new `ProjectionEncoder`."""
+        return self._acquire(
+            make_key(pylibopus.ProjectionEncoder, fs=fs, channels=channels,
+                     mapping_family=mapping_family, streams=streams,
+                     coupled_streams=coupled_streams,
+                     application=application),
+            lambda: pylibopus.ProjectionEncoder(
+                fs, channels, mapping_family, streams, coupled_streams,
+                application))
+
+    def acquire_projection_decoder(  # pylint: disable=too-many-arguments
+            self,
+            fs: int,
+            channels: int,
+            streams: int,
+            coupled_streams: int,
+            demixing_matrix: typing.Any
+    ) -> pylibopus.ProjectionDecoder:
+        """Returns an idle or new `ProjectionDecoder`."""
+        return self._acquire(
+            make_key(pylibopus.ProjectionDecoder, fs=fs, channels=channels,
+                     streams=streams, coupled_streams=coupled_streams,
+                     demixing_matrix=demixing_matrix),
+            lambda: pylibopus.ProjectionDecoder(
+                fs, channels, streams, coupled_streams, demixing_matrix))
+
+    def release(self, codec: typing.Any) -> None:
+        """
+        Resets `codec` and keeps it idle for the next acquisition with the
+        same key. The caller must not use `codec` afterwards.
+
+        Raises ValueError if `codec` is already idle in the pool.
+        """
+        key = codec_key(codec)
+
+        evicted = []
+        with self._lock:
+            if id(codec) in self._idle_ids:
+                raise ValueError('Codec released twice')
+            codec.reset_state()
+            self._idle_ids.add(id(codec))
+            self._releases += 1
+            idle = self._idle.get(key)
+            if idle is None:
+                idle = self._idle[key] = collections.deque()
+            else:
+                self._idle.move_to_end(key)
+            idle.append(codec)
+            self._idle_count += 1
+
+            if len(idle) > self.max_idle_per_key:
+                evicted.append(idle.popleft())
+                self._idle_count -= 1
+            while self.max_idle is not None and \
+                    self._idle_count > self.max_idle:
+                oldest_key, oldest = next(iter(self._idle.items()))
+                evicted.append(oldest.popleft())
+                self._idle_count -= 1
+                if not oldest:
+                    del self._idle[oldest_key]
+            if not idle and key in self._idle:
+                del self._idle[key]
+            self._evictions += len(evicted)
+            self._idle_ids.difference_update(id(codec) for codec in evicted)
+        # States are freed outside the lock.
+        for codec in evicted:
+            codec.close()
+
+    def clear(self) -> None:
+        """Drops and closes every idle codec."""
+        with self._lock:
+            evicted = [codec for idle in self._idle.values() for codec in idle]
+            self._evictions += self._idle_count
+            self._idle.clear()
+            self._idle_count = 0
+            self._idle_ids.clear()
+        for codec in evicted:
+            codec.close()
+
+    def stats(self) -> PoolStats:
+        """Returns a snapshot of the counters."""
+        with self._lock:
+            return PoolStats(self._hits, self._misses, self._releases,
+                             self._evictions, self._idle_count)
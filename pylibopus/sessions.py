@@ -0,0 +1,349 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Decoders for many concurrent streams, keyed by stream ID.
+
+A `DecoderRegistry` creates a decoder when the first packet of a stream
+arrives and keeps it under `(stream_id, fs, channels)`. Sessions that
+receive no packet for `idle_timeout` seconds end, as do the least recently
+used sessions when a new state would take the native memory held by the
+registry over `max_bytes`. Memory is counted with `opus_decoder_get_size`.
+
+The state of an ended session is reset with `reset_state()` and kept as a
+spare for the next new session with the same sample rate and channel
+count, so streams that come and go do not allocate and free states all
+the time. Spare states count towards `max_bytes` and are dropped before
+any live session is evicted.
+
+Usage example:
+
+>>> import pylibopus
+>>> import pylibopus.sessions
+>>> registry = pylibopus.sessions.DecoderRegistry(idle_timeout=30)
+>>> packet = pylibopus.Encoder(48000, 1, 'voip').encode(bytes(1920), 960)
+>>> len(registry.decode(0x1234abcd, 48000, 1, packet, 960))
+1920
+>>> registry.stats().live
+1
+
+"""
+
+import collections
+import threading
+import time
+import typing
+
+import pylibopus
+import pylibopus.api.decoder
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class SessionStats(typing.NamedTuple):
+    """Counters of a `DecoderRegistry`."""
+
+    live: int
+    spare: int
+    bytes: int
+    created: int
+    recycled: int
+    expired: int
+    evicted: int
+    removed: int
+
+    @property
+    def started(self) -> int:
+        """Sessions started, on new or recycled states."""
+        return self.created + self.recycled
+
+    @property
+    def ended(self) -> int:
+        """Sessions ended for any reason."""
+        return self.expired + self.evicted + self.removed
+
+
+class _Session(object):
+
+    __slots__ = ('decoder', 'size', 'last_used')
+
+    def __init__(self, decoder: pylibopus.Decoder, size: int,
+                 last_used: float) -> None:
+        self.decoder = decoder
+        self.size = size
+        self.last_used = last_used
+
+
+class DecoderRegistry(object):
+
+    """
+    Thread-safe registry of decoder sessions keyed by
+    `(stream_id, fs, channels)`.
+
+    :param idle_timeout: Seconds without a packet after which a session
+        ends; None keeps sessions until evicted or removed.
+    :param max_bytes: Cap on the native memory of live and spare states;
+        None for no cap.
+    :param max_spare: Most spare states kept per (fs, channels).
+    :param clock: Time source, in seconds.
+
+    Calls on one registry are serialized, including the decoding done by
+    `decode()`.
+    """
+
+    def __init__(
+            self,
+            idle_timeout: typing.Optional[float] = 60.0,
+            max_bytes: typing.Optional[int] = None,
+            max_spare: int = 64,
+            clock: typing.Callable[[], float] = time.monotonic
+    ) -> None:
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError('`idle_timeout` must be positive')
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError('`max_bytes` must be positive')
+        if max_spare < 0:
+            raise ValueError('`max_spare` must not be negative')
+        self.idle_timeout = idle_timeout
+        self.max_bytes = max_bytes
+        self.max_spare = max_spare
+        self._clock = clock
+        self._lock = threading.RLock()
+        # key -> _Session, least recently used first.
+        self._sessions = collections.OrderedDict()  # type: typing.Any
+        # (fs, channels) -> list of reset decoders.
+        self._spares = {}  # type: typing.Dict[typing.Any, typing.List]
+        self._spare_count = 0
+        self._sizes = {}  # type: typing.Dict[int, int]
+        self._bytes = 0
+        self._created = 0
+        self._recycled = 0
+        self._expired = 0
+        self._evicted = 0
+        self._removed = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, key: typing.Tuple[typing.Any, int, int]) -> bool:
+        return key in self._sessions
+
+    def _state_size(self, channels: int) -> int:
+        size = self._sizes.get(channels)
+        if size is None:
+            size = pylibopus.api.decoder.get_size(channels)
+            self._sizes[channels] = size
+        return size
+
+    def _end(
+            self,
+            key: typing.Tuple[typing.Any, int, int],
+            dropped: typing.List[pylibopus.Decoder]
+    ) -> None:
+        """
+        Ends session `key`, keeping its state as a spare if possible and
+        adding it to `dropped` otherwise.
+        """
+        session = self._sessions.pop(key)
+        spares = self._spares.setdefault(key[1:], [])
+        if len(spares) < self.max_spare:
+            session.decoder.reset_state()
+            spares.append(session.decoder)
+            self._spare_count += 1
+        else:
+            self._bytes -= session.size
+            dropped.append(session.decoder)
+
+    def _drop_spare(self, dropped: typing.List[pylibopus.Decoder]) -> None:
+        """Moves one spare state to `dropped`."""
+        for shape, spares in self._spares.items():
+            if spares:
+                dropped.append(spares.pop())
+                self._spare_count -= 1
+                self._bytes -= self._state_size(shape[1])
+                return
+
+    @staticmethod
+    def _close(dropped: typing.List[pylibopus.Decoder]) -> None:
+        """Frees the states of `dropped`, once the lock is released."""
+        for decoder in dropped:
+            decoder.close()
+
+    def _expire(
+            self,
+            now: float,
+            dropped: typing.List[pylibopus.Decoder]
+    ) -> int:
+        if self.idle_timeout is None:
+            return 0
+        deadline = now - self.idle_timeout
+        count = 0
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if session.last_used > deadline:
+                break
+            self._end(key, dropped)
+            count += 1
+        self._expired += count
+        return count
+
+    def _start(
+            self,
+            fs: int,
+            channels: int,
+            dropped: typing.List[pylibopus.Decoder]
+    ) -> pylibopus.Decoder:
+        """Returns a spare or new decoder for a new session."""
+        spares = self._spares.get((fs, channels))
+        if spares:
+            self._spare_count -= 1
+            self._recycled += 1
+            return spares.pop()
+
+        size = self._state_size(channels)
+        if self.max_bytes is not None:
+            if size > self.max_bytes:
+                raise MemoryError(
+                    'A decoder state needs {} bytes, more than max_bytes '
+                    '({})'.format(size, self.max_bytes))
+            while self._bytes + size > self.max_bytes:
+                if self._spare_count:
+                    self._drop_spare(dropped)
+                    continue
+                key = next(iter(self._sessions))
+                self._end(key, dropped)
+                self._evicted += 1
+                spares = self._spares.get((fs, channels))
+                if spares:
+                    self._spare_count -= 1
+                    self._recycled += 1
+                    return spares.pop()
+
+        decoder = pylibopus.Decoder(fs, channels)
+        self._bytes += size
+        self._created += 1
+        return decoder
+
+    def _get(
+            self,
+            key: typing.Tuple[typing.Any, int, int],
+            dropped: typing.List[pylibopus.Decoder]
+    ) -> pylibopus.Decoder:
+        now = self._clock()
+        session = self._sessions.get(key)
+        if session is not None:
+            session.last_used = now
+            self._sessions.move_to_end(key)
+            self._expire(now, dropped)
+            return session.decoder
+
+        self._expire(now, dropped)
+        decoder = self._start(key[1], key[2], dropped)
+        self._sessions[key] = _Session(
+            decoder, self._state_size(key[2]), now)
+        return decoder
+
+    def get(
+            self,
+            stream_id: typing.Any,
+            fs: int,
+            channels: int
+    ) -> pylibopus.Decoder:
+        """
+        Returns the decoder of a stream, starting a session if there is
+        none, and marks the session as used.
+
+        The decoder must not be used after its session has ended: states
+        dropped by the registry are closed.
+        """
+        dropped = []  # type: typing.List[pylibopus.Decoder]
+        with self._lock:
+            decoder = self._get((stream_id, fs, channels), dropped)
+        self._close(dropped)
+        return decoder
+
+    # FIXME: Remove typing.Any once we have a stub for ctypes
+    def decode(  # pylint: disable=too-many-arguments
+            self,
+            stream_id: typing.Any,
+            fs: int,
+            channels: int,
+            opus_data: typing.Optional[bytes],
+            frame_size: int,
+            decode_fec: bool = False
+    ) -> typing.Union[bytes, typing.Any]:
+        """
+        Decodes a packet of a stream to PCM with `Decoder.decode`. With
+        `opus_data` None the packet is lost, and `frame_size` samples per
+        channel of concealment are returned.
+        """
+        dropped = []  # type: typing.List[pylibopus.Decoder]
+        with self._lock:
+            decoder = self._get((stream_id, fs, channels), dropped)
+            if opus_data is None:
+                pcm = pylibopus.api.decoder.decode(
+                    decoder.decoder_state, None, 0, frame_size, decode_fec,
+                    channels=channels)
+            else:
+                pcm = decoder.decode(opus_data, frame_size, decode_fec)
+        self._close(dropped)
+        return pcm
+
+    def remove(self, stream_id: typing.Any, fs: int, channels: int) -> bool:
+        """
+        Ends the session of a stream, returning False if there was none.
+        """
+        key = (stream_id, fs, channels)
+        dropped = []  # type: typing.List[pylibopus.Decoder]
+        with self._lock:
+            if key not in self._sessions:
+                return False
+            self._end(key, dropped)
+            self._removed += 1
+        self._close(dropped)
+        return True
+
+    def expire(self, now: typing.Optional[float] = None) -> int:
+        """
+        Ends the sessions idle for `idle_timeout` seconds at `now` (the
+        clock by default), returning their number.
+
+        Expiry also happens on each `get()`, for the oldest sessions only;
+        call this periodically to end sessions while no packet arrives.
+        """
+        dropped = []  # type: typing.List[pylibopus.Decoder]
+        with self._lock:
+            count = self._expire(
+                self._clock() if now is None else now, dropped)
+        self._close(dropped)
+        return count
+
+    def clear(self) -> None:
+        """Ends every session and frees every state."""
+        with self._lock:
+            dropped = [session.decoder for session in self._sessions.values()]
+            dropped.extend(
+                decoder for spares in self._spares.values()
+                for decoder in spares)
+            self._removed += len(self._sessions)
+            self._sessions.clear()
+            self._spares.clear()
+            self._spare_count = 0
+            self._bytes = 0
+        self._close(dropped)
+
+    def stats(self) -> SessionStats:
+        """Returns a snapshot of the counters."""
+        with self._lock:
+            return SessionStats(
+                live=len(self._sessions),
+                spare=self._spare_count,
+                bytes=self._bytes,
+                created=self._created,
+                recycled=self._recycled,
+                expired=self._expired,
+                evicted=self._evicted,
+                removed=self._removed,
+            )
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the asyncio codec wrappers"""
+
+import asyncio
+import concurrent.futures
+import unittest
+
+import pylibopus
+import pylibopus.aio
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class AsyncCodecTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [bytes([index]) * 3840 for index in range(10)]
+
+    def test_encode_order(self):
+        reference = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        expected = [reference.encode(frame, 960) for frame in self.frames]
+
+        encoder = pylibopus.aio.AsyncEncoder(
+            pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO),
+            max_pending=4)
+
+        async def main():
+            return await asyncio.gather(
+                *[encoder.encode(frame, 960) for frame in self.frames])
+
+        self.assertEqual(run(main()), expected)
+
+    def test_streams(self):
+        encoder = pylibopus.aio.AsyncEncoder(
+            pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO),
+            max_pending=3)
+        decoder = pylibopus.aio.AsyncDecoder(pylibopus.Decoder(48000, 2))
+
+        async def frames():
+            for frame in self.frames:
+                yield frame
+
+        async def main():
+            packets = encoder.encode_stream(frames(), 960)
+            return [pcm async for pcm in decoder.decode_stream(packets, 960)]
+
+        pcm = run(main())
+        self.assertEqual(len(pcm), len(self.frames))
+        self.assertEqual({len(frame) for frame in pcm}, {3840})
+
+    def test_errors(self):
+        decoder = pylibopus.aio.AsyncDecoder(pylibopus.Decoder(48000, 2))
+
+        async def main():
+            with self.assertRaises(pylibopus.OpusError):
+                await decoder.decode(bytes([252, 0, 0]), 60)
+            return await decoder.decode(bytes([252, 0, 0]), 960)
+
+        self.assertEqual(len(run(main())), 3840)
+
+    def test_executor_shut_down(self):
+        executor = concurrent.futures.ThreadPoolExecutor(1)
+        executor.shutdown()
+        encoder = pylibopus.aio.AsyncEncoder(
+            pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO),
+            executor=executor)
+
+        async def main():
+            return await asyncio.wait_for(asyncio.gather(
+                *[encoder.encode(frame, 960) for frame in self.frames],
+                return_exceptions=True), timeout=5)
+
+        results = run(main())
+        self.assertEqual(len(results), len(self.frames))
+        for result in results:
+            self.assertIsInstance(result, RuntimeError)
+        self.assertIsNone(encoder._drainer)  # pylint: disable=protected-access
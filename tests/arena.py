@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the codec state arenas"""
+
+import gc
+import unittest
+
+import pylibopus
+import pylibopus.arena
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+PCM = (bytes(range(256)) * 15)[:3840]
+
+
+class StateArenaTest(unittest.TestCase):
+
+    def test_encoder_arena(self):
+        arena = pylibopus.arena.EncoderArena(
+            8, 48000, 2, pylibopus.APPLICATION_AUDIO)
+        self.assertEqual(len(arena), 8)
+        self.assertEqual(arena.stride % pylibopus.arena.ALIGNMENT, 0)
+        self.assertGreaterEqual(arena.nbytes, 8 * arena.state_size)
+
+        reference = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        expected = reference.encode(PCM, 960)
+        for encoder in arena:
+            self.assertIsInstance(encoder, pylibopus.Encoder)
+            self.assertEqual(encoder.encode(PCM, 960), expected)
+
+        arena[3].bitrate = 16000
+        self.assertEqual(arena[3].bitrate, 16000)
+        self.assertNotEqual(arena[2].bitrate, 16000)
+        self.assertEqual(arena[-5].bitrate, 16000)
+        self.assertEqual(arena[-5].index, 3)
+        with self.assertRaises(IndexError):
+            arena[8]  # pylint: disable=pointless-statement
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            pylibopus.arena.StateArena(1, 64)
+
+    def test_view_keeps_arena(self):
+        encoder = pylibopus.arena.EncoderArena(
+            2, 48000, 1, pylibopus.APPLICATION_VOIP)[1]
+        gc.collect()
+        encoder.encode(PCM[:1920], 960)
+        del encoder
+        gc.collect()
+
+    def test_decoder_arena(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        packet = encoder.encode(PCM, 960)
+        arena = pylibopus.arena.DecoderArena(4, 48000, 2)
+        reference = pylibopus.Decoder(48000, 2).decode(packet, 960)
+        for decoder in arena:
+            self.assertIsInstance(decoder, pylibopus.Decoder)
+            self.assertEqual(decoder.decode(packet, 960), reference)
+
+        with self.assertRaises(ValueError):
+            pylibopus.arena.DecoderArena(4, 48000, 3)
+        with self.assertRaises(pylibopus.OpusError):
+            pylibopus.arena.DecoderArena(4, 44100, 2)
+
+    def test_multistream_arenas(self):
+        encoders = pylibopus.arena.MultiStreamEncoderArena(
+            3, 48000, 3, 2, 1, [0, 1, 2], pylibopus.APPLICATION_AUDIO)
+        decoders = pylibopus.arena.MultiStreamDecoderArena(
+            3, 48000, 3, 2, 1, [0, 1, 2])
+        pcm = PCM + PCM[:1920]
+        for encoder, decoder in zip(encoders, decoders):
+            self.assertIsInstance(encoder, pylibopus.MultiStreamEncoder)
+            packet = encoder.encode(pcm, 960)
+            self.assertEqual(len(decoder.decode(packet, 960)), 960 * 3 * 2)
+
+    def test_projection_arenas(self):
+        encoders = pylibopus.arena.ProjectionEncoderArena(
+            2, 48000, 4, 3, pylibopus.APPLICATION_AUDIO)
+        self.assertEqual((encoders.streams, encoders.coupled_streams), (2, 2))
+
+        encoder = encoders[0]
+        size = encoder.demixing_matrix_size
+        matrix = encoder.get_demixing_matrix(size)
+        decoders = pylibopus.arena.ProjectionDecoderArena(
+            2, 48000, 4, 2, 2, matrix)
+
+        packet = encoder.encode(PCM * 2, 960)
+        self.assertEqual(
+            len(decoders[1].decode(packet, 960)), 960 * 4 * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
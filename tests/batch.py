@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for process-pool batch encoding, decoding and transcoding"""
+
+import os
+import tempfile
+import unittest
+
+import pylibopus
+import pylibopus.batch
+import pylibopus.ogg
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config = pylibopus.batch.CodecConfig(
+            channels=1, frame_size=480, complexity=0)
+        self.paths = []
+        for nb_frames in (7, 1, 3):
+            path = os.path.join(
+                self.directory.name, '{}.pcm'.format(nb_frames))
+            with open(path, 'wb') as sink:
+                sink.write(bytes(range(192)) * 5 * nb_frames)
+            self.paths.append(path)
+
+        # A partial trailing frame is padded.
+        with open(self.paths[0], 'ab') as sink:
+            sink.write(bytes(10))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_encode_files(self):
+        result = pylibopus.batch.encode_files(
+            self.paths, self.config, max_workers=2, chunk_frames=2)
+
+        self.assertEqual(
+            [file.frames for file in result.files], [8, 1, 3])
+        self.assertEqual(result.stats.frames, 12)
+        self.assertEqual(result.stats.audio_seconds, 12 * 0.01)
+        self.assertGreater(result.stats.realtime_factor, 0)
+
+        encoder = self.config.create_encoder()
+        with open(self.paths[2], 'rb') as source:
+            data, offsets = encoder.encode_frames(source.read(), 480)
+        self.assertEqual(result.files[2].data[:offsets[2]], data[:offsets[2]])
+        self.assertEqual(
+            result.files[2].offsets[-1], len(result.files[2].data))
+
+    def write_ogg(self, nb_frames):
+        path = os.path.join(self.directory.name, '{}.opus'.format(nb_frames))
+        with open(path, 'wb') as sink:
+            with pylibopus.ogg.OggOpusWriter(
+                    sink, self.config.create_encoder()) as writer:
+                writer.encode_stream(
+                    [bytes(range(192)) * 5 * nb_frames], 480)
+        return path
+
+    def test_decode_files(self):
+        paths = [self.write_ogg(nb_frames) for nb_frames in (9, 2)]
+        result = pylibopus.batch.decode_files(
+            paths, self.config, max_workers=2, chunk_frames=4)
+
+        self.assertEqual(
+            [file.samples for file in result.files], [9 * 480, 2 * 480])
+        self.assertEqual(
+            [len(file.pcm) for file in result.files], [9 * 960, 2 * 960])
+        self.assertEqual(result.stats.frames, 11)
+        self.assertEqual(result.stats.audio_seconds, 11 * 0.01)
+        # The seek indexes stay in memory.
+        self.assertFalse(any(
+            name.endswith('.idx') for name in os.listdir(self.directory.name)))
+
+        # The first chunk matches a continuous decode exactly.
+        with pylibopus.ogg.OggOpusReader(paths[0]) as reader:
+            pcm = b''.join(
+                bytes(chunk) for chunk in reader.decode(
+                    reader.create_decoder(48000)))
+        self.assertEqual(len(pcm), len(result.files[0].pcm))
+        self.assertEqual(result.files[0].pcm[:4 * 960], pcm[:4 * 960])
+
+        self.assertRaises(
+            ValueError, pylibopus.batch.decode_files, paths,
+            self.config._replace(channels=2))
+
+    def test_transcode_files(self):
+        paths = [self.write_ogg(nb_frames) for nb_frames in (9, 2)]
+        config = self.config._replace(bitrate=8000)
+        result = pylibopus.batch.transcode_files(
+            paths, config, max_workers=2, chunk_frames=4)
+
+        self.assertEqual([file.frames for file in result.files], [9, 2])
+        self.assertFalse(any(
+            name.endswith('.idx') for name in os.listdir(self.directory.name)))
+        decoder = pylibopus.Decoder(48000, 1)
+        first = result.files[0]
+        for index in range(first.frames):
+            packet = first.data[first.offsets[index]:first.offsets[index + 1]]
+            self.assertEqual(len(decoder.decode(packet, 480)), 960)
+
+    def test_chunk_frames(self):
+        self.assertRaises(
+            ValueError, pylibopus.batch.encode_files,
+            self.paths, self.config, chunk_frames=0)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the CTL request engine"""
+
+import ctypes
+import unittest
+
+import pylibopus
+import pylibopus.api.ctl
+import pylibopus.api.decoder
+import pylibopus.api.encoder
+import pylibopus.api.multistream_decoder
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class CtlTest(unittest.TestCase):
+
+    def roundtrip(self):
+        enc = pylibopus.api.encoder.create_state(
+            48000, 2, pylibopus.APPLICATION_AUDIO)
+        for value in (0, 7, 10):
+            pylibopus.api.encoder.encoder_ctl(
+                enc, pylibopus.api.ctl.set_complexity, value)
+            self.assertEqual(pylibopus.api.encoder.encoder_ctl(
+                enc, pylibopus.api.ctl.get_complexity), value)
+
+        with self.assertRaises(pylibopus.OpusError) as context:
+            pylibopus.api.encoder.encoder_ctl(
+                enc, pylibopus.api.ctl.set_complexity, 11)
+        self.assertEqual(context.exception.code, pylibopus.BAD_ARG)
+
+        self.assertEqual(pylibopus.api.encoder.encoder_ctl(
+            enc, pylibopus.api.ctl.reset_state), pylibopus.OK)
+        pylibopus.api.encoder.destroy(enc)
+
+        dec = pylibopus.api.multistream_decoder.create_state(
+            48000, 2, 1, 1, [0, 1])
+        pylibopus.api.multistream_decoder.decoder_ctl(
+            dec, pylibopus.api.ctl.set_gain, -300)
+        self.assertEqual(pylibopus.api.multistream_decoder.decoder_ctl(
+            dec, pylibopus.api.ctl.get_gain), -300)
+        pylibopus.api.multistream_decoder.destroy(dec)
+
+    def test_direct(self):
+        self.roundtrip()
+
+    def test_state_type(self):
+        dec = pylibopus.api.decoder.create_state(48000, 2)
+        pylibopus.api.decoder.decoder_ctl(dec, pylibopus.api.ctl.get_gain)
+        with self.assertRaises(ctypes.ArgumentError):
+            pylibopus.api.encoder.encoder_ctl(
+                dec, pylibopus.api.ctl.get_gain)
+        pylibopus.api.decoder.destroy(dec)
+
+    def test_variadic(self):
+        direct = pylibopus.api.ctl.DIRECT_CALLS
+        requests = [
+            pylibopus.api.ctl.set_complexity,
+            pylibopus.api.ctl.get_complexity,
+            pylibopus.api.ctl.reset_state,
+            pylibopus.api.ctl.set_gain,
+            pylibopus.api.ctl.get_gain,
+        ]
+        saved = [dict(request._calls) for request in requests]  # NOQA pylint: disable=protected-access
+        pylibopus.api.ctl.DIRECT_CALLS = False
+        try:
+            for request in requests:
+                request._calls.clear()  # pylint: disable=protected-access
+            self.roundtrip()
+        finally:
+            pylibopus.api.ctl.DIRECT_CALLS = direct
+            for request, calls in zip(requests, saved):
+                request._calls.clear()  # pylint: disable=protected-access
+                request._calls.update(calls)  # NOQA pylint: disable=protected-access
+
+    def test_prototype_table(self):
+        request = pylibopus.api.ctl.get_gain
+        dec = pylibopus.api.decoder.create_state(48000, 2)
+        enc = pylibopus.api.encoder.create_state(
+            48000, 2, pylibopus.APPLICATION_AUDIO)
+
+        pylibopus.api.decoder.decoder_ctl(dec, request)
+        func, call = request._calls[dec.__class__]  # NOQA pylint: disable=protected-access
+        self.assertIs(func, pylibopus.api.decoder.libopus_ctl)
+        if pylibopus.api.ctl.DIRECT_CALLS:
+            self.assertIsNot(call, func)
+        # Wrong state types are not added to the table.
+        self.assertIs(request.prototype(func, enc), func)
+        self.assertNotIn(enc.__class__, request._calls)  # NOQA pylint: disable=protected-access
+
+        pylibopus.api.encoder.destroy(enc)
+        pylibopus.api.decoder.destroy(dec)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@
 # pylint: disable=missing-docstring
 #
 
+import ctypes  # type: ignore
 import sys
 import unittest
 
@@ -258,3 +259,29 @@ class DecoderTest(unittest.TestCase):
             self.fail('Decode failed')
 
         pylibopus.api.decoder.destroy(dec)
+
+    def test_decode_into(self):
+        dec = pylibopus.api.decoder.create_state(48000, 2)
+        packet = bytes([252, 0, 0])
+        expected = pylibopus.api.decoder.decode(dec, packet, 3, 960, 0)
+        self.assertEqual(len(expected), 960 * 2 * 2)
+
+        pylibopus.api.decoder.decoder_ctl(dec, pylibopus.api.ctl.reset_state)
+        ring = bytearray(4 * 960 * 2 * 2)
+        view = memoryview(ring)[960 * 2 * 2:]
+        result = pylibopus.api.decoder.decode_into(
+            dec, memoryview(packet), 3, view[:960 * 2 * 2], 0)
+        self.assertEqual(result, 960)
+        self.assertEqual(view[:960 * 2 * 2].tobytes(), expected)
+
+        with self.assertRaises(pylibopus.OpusError) as context:
+            pylibopus.api.decoder.decode_into(
+                dec, packet, 3, bytearray(480 * 2 * 2), 0)
+        self.assertEqual(context.exception.code, pylibopus.BUFFER_TOO_SMALL)
+
+        pcm = bytearray(960 * 2 * ctypes.sizeof(ctypes.c_float))
+        result = pylibopus.api.decoder.decode_float_into(
+            dec, packet, 3, pcm, 0)
+        self.assertEqual(result, 960)
+
+        pylibopus.api.decoder.destroy(dec)
@@ -87,6 +87,30 @@ class EncoderTest(unittest.TestCase):
         pylibopus.api.encoder.encode_float(enc, data, 960, len(data))
         pylibopus.api.encoder.destroy(enc)
 
+    def test_encode_into(self):
+        enc = pylibopus.api.encoder.create_state(
+            48000, 2, pylibopus.APPLICATION_AUDIO)
+        data = b'\x00' * ctypes.sizeof(ctypes.c_short) * 2 * 960
+        out = bytearray(4000)
+        result = pylibopus.api.encoder.encode_into(enc, data, 960, out, 2)
+        self.assertGreater(result, 0)
+        pylibopus.api.encoder.encoder_ctl(
+            enc, pylibopus.api.ctl.reset_state)
+        packet = pylibopus.api.encoder.encode(enc, data, 960, 4000)
+        self.assertEqual(bytes(out[:result]), packet)
+
+        self.assertRaises(
+            TypeError,
+            pylibopus.api.encoder.encode_into, enc, data, 960, bytes(4000),
+            2)
+        self.assertRaises(
+            ValueError,
+            pylibopus.api.encoder.encode_into, enc, data[:-2], 960, out, 2)
+        self.assertRaises(
+            ValueError,
+            pylibopus.api.encoder.encode_into, enc, data, 960, out, 3)
+        pylibopus.api.encoder.destroy(enc)
+
     def test_unimplemented(self):
         enc = pylibopus.api.encoder.create_state(
             48000, 2, pylibopus.APPLICATION_AUDIO)
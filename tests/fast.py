@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the fixed frame size codecs"""
+
+import array
+import unittest
+
+import pylibopus
+import pylibopus.fast
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+FRAME_SIZE = 960
+PCM = bytes(range(256)) * 15
+
+
+class FastCodecTest(unittest.TestCase):
+
+    def test_matches_classes(self):
+        fast_encoder = pylibopus.fast.FastEncoder(
+            48000, 2, 'audio', FRAME_SIZE, bitrate=64000, complexity=5)
+        encoder = pylibopus.Encoder(48000, 2, 'audio')
+        encoder.configure(bitrate=64000, complexity=5)
+        fast_decoder = pylibopus.fast.FastDecoder(48000, 2)
+        decoder = pylibopus.Decoder(48000, 2)
+
+        for _ in range(5):
+            packet = fast_encoder.encode(PCM)
+            self.assertEqual(packet, encoder.encode(PCM, FRAME_SIZE))
+            self.assertEqual(fast_decoder.decode(packet),
+                             decoder.decode(packet, FRAME_SIZE))
+            self.assertEqual(fast_decoder.decode_float(bytearray(packet)),
+                             decoder.decode_float(packet, FRAME_SIZE))
+
+        pcm = array.array('f', [0.25, -0.25]) * FRAME_SIZE
+        packet = fast_encoder.encode_float(pcm)
+        self.assertEqual(packet, encoder.encode_float(pcm, FRAME_SIZE))
+        self.assertEqual(fast_encoder.encode(array.array('h', PCM)),
+                         encoder.encode(array.array('h', PCM), FRAME_SIZE))
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            pylibopus.fast.FastEncoder(44100, 2, 'audio', FRAME_SIZE)
+        with self.assertRaises(ValueError):
+            pylibopus.fast.FastEncoder(48000, 3, 'audio', FRAME_SIZE)
+        with self.assertRaises(ValueError):
+            pylibopus.fast.FastEncoder(48000, 2, 'music', FRAME_SIZE)
+        with self.assertRaises(ValueError):
+            pylibopus.fast.FastEncoder(48000, 2, 'audio', 1000)
+        with self.assertRaises(ValueError):
+            pylibopus.fast.FastEncoder(
+                48000, 2, 'audio', FRAME_SIZE, complexity=11)
+        with self.assertRaises(TypeError):
+            pylibopus.fast.FastDecoder(48000, 2, volume=3)
+
+        encoder = pylibopus.fast.FastEncoder(48000, 2, 'voip', 480)
+        self.assertEqual(encoder.frame_size, 480)
+        self.assertEqual(pylibopus.fast.frame_sizes(8000)[0], 20)
+        with self.assertRaises(ValueError):
+            encoder.encode(PCM)
+        with self.assertRaises(ValueError):
+            encoder.encode_float(PCM[:1920])
+        with self.assertRaises(AttributeError):
+            encoder.bitrate = 1  # pylint: disable=assigning-non-slot
+
+    def test_decoder(self):
+        encoder = pylibopus.fast.FastEncoder(
+            48000, 1, 'voip', FRAME_SIZE, inband_fec=1, packet_loss_perc=20)
+        decoder = pylibopus.fast.FastDecoder(48000, 1, FRAME_SIZE, gain=0)
+        self.assertEqual(decoder.max_frame_size, FRAME_SIZE)
+
+        packets = [encoder.encode(PCM[:1920]) for _ in range(4)]
+        self.assertEqual(len(decoder.decode(packets[0])), 1920)
+        self.assertEqual(len(decoder.conceal(FRAME_SIZE)), 1920)
+        self.assertEqual(len(decoder.conceal(480, packets[2])), 960)
+        with self.assertRaises(ValueError):
+            decoder.conceal(FRAME_SIZE * 2)
+        with self.assertRaises(pylibopus.OpusError):
+            decoder.decode(b'\xff')
+
+        decoder.configure(gain=-256)
+        decoder.reset_state()
+        encoder.reset_state()
+
+
+if __name__ == '__main__':
+    unittest.main()
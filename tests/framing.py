@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for PCM re-framing"""
+
+import unittest
+
+import pylibopus
+import pylibopus.framing
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class ReframerTest(unittest.TestCase):
+
+    def test_push(self):
+        reframer = pylibopus.framing.Reframer(4)
+        frames = []
+        for chunk in (b'a', b'bcdefghij', b'', bytearray(b'kl')):
+            frames.extend(frame.tobytes() for frame in reframer.push(chunk))
+        self.assertEqual(frames, [b'abcd', b'efgh', b'ijkl'])
+        self.assertEqual(reframer.pending, 0)
+        self.assertIsNone(reframer.flush())
+
+        list(reframer.push(b'xy'))
+        self.assertEqual(reframer.pending, 2)
+        self.assertEqual(reframer.flush().tobytes(), b'xy\x00\x00')
+
+    def test_encode_stream(self):
+        pcm = bytes(range(256)) * 45
+        chunks = [
+            pcm[index:index + 1000] for index in range(0, len(pcm), 1000)]
+
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        packets = list(encoder.encode_stream(chunks, 960))
+        self.assertEqual(len(packets), 3)
+
+        encoder.reset_state()
+        data, _ = encoder.encode_frames(pcm, 960)
+        self.assertEqual(b''.join(packets), data)
+
+        encoder.reset_state()
+        self.assertEqual(
+            len(list(encoder.encode_stream([pcm[:5000]], 960))), 2)
+        self.assertEqual(
+            len(list(encoder.encode_stream([pcm[:5000]], 960, False))), 1)
@@ -100,3 +100,34 @@ class DecoderTest(unittest.TestCase):
             decoder.decode_float(packet, frame_size=960)
         except pylibopus.OpusError:
             self.fail('Decode failed')
+
+    def test_decode_into(self):
+        decoder = pylibopus.Decoder(48000, 2)
+        packet = bytes([252, 0, 0])
+        out = bytearray(960 * 2 * 2)
+        self.assertEqual(decoder.decode_into(packet, out), 960)
+
+        out = bytearray(960 * 2 * 4)
+        self.assertEqual(decoder.decode_float_into(packet, out), 960)
+
+    def test_decode_packets(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        data, offsets = encoder.encode_frames(bytes(range(256)) * 45, 960)
+
+        decoder = pylibopus.Decoder(48000, 2)
+        pcm, nb_samples = decoder.decode_packets(data, 960, offsets=offsets)
+        self.assertEqual(list(nb_samples), [960] * 3)
+        self.assertEqual(len(pcm), 3 * 960 * 2 * 2)
+
+        decoder.reset_state()
+        packets = [
+            data[offsets[index]:offsets[index + 1]] for index in range(3)]
+        self.assertEqual(
+            bytes(pcm[:960 * 2 * 2]), decoder.decode(packets[0], 960))
+
+        decoder.reset_state()
+        out = bytearray(4 * 960 * 2 * 4)
+        pcm, nb_samples = decoder.decode_float_packets(
+            packets + [None], 960, out=out)
+        self.assertEqual(list(nb_samples), [960] * 4)
+        self.assertEqual(len(pcm), len(out))
@@ -28,3 +28,133 @@ class EncoderTest(unittest.TestCase):
     def test_reset_state(cls):
         encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
         encoder.reset_state()
+
+    def test_encode_into(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        pcm = bytearray(2 * 2 * 960)
+        out = memoryview(bytearray(1500))
+        result = encoder.encode_into(pcm, 960, out[10:])
+        self.assertGreater(result, 0)
+        self.assertEqual(out[:10].tobytes(), bytes(10))
+
+        result = encoder.encode_float_into(bytearray(4 * 2 * 960), 960, out)
+        self.assertGreater(result, 0)
+
+        # Short PCM would make libopus read past the end of the buffer
+        self.assertRaises(
+            ValueError, encoder.encode_into, bytearray(10), 960, out)
+        self.assertRaises(
+            ValueError, encoder.encode_float_into, bytearray(4 * 960), 960,
+            out)
+        self.assertRaises(
+            ValueError, encoder.encode_frames, bytearray(0), 0)
+
+    def test_encode_into_short_pcm(self):
+        out = bytearray(1500)
+        msencoder = pylibopus.MultiStreamEncoder(
+            48000, 3, 2, 1, [0, 1, 2], pylibopus.APPLICATION_AUDIO)
+        self.assertGreater(
+            msencoder.encode_into(bytes(2 * 3 * 960), 960, out), 0)
+        self.assertRaises(
+            ValueError, msencoder.encode_into, bytes(2 * 2 * 960), 960, out)
+        self.assertRaises(
+            ValueError, msencoder.encode_float_into, bytes(4 * 2 * 960), 960,
+            out)
+
+        projencoder = pylibopus.ProjectionEncoder(
+            48000, 4, 3, 2, 2, pylibopus.APPLICATION_AUDIO)
+        self.assertRaises(
+            ValueError, projencoder.encode_into, bytes(2 * 3 * 960), 960,
+            out)
+        self.assertRaises(
+            ValueError, projencoder.encode_float_into, bytes(4 * 3 * 960),
+            960, out)
+
+    def test_encode_frames(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        frame = bytes(range(256)) * 15
+        data, offsets = encoder.encode_frames(frame * 3, 960)
+        self.assertEqual(len(offsets), 4)
+        self.assertEqual(offsets[0], 0)
+        self.assertEqual(offsets[-1], len(data))
+
+        encoder.reset_state()
+        for index in range(3):
+            self.assertEqual(
+                data[offsets[index]:offsets[index + 1]],
+                encoder.encode(frame, 960))
+
+        self.assertRaises(ValueError, encoder.encode_frames, frame[2:], 960)
+
+    def test_configure(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        encoder.configure(bitrate=24000, complexity=3, vbr=False,
+                          signal=pylibopus.SIGNAL_VOICE, application='voip')
+        self.assertEqual(encoder.bitrate, 24000)
+        self.assertEqual(encoder.complexity, 3)
+        self.assertEqual(encoder.vbr, 0)
+        self.assertEqual(encoder.signal, pylibopus.SIGNAL_VOICE)
+        self.assertEqual(encoder.application, pylibopus.APPLICATION_VOIP)
+
+        # Nothing is applied when any setting is invalid
+        self.assertRaises(ValueError, encoder.configure,
+                          complexity=5, packet_loss_perc=101)
+        self.assertRaises(TypeError, encoder.configure,
+                          complexity=5, bitrat=1000)
+        self.assertRaises(TypeError, encoder.configure, complexity='5')
+        self.assertEqual(encoder.complexity, 3)
+
+    def test_settings_snapshot(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        encoder.configure(bitrate=32000, complexity=4, inband_fec=1,
+                          packet_loss_perc=10, dtx=1)
+        snapshot = encoder.settings_snapshot()
+        self.assertNotIn('bandwidth', snapshot)
+        self.assertEqual(snapshot['packet_loss_perc'], 10)
+
+        other = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        other.restore_settings(snapshot)
+        self.assertEqual(other.settings_snapshot(), snapshot)
+
+        msencoder = pylibopus.MultiStreamEncoder(
+            48000, 3, 2, 1, [0, 1, 2], pylibopus.APPLICATION_AUDIO)
+        msencoder.configure(complexity=2, dtx=1)
+        self.assertEqual(msencoder.settings_snapshot()['complexity'], 2)
+
+        # snapshot() on encoders is not the settings dict
+        self.assertFalse(hasattr(encoder, 'snapshot'))
+
+    def test_ctl_cache(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        self.assertFalse(encoder.ctl_cache)
+        encoder.ctl_cache = True
+        encoder.configure(complexity=4, bitrate=2000000)
+
+        calls = []
+        ctl = pylibopus.api.encoder.encoder_ctl
+
+        def counting_ctl(*args):
+            calls.append(args[1])
+            return ctl(*args)
+
+        pylibopus.api.encoder.encoder_ctl = counting_ctl
+        try:
+            self.assertEqual(encoder.complexity, 4)
+            self.assertEqual(calls, [])
+            # Clamped by libopus, read back once
+            bitrate = encoder.bitrate
+            self.assertLess(bitrate, 2000000)
+            self.assertEqual(encoder.bitrate, bitrate)
+            self.assertEqual(len(calls), 1)
+
+            # OPUS_AUTO is resolved by libopus on every read
+            encoder.bitrate = pylibopus.AUTO
+            del calls[:]
+            encoder.bitrate  # pylint: disable=pointless-statement
+            encoder.bitrate  # pylint: disable=pointless-statement
+            self.assertEqual(len(calls), 2)
+        finally:
+            pylibopus.api.encoder.encoder_ctl = ctl
+
+        encoder.ctl_cache = False
+        self.assertEqual(encoder.complexity, 4)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for NumPy input and output of the high-level objects"""
+
+import unittest
+
+import pylibopus
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class NumpyTest(unittest.TestCase):
+
+    def test_encode(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        pcm = numpy.arange(960 * 2, dtype=numpy.int16).reshape(960, 2)
+        packet = encoder.encode(pcm, 960)
+
+        encoder.reset_state()
+        self.assertEqual(encoder.encode(pcm.tobytes(), 960), packet)
+
+        self.assertRaises(
+            TypeError, encoder.encode, pcm.astype(numpy.float64), 960)
+        self.assertRaises(ValueError, encoder.encode, pcm[::2], 480)
+
+        pcm = numpy.zeros((960, 2), dtype=numpy.float32)
+        self.assertGreater(len(encoder.encode_float(pcm, 960)), 0)
+
+    def test_decode_array(self):
+        decoder = pylibopus.Decoder(48000, 2)
+        packet = bytes([252, 0, 0])
+
+        pcm = decoder.decode_array(packet, 960)
+        self.assertEqual(pcm.shape, (960, 2))
+        self.assertEqual(pcm.dtype, numpy.int16)
+
+        pcm = decoder.decode_float_array(packet, 2880)
+        self.assertEqual(pcm.shape, (960, 2))
+        self.assertEqual(pcm.dtype, numpy.float32)
+
+    def test_decode_into(self):
+        decoder = pylibopus.Decoder(48000, 2)
+        out = numpy.zeros((960, 2), dtype=numpy.int16)
+        self.assertEqual(decoder.decode_into(bytes([252, 0, 0]), out), 960)
+        self.assertRaises(
+            TypeError,
+            decoder.decode_into, bytes([252, 0, 0]), out.astype(numpy.int32))
+
+    def test_decode_packets(self):
+        packets = [bytes([252, 0, 0])] * 3
+        decoder = pylibopus.Decoder(48000, 2)
+        out = numpy.zeros((4 * 960, 2), dtype=numpy.int16)
+        pcm, nb_samples = decoder.decode_packets(packets, 960, out=out)
+        self.assertEqual(list(nb_samples), [960] * 3)
+        self.assertEqual(pcm.shape, (3 * 960, 2))
+        self.assertEqual(pcm.dtype, numpy.int16)
+
+        out = numpy.zeros(3 * 960 * 2, dtype=numpy.float32)
+        pcm, _ = decoder.decode_float_packets(packets, 960, out=out)
+        self.assertEqual(pcm.shape, (3 * 960 * 2,))
+        self.assertEqual(pcm.dtype, numpy.float32)
+
+        # int16 samples must not land in a float32 array and vice versa
+        self.assertRaises(
+            TypeError, decoder.decode_packets, packets, 960,
+            out=numpy.zeros((3 * 960, 2), dtype=numpy.float32))
+        self.assertRaises(
+            TypeError, decoder.decode_float_packets, packets, 960,
+            out=numpy.zeros((3 * 960, 2), dtype=numpy.int16))
+        self.assertRaises(
+            ValueError, decoder.decode_packets, packets, 960,
+            out=numpy.zeros((3 * 960, 4), dtype=numpy.int16)[:, ::2])
+
+        msdecoder = pylibopus.MultiStreamDecoder(48000, 2, 1, 1, [0, 1])
+        self.assertRaises(
+            TypeError, msdecoder.decode_packets, packets, 960,
+            out=numpy.zeros((3 * 960, 2), dtype=numpy.float32))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the high-level Repacketizer object"""
+
+import unittest
+
+import pylibopus
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class RepacketizerTest(unittest.TestCase):
+
+    def setUp(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        self.packets = [
+            encoder.encode(bytes(range(256)) * 15, 960) for _ in range(10)]
+
+    def test_merge_split(self):
+        repacketizer = pylibopus.Repacketizer()
+        merged = repacketizer.merge(self.packets[:6])
+        self.assertEqual(
+            pylibopus.api.decoder.packet_get_nb_frames(merged), 6)
+        self.assertEqual(repacketizer.split(merged), self.packets[:6])
+
+    def test_merge_merged(self):
+        repacketizer = pylibopus.Repacketizer()
+        merged = [repacketizer.merge(self.packets[:3]),
+                  repacketizer.merge(self.packets[3:6])]
+        remerged = repacketizer.merge(merged)
+        self.assertEqual(
+            pylibopus.api.decoder.packet_get_nb_frames(remerged), 6)
+        self.assertEqual(remerged, repacketizer.merge(self.packets[:6]))
+        self.assertEqual(repacketizer.split(remerged), self.packets[:6])
+
+    def test_merge_many(self):
+        repacketizer = pylibopus.Repacketizer()
+        merged = repacketizer.merge_many(self.packets, 4)
+        self.assertEqual(len(merged), 3)
+        self.assertEqual(repacketizer.split_many(merged), self.packets)
+
+        decoder = pylibopus.Decoder(48000, 2)
+        self.assertEqual(len(decoder.decode(merged[0], 5760)), 4 * 960 * 4)
+
+    def test_merge_buffers(self):
+        repacketizer = pylibopus.Repacketizer()
+        views = [memoryview(bytearray(packet)) for packet in self.packets[:3]]
+        self.assertEqual(repacketizer.merge(views),
+                         repacketizer.merge(self.packets[:3]))
+
+    def test_merge_too_long(self):
+        repacketizer = pylibopus.Repacketizer()
+        with self.assertRaises(pylibopus.OpusError):
+            # 140 ms
+            repacketizer.merge(self.packets[:7])
+
+    def test_merge_many_incompatible(self):
+        repacketizer = pylibopus.Repacketizer()
+        # 120 ms at most per packet
+        merged = repacketizer.merge_many(self.packets, 8)
+        self.assertEqual(
+            [pylibopus.api.decoder.packet_get_nb_frames(packet)
+             for packet in merged], [6, 4])
+
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        encoder.bitrate = 8000
+        narrow = encoder.encode(bytes(3840), 960)
+        merged = repacketizer.merge_many(
+            self.packets[:2] + [narrow] + self.packets[2:4], 6)
+        self.assertEqual(len(merged), 3)
+        self.assertEqual(merged[1], narrow)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for closing codec objects"""
+
+import gc
+import unittest
+
+import pylibopus
+import pylibopus.arena
+import pylibopus.fast
+import pylibopus.memory
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+def live(name: str) -> int:
+    kind = pylibopus.memory.usage().kinds.get(name)
+    return kind.count if kind else 0
+
+
+class LifecycleTest(unittest.TestCase):
+
+    def codecs(self):
+        encoder = pylibopus.ProjectionEncoder(
+            48000, 4, 3, 2, 2, pylibopus.APPLICATION_AUDIO)
+        matrix = encoder.get_demixing_matrix(encoder.demixing_matrix_size)
+        return [
+            pylibopus.Encoder(48000, 2, 'audio'),
+            pylibopus.Decoder(48000, 2),
+            pylibopus.MultiStreamEncoder(48000, 3, 2, 1, [0, 1, 2], 'audio'),
+            pylibopus.MultiStreamDecoder(48000, 3, 2, 1, [0, 1, 2]),
+            encoder,
+            pylibopus.ProjectionDecoder(48000, 4, 2, 2, matrix),
+            pylibopus.Repacketizer(),
+            pylibopus.fast.FastEncoder(48000, 2, 'audio', 960),
+            pylibopus.fast.FastDecoder(48000, 2),
+        ]
+
+    def test_close(self):
+        for codec in self.codecs():
+            name = type(codec).__name__
+            count = live(name)
+            self.assertFalse(codec.closed)
+            codec.close()
+            self.assertTrue(codec.closed)
+            self.assertEqual(live(name), count - 1)
+            # pylint: disable=protected-access
+            self.assertFalse(codec._finalizer.alive)
+            with self.assertRaisesRegex(ValueError, 'closed'):
+                getattr(codec, codec._state_attribute)
+            codec.close()
+
+        with self.assertRaises(AttributeError):
+            pylibopus.Decoder(48000, 2).missing  # NOQA pylint: disable=expression-not-assigned,no-member
+
+    def test_use_after_close(self):
+        with pylibopus.Encoder(48000, 1, 'voip') as encoder:
+            packet = encoder.encode(bytes(1920), 960)
+        with self.assertRaises(ValueError):
+            encoder.encode(bytes(1920), 960)
+        with self.assertRaises(ValueError):
+            encoder.bitrate = 24000
+
+        with pylibopus.fast.FastDecoder(48000, 1) as decoder:
+            decoder.decode(packet)
+        with self.assertRaises(ValueError):
+            decoder.decode(packet)
+        with self.assertRaises(ValueError):
+            decoder.reset_state()
+
+    def test_finalizer(self):
+        decoder = pylibopus.Decoder(48000, 2)
+        finalizer = decoder._finalizer  # pylint: disable=protected-access
+        # A reference cycle is collected by the GC, not by refcounting
+        decoder.cycle = decoder
+        del decoder
+        gc.collect()
+        self.assertFalse(finalizer.alive)
+
+    def test_views(self):
+        arena = pylibopus.arena.DecoderArena(2, 48000, 1)
+        view = arena[0]
+        self.assertIsNone(getattr(view, '_finalizer', None))
+        view.close()
+        with self.assertRaises(ValueError):
+            view.reset_state()
+        # The slot itself is left to the arena
+        arena[0].reset_state()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for lazy loading of libopus and the bindings"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import pylibopus.api
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+def run(code: str, **environ) -> str:
+    """Runs `code` in a fresh interpreter, returning its output."""
+    env = dict(os.environ)
+    env.pop(pylibopus.api.LIBRARY_ENV, None)
+    env.update(environ)
+    path = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+    if env.get('PYTHONPATH'):
+        path.append(env['PYTHONPATH'])
+    env['PYTHONPATH'] = os.pathsep.join(path)
+    return subprocess.run(
+        [sys.executable, '-c', code], env=env, check=True,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True).stdout.strip()
+
+
+class LoadingTest(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        output = run(
+            'import sys, pylibopus\n'
+            'print(pylibopus.APPLICATION_AUDIO)\n'
+            'print("libopus" in vars(pylibopus.api))\n'
+            'print(sorted(name for name in sys.modules\n'
+            '             if name.startswith("pylibopus.api.")))\n'
+            'print("ctypes.util" in sys.modules)\n')
+        self.assertEqual(output.splitlines(), [
+            str(pylibopus.APPLICATION_AUDIO), 'False', '[]', 'False'])
+
+    def test_submodules_on_first_use(self):
+        output = run(
+            'import sys, pylibopus\n'
+            'encoder = pylibopus.Encoder(48000, 2, "audio")\n'
+            'print("pylibopus.api.multistream_encoder" in sys.modules)\n'
+            'encoder = pylibopus.MultiStreamEncoder(\n'
+            '    48000, 2, 1, 1, [0, 1], "audio")\n'
+            'print(len(encoder.encode(bytes(3840), 960)) > 0)\n'
+            'print("pylibopus.api.multistream_encoder" in sys.modules)\n')
+        self.assertEqual(output.splitlines(), ['False', 'True', 'True'])
+
+    def test_library_override(self):
+        location = pylibopus.api.lib_location
+        output = run(
+            'import sys, pylibopus\n'
+            'pylibopus.Decoder(48000, 2)\n'
+            'print(pylibopus.api.lib_location)\n'
+            'print("ctypes.util" in sys.modules)\n',
+            **{pylibopus.api.LIBRARY_ENV: location})
+        self.assertEqual(output.splitlines(), [location, 'False'])
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            run('import pylibopus.api.info',
+                **{pylibopus.api.LIBRARY_ENV: '/nonexistent/libopus.so'})
+
+    def test_load_library(self):
+        self.assertIs(pylibopus.api.load_library(), pylibopus.api.libopus)
+        self.assertIn('multistream_decoder', dir(pylibopus.api))
+        with self.assertRaises(AttributeError):
+            pylibopus.api.missing  # pylint: disable=pointless-statement
+        with self.assertRaises(AttributeError):
+            pylibopus.Missing  # NOQA pylint: disable=pointless-statement,no-member
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for native memory accounting"""
+
+import gc
+import unittest
+
+import pylibopus
+import pylibopus.api.decoder
+import pylibopus.api.encoder
+import pylibopus.arena
+import pylibopus.fast
+import pylibopus.memory
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+def usage(name: str) -> pylibopus.memory.KindUsage:
+    gc.collect()
+    return pylibopus.memory.usage().kinds.get(
+        name, pylibopus.memory.KindUsage(0, 0))
+
+
+class MemoryTest(unittest.TestCase):
+
+    def test_state_size(self):
+        encoder = pylibopus.ProjectionEncoder(
+            48000, 4, 3, 2, 2, pylibopus.APPLICATION_AUDIO)
+        matrix = encoder.get_demixing_matrix(encoder.demixing_matrix_size)
+        codecs = [
+            (pylibopus.Encoder(48000, 2, 'audio'), 'Encoder',
+             {'channels': 2}),
+            (pylibopus.Decoder(48000, 1), 'Decoder', {'channels': 1}),
+            (pylibopus.MultiStreamEncoder(
+                48000, 3, 2, 1, [0, 1, 2], 'audio'),
+             'MultiStreamEncoder', {'streams': 2, 'coupled_streams': 1}),
+            (pylibopus.MultiStreamDecoder(48000, 3, 2, 1, [0, 1, 2]),
+             'MultiStreamDecoder', {'streams': 2, 'coupled_streams': 1}),
+            (encoder, 'ProjectionEncoder',
+             {'channels': 4, 'mapping_family': 3}),
+            (pylibopus.ProjectionDecoder(48000, 4, 2, 2, matrix),
+             'ProjectionDecoder',
+             {'channels': 4, 'streams': 2, 'coupled_streams': 2}),
+            (pylibopus.Repacketizer(), 'Repacketizer', {}),
+            (pylibopus.fast.FastDecoder(48000, 2), 'FastDecoder',
+             {'channels': 2}),
+        ]
+        for codec, name, params in codecs:
+            self.assertGreater(codec.state_size, 0)
+            self.assertEqual(
+                codec.state_size,
+                pylibopus.memory.state_size(name, **params))
+            self.assertEqual(
+                codec.state_size,
+                pylibopus.memory.state_size(type(codec), **params))
+            self.assertGreaterEqual(
+                usage(type(codec).__name__).bytes, codec.state_size)
+
+        with self.assertRaises(TypeError):
+            pylibopus.memory.state_size('Decoder')
+        with self.assertRaises(ValueError):
+            pylibopus.memory.state_size('Resampler')
+        with self.assertRaises(ValueError):
+            pylibopus.api.decoder.get_size(3)
+
+    def test_usage(self):
+        before = usage('Decoder')
+        decoders = [pylibopus.Decoder(48000, 2) for _ in range(5)]
+        size = pylibopus.api.decoder.get_size(2)
+        self.assertEqual(usage('Decoder'), (before.count + 5,
+                                            before.bytes + 5 * size))
+
+        pylibopus.memory.untrack(decoders.pop())
+        self.assertEqual(usage('Decoder').count, before.count + 4)
+        del decoders
+        self.assertEqual(usage('Decoder'), before)
+
+        total = pylibopus.memory.usage()
+        self.assertEqual(total.count,
+                         sum(kind.count for kind in total.kinds.values()))
+
+    def test_arena(self):
+        before = usage('Encoder')
+        arena = pylibopus.arena.EncoderArena(4, 48000, 1, 'voip')
+        views = list(arena)
+        self.assertEqual(views[0].state_size, arena.state_size)
+        self.assertEqual(usage('Encoder'), before)
+        self.assertEqual(usage('EncoderArena').bytes, arena.nbytes)
+        del arena, views
+        self.assertEqual(usage('EncoderArena').count, 0)
+
+    def test_estimate(self):
+        plan = pylibopus.memory.estimate([
+            (1000, pylibopus.Decoder, {'channels': 2}),
+            (10, 'Encoder', {'channels': 1}),
+            (20, pylibopus.fast.FastEncoder, {'channels': 1}),
+        ])
+        decoder_bytes = 1000 * pylibopus.api.decoder.get_size(2)
+        encoder_bytes = 30 * pylibopus.api.encoder.get_size(1)
+        self.assertEqual(plan.count, 1030)
+        self.assertEqual(plan.bytes, decoder_bytes + encoder_bytes)
+        self.assertEqual(plan.kinds['Encoder'], (30, encoder_bytes))
+        self.assertTrue(plan.fits(plan.bytes))
+        self.assertFalse(plan.fits(plan.bytes - 1))
+
+        with self.assertRaises(ValueError):
+            pylibopus.memory.estimate([(-1, 'Decoder', {'channels': 1})])
+
+
+if __name__ == '__main__':
+    unittest.main()
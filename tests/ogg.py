@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the Ogg Opus container support"""
+
+import array
+import io
+import math
+import os
+import struct
+import sys
+import tempfile
+import unittest
+
+import pylibopus
+import pylibopus.ogg
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+def split_pages(data):
+    pages = []
+    position = 0
+    while position < len(data):
+        header = pylibopus.ogg.PAGE_HEADER.unpack_from(data, position)
+        nb_segments = header[-1]
+        lacing = data[position + 27:position + 27 + nb_segments]
+        end = position + 27 + nb_segments + sum(lacing)
+        pages.append((header, lacing, data[position:end]))
+        position = end
+    return pages
+
+
+def tone_burst(samples, start, length=2400):
+    """Mono PCM, silent except for a 1 kHz burst at `start`."""
+    pcm = array.array('h', bytes(2 * samples))
+    for i in range(start, min(samples, start + length)):
+        pcm[i] = int(
+            12000 * math.sin(2 * math.pi * 1000 * (i - start) / 48000))
+    return pcm
+
+
+def lag(reference, decoded, start, length=2400):
+    """Shift of `decoded` against `reference` around a burst at `start`."""
+    def correlation(shift):
+        return sum(reference[i] * decoded[i + shift]
+                   for i in range(start, start + length, 2)
+                   if 0 <= i + shift < len(decoded))
+    return max(range(-480, 481), key=correlation)
+
+
+def spec_file(path, pcm, frames_per_page=7):
+    """
+    Writes mono `pcm` as Ogg Opus page by page following RFC 7845, without
+    OggOpusWriter: granules count from 0 and include the pre-skip, the
+    lookahead is flushed with silence and the last page is end-trimmed.
+    """
+    encoder = pylibopus.Encoder(48000, 1, pylibopus.APPLICATION_AUDIO)
+    pre_skip = encoder.lookahead
+    frames = -(-(len(pcm) + pre_skip) // 960)
+    padded = pcm.tobytes() + bytes(2 * (frames * 960 - len(pcm)))
+    packets = [encoder.encode(padded[i * 1920:(i + 1) * 1920], 960)
+               for i in range(frames)]
+
+    head = pylibopus.ogg.opus_head(1, pre_skip, 48000)
+    tags = pylibopus.ogg.opus_tags('test')
+    pages = [
+        pylibopus.ogg.build_page(
+            pylibopus.ogg.BOS, 0, 1, 0, [len(head)], [head]),
+        pylibopus.ogg.build_page(0, 0, 1, 1, [len(tags)], [tags]),
+    ]
+    for first in range(0, frames, frames_per_page):
+        chunk = packets[first:first + frames_per_page]
+        last = first + frames_per_page >= frames
+        granule = pre_skip + len(pcm) if last else \
+            (first + len(chunk)) * 960
+        lacing = []
+        for packet in chunk:
+            lacing.extend([255] * (len(packet) // 255) +
+                          [len(packet) % 255])
+        pages.append(pylibopus.ogg.build_page(
+            pylibopus.ogg.EOS if last else 0, granule, 1, len(pages),
+            lacing, chunk))
+    with open(path, 'wb') as sink:
+        sink.write(b''.join(pages))
+
+
+class OggOpusWriterTest(unittest.TestCase):
+
+    def test_crc32(self):
+        self.assertEqual(pylibopus.ogg.crc32(b'123456789'), 0x89a1897f)
+
+    def test_write(self):
+        sink = io.BytesIO()
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        writer = pylibopus.ogg.OggOpusWriter(
+            sink, encoder, comments=['TITLE=test'], serial=7,
+            page_packets=4)
+        writer.encode_stream([bytes(range(256)) * 100] * 3, 960)
+        writer.close()
+
+        pages = split_pages(sink.getvalue())
+        # OpusHead, OpusTags and 20 packets at 4 packets per page
+        self.assertEqual(len(pages), 7)
+
+        for sequence, (header, _, page) in enumerate(pages):
+            self.assertEqual(header[0], b'OggS')
+            self.assertEqual(header[4], 7)
+            self.assertEqual(header[5], sequence)
+            crc = header[6]
+            page = page[:22] + bytes(4) + page[26:]
+            self.assertEqual(pylibopus.ogg.crc32(page), crc)
+
+        head = pages[0][2][28:]
+        magic, version, channels, pre_skip, rate, _, family = \
+            pylibopus.ogg.OPUS_HEAD.unpack(head)
+        self.assertEqual((magic, version, channels, rate, family),
+                         (b'OpusHead', 1, 2, 48000, 0))
+        self.assertEqual(pre_skip, encoder.lookahead)
+        self.assertEqual(pages[0][0][2], pylibopus.ogg.BOS)
+        self.assertIn(b'TITLE=test', pages[1][2])
+
+        header = pages[-1][0]
+        self.assertEqual(header[2], pylibopus.ogg.EOS)
+        # Granules count from 0; the final one is pre-skip plus the input
+        # samples, trimming the silence that flushed the lookahead.
+        self.assertEqual(header[3], pre_skip + 3 * 25600 // 4)
+        self.assertEqual(pages[2][0][3], 4 * 960)
+        self.assertEqual(pages[-2][0][3], 16 * 960)
+        # 20 packets of input and one of silence
+        self.assertEqual(len(pages[-1][1]), 5)
+
+    def test_continued(self):
+        sink = io.BytesIO()
+        encoder = pylibopus.Encoder(48000, 1, pylibopus.APPLICATION_AUDIO)
+        writer = pylibopus.ogg.OggOpusWriter(sink, encoder)
+        writer.write_packet(bytes(255 * 300), 960)
+        writer.close()
+
+        pages = split_pages(sink.getvalue())
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(pages[2][0][3], -1)
+        self.assertEqual(pages[3][0][2],
+                         pylibopus.ogg.CONTINUED | pylibopus.ogg.EOS)
+        # The rest of the packet, then the silence flushing the lookahead
+        self.assertEqual(list(pages[3][1])[:46], [255] * 45 + [0])
+        self.assertEqual(len(pages[3][1]), 47)
+        self.assertEqual(struct.unpack_from('<q', pages[3][2], 6)[0],
+                         writer.pre_skip + 960)
+
+    def test_end_trimming(self):
+        sink = io.BytesIO()
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        with pylibopus.ogg.OggOpusWriter(sink, encoder) as writer:
+            writer.encode_stream([bytes(10000)], 960)
+
+        pages = split_pages(sink.getvalue())
+        # 2500 samples fill 3 frames; the padding covers the lookahead.
+        self.assertEqual(pages[-1][0][3], writer.pre_skip + 2500)
+        self.assertEqual(len(pages[-1][1]), 3)
+
+    def test_lookahead_flush(self):
+        sink = io.BytesIO()
+        encoder = pylibopus.Encoder(48000, 1, pylibopus.APPLICATION_AUDIO)
+        with pylibopus.ogg.OggOpusWriter(sink, encoder) as writer:
+            writer.encode_stream([bytes(2 * 960 * 2)], 960)
+
+        pages = split_pages(sink.getvalue())
+        # Two frames of input, then one of silence for the pre-skip
+        self.assertEqual(len(pages[-1][1]), 3)
+        self.assertEqual(pages[-1][0][3], writer.pre_skip + 2 * 960)
+
+
+class OggOpusReaderTest(unittest.TestCase):
+
+    def write_file(self, pcm, channels=2, fs=48000):
+        handle, path = tempfile.mkstemp(suffix='.opus')
+        self.addCleanup(os.remove, path)
+        encoder = pylibopus.Encoder(fs, channels, pylibopus.APPLICATION_AUDIO)
+        with os.fdopen(handle, 'wb') as sink:
+            with pylibopus.ogg.OggOpusWriter(
+                    sink, encoder, comments=['TITLE=test'],
+                    page_packets=3) as writer:
+                writer.encode_stream([pcm], 960)
+        return path
+
+    def test_headers(self):
+        path = self.write_file(bytes(3840))
+        with pylibopus.ogg.OggOpusReader(path, verify_crc=True) as reader:
+            self.assertEqual(reader.channels, 2)
+            self.assertEqual(reader.mapping_family, 0)
+            self.assertEqual(reader.input_sample_rate, 48000)
+            self.assertEqual(reader.comments, ['TITLE=test'])
+            self.assertTrue(reader.vendor)
+            self.assertIsInstance(
+                reader.create_decoder(), pylibopus.Decoder)
+
+    def test_missing_tags(self):
+        path = self.write_file(bytes(3840))
+        with open(path, 'rb') as source:
+            first_page = split_pages(source.read())[0][2]
+        with open(path, 'wb') as sink:
+            sink.write(first_page)
+        with self.assertRaises(ValueError):
+            pylibopus.ogg.OggOpusReader(path)
+
+    def test_packets(self):
+        path = self.write_file(bytes(range(256)) * 150)
+        with pylibopus.ogg.OggOpusReader(path) as reader:
+            decoder = reader.create_decoder()
+            packets = list(reader.packets())
+            # 38400 bytes of stereo PCM is 10 frames of 960 samples, plus
+            # one flushing the encoder lookahead
+            self.assertEqual(len(packets), 11)
+            for packet in packets:
+                self.assertIsInstance(packet, memoryview)
+                self.assertEqual(pylibopus.api.decoder.get_nb_samples(
+                    decoder.decoder_state, bytes(packet), len(packet)), 960)
+                packet.release()
+
+    def test_spanning_packet(self):
+        handle, path = tempfile.mkstemp(suffix='.opus')
+        self.addCleanup(os.remove, path)
+        encoder = pylibopus.Encoder(48000, 1, pylibopus.APPLICATION_AUDIO)
+        with os.fdopen(handle, 'wb') as sink:
+            with pylibopus.ogg.OggOpusWriter(sink, encoder) as writer:
+                writer.write_packet(bytes(255 * 300), 960)
+                writer.write_packet(b'abc', 960)
+
+        with pylibopus.ogg.OggOpusReader(path) as reader:
+            self.assertEqual(
+                [bytes(packet) for packet in reader.packets()][:2],
+                [bytes(255 * 300), b'abc'])
+
+    def test_decode_exact(self):
+        for samples in (960, 10000, 12345):
+            pcm = (bytes(range(256)) * (samples // 32 + 1))[:samples * 4]
+            path = self.write_file(pcm)
+            with pylibopus.ogg.OggOpusReader(path) as reader:
+                decoded = b''.join(reader.decode())
+            self.assertEqual(len(decoded), len(pcm))
+
+    def test_decode_alignment(self):
+        pcm = tone_burst(48000, 24000)
+        path = self.write_file(pcm.tobytes(), channels=1)
+        handle, spec_path = tempfile.mkstemp(suffix='.opus')
+        os.close(handle)
+        self.addCleanup(os.remove, spec_path)
+        spec_file(spec_path, pcm)
+
+        for source in (path, spec_path):
+            with pylibopus.ogg.OggOpusReader(source) as reader:
+                decoded = array.array('h', b''.join(reader.decode()))
+            self.assertEqual(len(decoded), len(pcm))
+            self.assertEqual(lag(pcm, decoded, 24000), 0)
+
+            with pylibopus.ogg.OggOpusReader(source) as reader:
+                for position in (0, 5000, 20000):
+                    decoded = array.array(
+                        'h', b''.join(reader.seek(position)))
+                    self.assertEqual(len(decoded), len(pcm) - position)
+                    self.assertEqual(
+                        lag(pcm[position:], decoded, 24000 - position), 0)
+
+        # A stream on a single, end-trimmed page starts at sample 0.
+        short = tone_burst(4800, 1000)
+        spec_file(spec_path, short, frames_per_page=10)
+        with pylibopus.ogg.OggOpusReader(spec_path) as reader:
+            decoded = array.array('h', b''.join(reader.decode()))
+        self.assertEqual(len(decoded), len(short))
+        self.assertEqual(lag(short, decoded, 1000), 0)
+
+    def test_decode_resampled(self):
+        pcm = bytes(2 * 16000)
+        path = self.write_file(pcm, channels=1, fs=16000)
+        with pylibopus.ogg.OggOpusReader(path) as reader:
+            decoder = reader.create_decoder(16000)
+            decoded = b''.join(reader.decode(decoder, 960))
+        self.assertEqual(len(decoded), len(pcm))
+
+    def test_seek_index(self):
+        pcm = bytes(range(256)) * 1500
+        path = self.write_file(pcm)
+        self.addCleanup(
+            lambda: os.path.exists(path + '.idx') and os.remove(path + '.idx'))
+
+        with pylibopus.ogg.OggOpusReader(path, index=True) as reader:
+            built = reader.index
+            self.assertTrue(os.path.exists(path + '.idx'))
+            self.assertEqual(len(built), 34)
+            offsets = list(built.offsets)
+            granules = list(built.granules)
+            self.assertEqual(granules, sorted(granules))
+
+        with pylibopus.ogg.OggOpusReader(path, index=True) as reader:
+            if sys.byteorder == 'little':
+                self.assertIsInstance(reader.index.offsets, memoryview)
+            self.assertEqual(list(reader.index.offsets), offsets)
+            self.assertEqual(list(reader.index.granules), granules)
+
+    def test_stale_seek_index(self):
+        path = self.write_file(bytes(range(256)) * 1500)
+        self.addCleanup(
+            lambda: os.path.exists(path + '.idx') and os.remove(path + '.idx'))
+        with pylibopus.ogg.OggOpusReader(path, index=True) as reader:
+            offsets = list(reader.index.offsets)
+            serial, file_size = reader.serial, reader.file_size
+            mtime_ns = reader.mtime_ns
+
+        # Same stream serial and file size, but an older modification time:
+        # the file was rewritten in place since the sidecar was saved.
+        pylibopus.ogg.SeekIndex(
+            array.array('Q', [0]), array.array('q', [0]), serial, file_size,
+            mtime_ns - 10 ** 9).save(path + '.idx')
+        with pylibopus.ogg.OggOpusReader(path, index=True) as reader:
+            self.assertEqual(list(reader.index.offsets), offsets)
+            self.assertEqual(reader.index.mtime_ns, mtime_ns)
+        saved = pylibopus.ogg.SeekIndex.load(path + '.idx')
+        self.assertEqual(saved.mtime_ns, mtime_ns)
+        saved.close()
+
+    def test_seek_index_layout(self):
+        handle, path = tempfile.mkstemp(suffix='.idx')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        index = pylibopus.ogg.SeekIndex(
+            array.array('Q', [100, 5000]), array.array('q', [-1, 960]),
+            0x12345678, 6000, 1700000000123456789)
+        index.save(path)
+
+        with open(path, 'rb') as source:
+            data = source.read()
+        # Little-endian whatever the host byte order
+        self.assertEqual(
+            data[pylibopus.ogg.INDEX_HEADER.size:],
+            struct.pack('<2Q2q', 100, 5000, -1, 960))
+
+        loaded = pylibopus.ogg.SeekIndex.load(path)
+        self.assertEqual(list(loaded.offsets), [100, 5000])
+        self.assertEqual(list(loaded.granules), [-1, 960])
+        self.assertEqual(loaded.serial, 0x12345678)
+        self.assertEqual(loaded.mtime_ns, 1700000000123456789)
+        loaded.close()
+
+    def test_seek(self):
+        # 100 frames of a 400 Hz tone
+        pcm = array.array('h', (
+            int(8000 * math.sin(2 * math.pi * 400 * i / 48000))
+            for i in range(96000) for _ in range(2))).tobytes()
+        path = self.write_file(pcm)
+
+        with pylibopus.ogg.OggOpusReader(path) as reader:
+            decoder = reader.create_decoder()
+            full = b''.join(reader.decode(decoder))
+            for position in (0, 100, 30000, 95000, 96000):
+                decoded = b''.join(reader.seek(position, decoder))
+                self.assertEqual(len(decoded), len(full) - position * 4)
+                if position < 96000:
+                    # Converged after the pre-roll
+                    self.assertLess(abs(
+                        struct.unpack_from('<h', decoded, 400)[0] -
+                        struct.unpack_from('<h', full, position * 4 + 400)[0]
+                    ), 500)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the batch TOC parser"""
+
+import array
+import unittest
+
+import pylibopus
+import pylibopus.api.decoder
+import pylibopus.packet
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+def reference(packet, fs=48000):
+    """Per-packet values from libopus."""
+    try:
+        frames = pylibopus.api.decoder.packet_get_nb_frames(packet)
+        samples = pylibopus.api.decoder.packet_get_samples_per_frame(
+            packet, fs)
+    except pylibopus.OpusError:
+        return 0, 0
+    if frames * samples > 120 * fs // 1000:
+        return 0, 0
+    return frames, frames * samples
+
+
+class PacketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.packets = [bytes([toc, count])
+                        for toc in range(256) for count in (0, 1, 7, 63)]
+        self.packets += [bytes([toc]) for toc in range(256)]
+        self.packets.append(b'')
+
+    def check(self, info, fs=48000):
+        for index, packet in enumerate(self.packets):
+            frames, duration = reference(packet, fs)
+            self.assertEqual(int(info.frames[index]), frames)
+            self.assertEqual(int(info.duration[index]), duration)
+            if not packet:
+                continue
+            self.assertEqual(
+                int(info.bandwidth[index]),
+                pylibopus.api.decoder.packet_get_bandwidth(packet))
+            self.assertEqual(
+                int(info.stereo[index]) + 1,
+                pylibopus.api.decoder.packet_get_nb_channels(packet))
+            self.assertEqual(int(info.config[index]), packet[0] >> 3)
+
+    def test_packet_get_samples_per_frame(self):
+        self.assertEqual(
+            pylibopus.api.decoder.packet_get_samples_per_frame(
+                bytes([31 << 3]), 48000), 960)
+        self.assertEqual(
+            pylibopus.api.decoder.packet_get_samples_per_frame(
+                bytes([3 << 3]), 16000), 960)
+
+    def test_inspect_sequence(self):
+        self.check(pylibopus.packet.inspect_many(self.packets))
+        self.check(pylibopus.packet.inspect_many(self.packets, fs=8000), 8000)
+
+    def test_inspect_packed(self):
+        offsets = array.array('Q', [0])
+        for packet in self.packets:
+            offsets.append(offsets[-1] + len(packet))
+        self.check(pylibopus.packet.inspect_many(
+            b''.join(self.packets), offsets))
+
+    def test_inspect_array(self):
+        # The fallback used when NumPy is missing
+        self.check(pylibopus.packet._inspect_array(  # NOQA pylint: disable=protected-access
+            self.packets, None, 48000))
+
+    def test_modes(self):
+        info = pylibopus.packet.inspect_many(
+            [bytes([0]), bytes([12 << 3]), bytes([16 << 3])])
+        self.assertEqual(list(info.mode), [
+            pylibopus.packet.MODE_SILK_ONLY,
+            pylibopus.packet.MODE_HYBRID,
+            pylibopus.packet.MODE_CELT_ONLY,
+        ])
+
+    def test_encoded(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        data, offsets = encoder.encode_frames(bytes(38400), 960)
+        info = pylibopus.packet.inspect_many(data, offsets)
+        self.assertEqual(list(info.duration), [960] * 10)
+        self.assertEqual(list(info.stereo), [1] * 10)
+
+
+    def test_pad_unpad(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        packet = encoder.encode(bytes(range(256)) * 15, 960)
+
+        padded = pylibopus.api.decoder.packet_pad(packet, 400)
+        self.assertEqual(len(padded), 400)
+        self.assertEqual(pylibopus.api.decoder.packet_unpad(padded), packet)
+
+        buffer = bytearray(400)
+        buffer[:len(packet)] = packet
+        pylibopus.api.decoder.packet_pad_in_place(buffer, len(packet))
+        self.assertEqual(bytes(buffer), padded)
+        length = pylibopus.api.decoder.packet_unpad_in_place(buffer)
+        self.assertEqual(bytes(buffer[:length]), packet)
+
+        with self.assertRaises(ValueError):
+            pylibopus.api.decoder.packet_pad(packet, len(packet) - 1)
+        with self.assertRaises(ValueError):
+            pylibopus.api.decoder.packet_pad_in_place(
+                bytearray(packet), len(packet), 400)
+        for length in (0, len(packet) + 1):
+            with self.assertRaises(ValueError):
+                pylibopus.api.decoder.packet_pad_in_place(
+                    bytearray(packet), length)
+            with self.assertRaises(ValueError):
+                pylibopus.api.decoder.packet_unpad_in_place(
+                    bytearray(packet), length)
+
+    def test_multistream_pad_unpad(self):
+        encoder = pylibopus.MultiStreamEncoder(
+            48000, 3, 2, 1, [0, 1, 2], pylibopus.APPLICATION_AUDIO)
+        packet = encoder.encode(bytes(range(256)) * 22 + bytes(128), 960)
+
+        padded = pylibopus.api.multistream_decoder.packet_pad(packet, 2, 1000)
+        self.assertEqual(len(padded), 1000)
+        self.assertEqual(
+            pylibopus.api.multistream_decoder.packet_unpad(padded, 2), packet)
+
+        buffer = bytearray(1000)
+        buffer[:len(packet)] = packet
+        pylibopus.api.multistream_decoder.packet_pad_in_place(
+            buffer, 2, len(packet))
+        self.assertEqual(bytes(buffer), padded)
+        length = pylibopus.api.multistream_decoder.packet_unpad_in_place(
+            buffer, 2)
+        self.assertEqual(bytes(buffer[:length]), packet)
+
+        with self.assertRaises(ValueError):
+            pylibopus.api.multistream_decoder.packet_pad(
+                packet, 2, len(packet) - 1)
+        with self.assertRaises(ValueError):
+            pylibopus.api.multistream_decoder.packet_unpad_in_place(
+                bytearray(packet), 2, 0)
+
+        decoder = pylibopus.MultiStreamDecoder(48000, 3, 2, 1, [0, 1, 2])
+        self.assertEqual(len(decoder.decode(padded, 960)), 960 * 3 * 2)
+
+    def test_unpad_many(self):
+        encoder = pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        packets = [encoder.encode(bytes(range(256)) * 15, 960)
+                   for _ in range(5)]
+        padded = [pylibopus.api.decoder.packet_pad(packet, 500)
+                  for packet in packets]
+        padded.insert(2, b'')
+
+        data, offsets = pylibopus.packet.unpad_many(padded)
+        self.assertEqual(data, b''.join(packets))
+        self.assertEqual(offsets[3] - offsets[2], 0)
+        self.assertEqual(len(offsets), 7)
+
+        packed = b''.join(padded)
+        packed_offsets = array.array(
+            'Q', [0, 500, 1000, 1000, 1500, 2000, 2500])
+        self.assertEqual(
+            pylibopus.packet.unpad_many(packed, packed_offsets),
+            (data, offsets))
+
+
+if __name__ == '__main__':
+    unittest.main()
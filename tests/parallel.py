@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the thread-pool EncoderPool"""
+
+import unittest
+
+import pylibopus
+import pylibopus.parallel
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class EncoderPoolTest(unittest.TestCase):
+
+    def test_encode(self):
+        pcm = [bytes([index]) * 3840 for index in range(3)]
+        encoders = [
+            pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+            for _ in range(4)]
+        references = [
+            pylibopus.Encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+            for _ in range(4)]
+
+        jobs = []
+        expected = []
+        for frame in pcm:
+            for encoder, reference in zip(encoders, references):
+                jobs.append((encoder, frame))
+                expected.append(reference.encode(frame, 960))
+
+        with pylibopus.parallel.EncoderPool(max_workers=3) as pool:
+            self.assertEqual(pool.encode(jobs), expected)
+
+    def test_encode_float(self):
+        encoder = pylibopus.Encoder(48000, 1, pylibopus.APPLICATION_AUDIO)
+        with pylibopus.parallel.EncoderPool(max_workers=2) as pool:
+            packets = pool.encode_float([(encoder, bytes(4 * 480))] * 2)
+        self.assertEqual(len(packets), 2)
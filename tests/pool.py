@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the codec pool"""
+
+import unittest
+
+import pylibopus
+import pylibopus.arena
+import pylibopus.pool
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class CodecPoolTest(unittest.TestCase):
+
+    def test_reuse(self):
+        pool = pylibopus.pool.CodecPool()
+        encoder = pool.acquire_encoder(48000, 2, 'audio')
+        first = encoder.encode(bytes(range(256)) * 15, 960)
+        pool.release(encoder)
+
+        # Keys match whether the application is given by name or value
+        again = pool.acquire_encoder(48000, 2, pylibopus.APPLICATION_AUDIO)
+        self.assertIs(again, encoder)
+        # reset_state() made it behave like a fresh encoder
+        self.assertEqual(again.encode(bytes(range(256)) * 15, 960), first)
+
+        self.assertIsNot(pool.acquire_encoder(48000, 1, 'audio'), encoder)
+        self.assertIsNot(pool.acquire_encoder(48000, 2, 'voip'), encoder)
+        self.assertEqual(pool.stats(), (1, 3, 1, 0, 0))
+
+    def test_double_release(self):
+        pool = pylibopus.pool.CodecPool()
+        decoder = pool.acquire_decoder(48000, 2)
+        pool.release(decoder)
+        with self.assertRaises(ValueError):
+            pool.release(decoder)
+        self.assertEqual(len(pool), 1)
+
+        self.assertIs(pool.acquire_decoder(48000, 2), decoder)
+        self.assertIsNot(pool.acquire_decoder(48000, 2), decoder)
+        pool.release(decoder)
+        self.assertEqual(pool.stats().releases, 2)
+
+    def test_kinds(self):
+        pool = pylibopus.pool.CodecPool()
+        decoder = pool.acquire_decoder(48000, 2)
+        msdecoder = pool.acquire_multistream_decoder(
+            48000, 3, 2, 1, [0, 1, 2])
+        msencoder = pool.acquire_multistream_encoder(
+            48000, 3, 2, 1, [0, 1, 2], 'audio')
+        for codec in (decoder, msdecoder, msencoder):
+            pool.release(codec)
+        self.assertEqual(len(pool), 3)
+
+        self.assertIsNot(pool.acquire_multistream_decoder(
+            48000, 3, 2, 1, [0, 2, 1]), msdecoder)
+        self.assertIs(pool.acquire_multistream_decoder(
+            48000, 3, 2, 1, [0, 1, 2]), msdecoder)
+        self.assertIs(pool.acquire_decoder(48000, 2), decoder)
+
+        with self.assertRaises(TypeError):
+            pool.release(object())
+
+    def test_projection(self):
+        pool = pylibopus.pool.CodecPool()
+        encoder = pool.acquire_projection_encoder(48000, 4, 3, 2, 2, 'audio')
+        matrix = encoder.get_demixing_matrix(encoder.demixing_matrix_size)
+        decoder = pool.acquire_projection_decoder(48000, 4, 2, 2, matrix)
+        pool.release(encoder)
+        pool.release(decoder)
+
+        self.assertIs(pool.acquire_projection_encoder(
+            48000, 4, 3, 2, 2, pylibopus.APPLICATION_AUDIO), encoder)
+        self.assertIs(pool.acquire_projection_decoder(
+            48000, 4, 2, 2, bytes(matrix)), decoder)
+        self.assertEqual(pool.stats().hits, 2)
+
+    def test_arena_views(self):
+        pool = pylibopus.pool.CodecPool()
+        view = pylibopus.arena.DecoderArena(2, 48000, 1)[0]
+        pool.release(view)
+        self.assertIs(pool.acquire_decoder(48000, 1), view)
+
+    def test_eviction(self):
+        pool = pylibopus.pool.CodecPool(max_idle_per_key=2, max_idle=3)
+        encoders = [pool.acquire_encoder(48000, 1, 'voip') for _ in range(3)]
+        for encoder in encoders:
+            pool.release(encoder)
+        # The least recently released one was dropped and closed
+        self.assertEqual(pool.stats().evictions, 1)
+        self.assertEqual(
+            [encoder.closed for encoder in encoders], [True, False, False])
+        self.assertEqual(len(pool), 2)
+
+        decoders = [pool.acquire_decoder(48000, 1) for _ in range(2)]
+        for decoder in decoders:
+            pool.release(decoder)
+        self.assertEqual(len(pool), 3)
+        self.assertEqual(pool.stats().evictions, 2)
+
+        # Most recently released first
+        self.assertIs(pool.acquire_encoder(48000, 1, 'voip'), encoders[2])
+        self.assertIs(pool.acquire_decoder(48000, 1), decoders[1])
+
+        pool.clear()
+        self.assertTrue(decoders[0].closed)
+        self.assertEqual(len(pool), 0)
+        stats = pool.stats()
+        self.assertEqual(stats.evictions, 3)
+        self.assertAlmostEqual(stats.hit_rate, 2 / 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
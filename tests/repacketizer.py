@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the low-level repacketizer functions"""
+
+import unittest
+
+import pylibopus
+import pylibopus.api.repacketizer
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+class RepacketizerTest(unittest.TestCase):
+
+    def test_get_size(self):
+        self.assertGreater(pylibopus.api.repacketizer.libopus_get_size(), 0)
+
+    def test_cat_out(self):
+        state = pylibopus.api.repacketizer.create_state()
+        packet = bytes([(31 << 3) | 0]) + bytes(10)
+
+        self.assertEqual(
+            pylibopus.api.repacketizer.get_nb_frames(state), 0)
+        pylibopus.api.repacketizer.cat(state, packet)
+        pylibopus.api.repacketizer.cat(state, packet)
+        self.assertEqual(
+            pylibopus.api.repacketizer.get_nb_frames(state), 2)
+
+        out = bytearray(100)
+        length = pylibopus.api.repacketizer.out(state, out)
+        # Code 1: two frames of equal size
+        self.assertEqual(bytes(out[:length]),
+                         bytes([(31 << 3) | 1]) + bytes(20))
+
+        length = pylibopus.api.repacketizer.out_range(state, 1, 2, out)
+        self.assertEqual(bytes(out[:length]), packet)
+
+        with self.assertRaises(pylibopus.OpusError) as context:
+            pylibopus.api.repacketizer.out_range(state, 0, 2, bytearray(5))
+        self.assertEqual(context.exception.code, pylibopus.BUFFER_TOO_SMALL)
+
+        pylibopus.api.repacketizer.destroy(state)
+
+    def test_cat_incompatible(self):
+        state = pylibopus.api.repacketizer.create_state()
+        pylibopus.api.repacketizer.cat(state, bytes([31 << 3, 1]))
+
+        with self.assertRaises(pylibopus.OpusError) as context:
+            pylibopus.api.repacketizer.cat(state, bytes([30 << 3, 1]))
+        self.assertEqual(context.exception.code, pylibopus.INVALID_PACKET)
+
+        pylibopus.api.repacketizer.init(state)
+        self.assertEqual(
+            pylibopus.api.repacketizer.get_nb_frames(state), 0)
+        pylibopus.api.repacketizer.destroy(state)
+
+
+if __name__ == '__main__':
+    unittest.main()
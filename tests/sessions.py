@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for the decoder session registry"""
+
+import unittest
+
+import pylibopus
+import pylibopus.api.decoder
+import pylibopus.sessions
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+STEREO = pylibopus.api.decoder.libopus_get_size(2)
+MONO = pylibopus.api.decoder.libopus_get_size(1)
+
+
+class Clock(object):
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class DecoderRegistryTest(unittest.TestCase):
+
+    def test_sessions(self):
+        registry = pylibopus.sessions.DecoderRegistry()
+        packet = pylibopus.Encoder(48000, 2, 'audio').encode(
+            bytes(range(256)) * 15, 960)
+
+        first = registry.get(1, 48000, 2)
+        self.assertIs(registry.get(1, 48000, 2), first)
+        self.assertIsNot(registry.get(1, 24000, 2), first)
+        self.assertEqual(
+            len(registry.decode(2, 48000, 2, packet, 960)), 3840)
+        self.assertEqual(len(registry), 3)
+        self.assertIn((2, 48000, 2), registry)
+
+        self.assertTrue(registry.remove(1, 48000, 2))
+        self.assertFalse(registry.remove(1, 48000, 2))
+        # The removed state is reset and reused by the next session
+        self.assertIs(registry.get(3, 48000, 2), first)
+
+        stats = registry.stats()
+        self.assertEqual(stats.live, 3)
+        self.assertEqual(stats.spare, 0)
+        self.assertEqual(stats.bytes, 3 * STEREO)
+        self.assertEqual((stats.created, stats.recycled), (3, 1))
+        self.assertEqual((stats.started, stats.ended), (4, 1))
+
+        registry.clear()
+        self.assertEqual(registry.stats().bytes, 0)
+        self.assertEqual(len(registry), 0)
+        self.assertTrue(first.closed)
+
+    def test_lost_packet(self):
+        registry = pylibopus.sessions.DecoderRegistry()
+        packet = pylibopus.Encoder(48000, 2, 'audio').encode(
+            bytes(range(256)) * 15, 960)
+        registry.decode(1, 48000, 2, packet, 960)
+
+        self.assertEqual(
+            len(registry.decode(1, 48000, 2, None, 480)), 1920)
+        self.assertEqual(
+            len(registry.decode(1, 48000, 2, packet, 960)), 3840)
+        self.assertEqual(registry.stats().created, 1)
+
+    def test_close_dropped(self):
+        registry = pylibopus.sessions.DecoderRegistry(max_spare=0)
+        decoder = registry.get(1, 48000, 1)
+        self.assertTrue(registry.remove(1, 48000, 1))
+        self.assertTrue(decoder.closed)
+        self.assertEqual(registry.stats().bytes, 0)
+
+    def test_idle_timeout(self):
+        clock = Clock()
+        registry = pylibopus.sessions.DecoderRegistry(
+            idle_timeout=10, clock=clock)
+        registry.get('a', 48000, 1)
+        clock.now = 5
+        registry.get('b', 48000, 1)
+        clock.now = 12
+        registry.get('b', 48000, 1)
+        self.assertNotIn(('a', 48000, 1), registry)
+        self.assertEqual(registry.stats().spare, 1)
+
+        clock.now = 30
+        self.assertEqual(registry.expire(), 1)
+        stats = registry.stats()
+        self.assertEqual((stats.live, stats.spare, stats.expired), (0, 2, 2))
+        self.assertEqual(stats.bytes, 2 * MONO)
+
+    def test_max_bytes(self):
+        registry = pylibopus.sessions.DecoderRegistry(
+            idle_timeout=None, max_bytes=2 * STEREO + MONO, max_spare=1)
+        first = registry.get(1, 48000, 2)
+        registry.get(2, 48000, 2)
+        third = registry.get(3, 48000, 1)
+        self.assertEqual(registry.stats().bytes, 2 * STEREO + MONO)
+
+        # The least recently used session makes room for a new one
+        self.assertIs(registry.get(4, 48000, 2), first)
+        self.assertNotIn((1, 48000, 2), registry)
+
+        # Spares are dropped before live sessions are evicted
+        registry.remove(3, 48000, 1)
+        registry.get(5, 16000, 1)
+        self.assertTrue(third.closed)
+        stats = registry.stats()
+        self.assertEqual((stats.live, stats.spare), (3, 0))
+        self.assertEqual(stats.evicted, 1)
+        self.assertLessEqual(stats.bytes, registry.max_bytes)
+
+        with self.assertRaises(MemoryError):
+            pylibopus.sessions.DecoderRegistry(max_bytes=MONO).get(
+                1, 48000, 2)
+        with self.assertRaises(ValueError):
+            pylibopus.sessions.DecoderRegistry(idle_timeout=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
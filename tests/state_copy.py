@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+#
+
+"""Tests for copying codec states"""
+
+import math
+import struct
+import unittest
+
+import pylibopus
+import pylibopus.arena
+
+__author__ = 'Chris Hold'
+__copyright__ = 'Copyright (c) 2024, Chris Hold'
+__license__ = 'BSD 3-Clause License'
+
+
+def tone(frames: int, channels: int = 1, frame_size: int = 960) -> list:
+    pcm = []
+    for frame in range(frames):
+        samples = []
+        for i in range(frame_size):
+            value = int(8000 * math.sin(
+                (frame * frame_size + i) * 2 * math.pi * 440 / 48000))
+            samples.extend([value] * channels)
+        pcm.append(struct.pack('<{}h'.format(len(samples)), *samples))
+    return pcm
+
+
+class StateCopyTest(unittest.TestCase):
+
+    def test_encoder_clone(self):
+        frames = tone(6)
+        encoder = pylibopus.Encoder(48000, 1, 'voip')
+        encoder.bitrate = 16000
+        for frame in frames[:3]:
+            encoder.encode(frame, 960)
+
+        clone = encoder.clone()
+        self.assertIsInstance(clone, pylibopus.Encoder)
+        self.assertEqual(clone.bitrate, 16000)
+        for frame in frames[3:]:
+            self.assertEqual(
+                clone.encode(frame, 960), encoder.encode(frame, 960))
+
+    def test_two_bitrates(self):
+        frames = tone(4)
+        encoder = pylibopus.Encoder(48000, 1, 'audio')
+        for frame in frames[:3]:
+            encoder.encode(frame, 960)
+
+        low = encoder.clone()
+        low.bitrate = 12000
+        encoder.bitrate = 64000
+        self.assertLess(len(low.encode(frames[3], 960)),
+                        len(encoder.encode(frames[3], 960)))
+
+    def test_decoder_snapshot(self):
+        encoder = pylibopus.Encoder(48000, 1, 'voip')
+        encoder.packet_loss_perc = 20
+        encoder.inband_fec = 1
+        packets = [encoder.encode(frame, 960) for frame in tone(5)]
+
+        decoder = pylibopus.Decoder(48000, 1)
+        for packet in packets[:3]:
+            decoder.decode(packet, 960)
+        snapshot = decoder.snapshot()
+        self.assertEqual(len(snapshot.data), decoder.state_size)
+
+        # Try recovering packet 3 from the FEC data of packet 4, then go
+        # back and decode packet 3 as received.
+        recovered = decoder.decode(packets[4], 960, decode_fec=True)
+        self.assertEqual(len(recovered), 1920)
+        decoder.restore(snapshot)
+        received = decoder.decode(packets[3], 960)
+
+        reference = pylibopus.Decoder(48000, 1)
+        for packet in packets[:4]:
+            expected = reference.decode(packet, 960)
+        self.assertEqual(received, expected)
+
+    def test_restore_mismatch(self):
+        snapshot = pylibopus.Decoder(48000, 1).snapshot()
+        with self.assertRaises(ValueError):
+            pylibopus.Decoder(48000, 2).restore(snapshot)
+        with self.assertRaises(ValueError):
+            pylibopus.Decoder(16000, 1).restore(snapshot)
+        with self.assertRaises(ValueError):
+            pylibopus.Decoder(48000, 1).restore(
+                snapshot._replace(data=snapshot.data[:-1]))
+
+    def test_multistream(self):
+        frames = tone(4, channels=3)
+        encoder = pylibopus.MultiStreamEncoder(
+            48000, 3, 2, 1, [0, 1, 2], 'audio')
+        packets = [encoder.encode(frame, 960) for frame in frames[:3]]
+        clone = encoder.clone()
+        self.assertEqual(clone.encode(frames[3], 960),
+                         encoder.encode(frames[3], 960))
+
+        decoder = pylibopus.MultiStreamDecoder(48000, 3, 2, 1, [0, 1, 2])
+        decoder.decode(packets[0], 960)
+        copy = decoder.clone()
+        self.assertEqual(copy.decode(packets[1], 960),
+                         decoder.decode(packets[1], 960))
+        snapshot = decoder.snapshot()
+        expected = decoder.decode(packets[2], 960)
+        decoder.restore(snapshot)
+        self.assertEqual(decoder.decode(packets[2], 960), expected)
+
+    def test_arena_view(self):
+        arena = pylibopus.arena.DecoderArena(2, 48000, 1)
+        packet = pylibopus.Encoder(48000, 1, 'voip').encode(
+            tone(1)[0], 960)
+        view = arena[0]
+        view.decode(packet, 960)
+        clone = view.clone()
+        self.assertIs(type(clone), pylibopus.Decoder)
+        self.assertEqual(clone.decode(packet, 960), view.decode(packet, 960))
+
+        # Snapshots move between views and decoders of the same layout.
+        arena[1].restore(clone.snapshot())
+        self.assertEqual(arena[1].snapshot().data, clone.snapshot().data)
+
+    def test_abstract(self):
+        # pylint: disable=protected-access
+        class Incomplete(pylibopus.classes._CodecState):
+            _state_attribute = 'state'
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_closed(self):
+        encoder = pylibopus.Encoder(48000, 1, 'voip')
+        decoder = pylibopus.Decoder(48000, 1)
+        snapshot = decoder.snapshot()
+        encoder.close()
+        decoder.close()
+        with self.assertRaises(ValueError):
+            encoder.clone()
+        with self.assertRaises(ValueError):
+            decoder.snapshot()
+        with self.assertRaises(ValueError):
+            decoder.restore(snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()